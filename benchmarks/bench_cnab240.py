@@ -0,0 +1,108 @@
+"""
+Mede a vazão de PagamentoController.processar_cnab240 em remessas sintéticas de tamanhos
+crescentes, em um único processo.
+
+Uso (na pasta raiz do projeto):
+    python -m benchmarks.bench_cnab240 [registros ...]
+
+Cada remessa tem uma empresa pagadora e pagamentos distribuídos entre poucas contas
+favorecidas, em lotes de até 100.000 segmentos A. Como a remessa é lida registro a
+registro, o pico de memória do processo deve ficar estável entre os tamanhos.
+"""
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from controller.pagamento_controller import PagamentoController
+from dao.repositorio import Repositorio
+from utils import cnab240
+from utils.constantes import ARQUIVO_CLIENTES, ARQUIVO_CONTAS, ARQUIVO_PESSOAS
+
+TAMANHOS_PADRAO = [100_000, 1_000_000]
+FAVORECIDOS = 100
+PAGAMENTOS_POR_LOTE = 100_000
+CNPJ = "11222333000181"
+CONTA_PAGADORA = "9000"
+
+
+def gerar_base(diretorio: str) -> None:
+    """
+    Gera a empresa pagadora (com saldo para todos os pagamentos) e as contas favorecidas.
+    """
+    pessoas = [{
+        "nome": "Empresa Teste LTDA", "email": "empresa@email.com", "numero_documento": CNPJ,
+        "cep": "30130130", "numero_endereco": "10", "endereco": "Rua Teste, 10",
+        "telefone": "3133334444", "tipo": "juridica", "nome_fantasia": "Teste"
+    }]
+    clientes = [{"numero_documento": CNPJ, "senha": "123", "contas": [CONTA_PAGADORA]}]
+    contas = [{"numero": CONTA_PAGADORA, "saldo": 1e12, "ativa": True, "tipo": "corrente"}]
+    contas += [{"numero": str(10_000 + i), "saldo": 0.0, "ativa": True, "tipo": "corrente"}
+               for i in range(FAVORECIDOS)]
+    for arquivo, dados in ((ARQUIVO_PESSOAS, pessoas), (ARQUIVO_CLIENTES, clientes), (ARQUIVO_CONTAS, contas)):
+        with open(os.path.join(diretorio, "database", arquivo), "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+
+
+def gerar_remessa(caminho: str, quantidade: int) -> None:
+    """
+    Grava a remessa registro a registro, com `quantidade` segmentos A.
+    """
+    lotes = 0
+    total = 1
+    with open(caminho, "w", encoding="latin-1", newline="") as f:
+        f.write(cnab240.gerar_header_arquivo("001", CNPJ, CONTA_PAGADORA, "EMPRESA TESTE", 1) + "\r\n")
+        for inicio in range(0, quantidade, PAGAMENTOS_POR_LOTE):
+            lotes += 1
+            pagamentos = min(PAGAMENTOS_POR_LOTE, quantidade - inicio)
+            f.write(cnab240.gerar_header_lote("001", lotes, CNPJ, CONTA_PAGADORA, "EMPRESA TESTE") + "\r\n")
+            soma = 0
+            for i in range(pagamentos):
+                centavos = 100 + (inicio + i) % 9_900
+                soma += centavos
+                f.write(cnab240.gerar_pagamento("001", lotes, i + 1, str(10_000 + (inicio + i) % FAVORECIDOS),
+                                                "FAVORECIDO", centavos) + "\r\n")
+            f.write(cnab240.gerar_trailer_lote("001", lotes, pagamentos + 2, soma) + "\r\n")
+            total += pagamentos + 2
+        f.write(cnab240.gerar_trailer_arquivo("001", lotes, total + 1) + "\r\n")
+
+
+def medir(quantidade: int) -> tuple[float, float]:
+    """
+    Retorna o tempo, em segundos, do processamento da remessa e o pico de memória do processo (MB).
+    """
+    diretorio_original = os.getcwd()
+    diretorio = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(diretorio, "database"))
+        gerar_base(diretorio)
+        gerar_remessa(os.path.join(diretorio, "remessa.rem"), quantidade)
+        os.chdir(diretorio)
+        Repositorio.limpar()
+
+        inicio = time.perf_counter()
+        resultado = PagamentoController.processar_cnab240("remessa.rem")
+        duracao = time.perf_counter() - inicio
+
+        assert resultado["efetivados"] == quantidade, resultado
+        return duracao, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    finally:
+        Repositorio.limpar()
+        os.chdir(diretorio_original)
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def main(tamanhos: list[int]) -> None:
+    with patch('utils.api.API.buscar_endereco_por_cep', return_value="Rua Teste, 10"):
+        print(f"{'registros':>10} | {'tempo (s)':>10} | {'registros/s':>12} | {'pico RSS (MB)':>13}")
+        for quantidade in tamanhos:
+            duracao, memoria = medir(quantidade)
+            print(f"{quantidade:>10} | {duracao:>10.2f} | {quantidade / duracao:>12.0f} | {memoria:>13.1f}")
+
+
+if __name__ == "__main__":
+    main([int(t) for t in sys.argv[1:]] or TAMANHOS_PADRAO)
@@ -0,0 +1,78 @@
+"""
+Mede a vazão do fechamento mensal em lote (FechamentoMensal) com quantidades crescentes
+de processos de trabalho.
+
+Uso (na pasta raiz do projeto):
+    python -m benchmarks.bench_fechamento_mensal [quantidade_de_contas] [processos ...]
+
+Cada execução parte da mesma base sintética, com histórico vazio. Com partições
+suficientes, a vazão deve crescer quase linearmente com o número de núcleos.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from dao.fechamento_mensal import FechamentoMensal
+from dao.repositorio import Repositorio
+from utils.constantes import ARQUIVO_CONTAS
+
+QUANTIDADE_PADRAO = 20_000
+PARTICOES_POR_PROCESSO = 4
+
+
+def gerar_contas(diretorio: str, quantidade: int) -> None:
+    """
+    Gera contas.json com `quantidade` contas, metade correntes e metade poupanças.
+    """
+    contas = [
+        {"numero": str(10_000 + i), "saldo": 100.0 + i % 997, "ativa": True,
+         "tipo": "corrente" if i % 2 else "poupanca"}
+        for i in range(quantidade)
+    ]
+    with open(os.path.join(diretorio, "database", ARQUIVO_CONTAS), "w", encoding="utf-8") as f:
+        json.dump(contas, f)
+
+
+def medir(quantidade: int, processos: int) -> float:
+    """
+    Retorna o tempo, em segundos, de um fechamento completo.
+    """
+    diretorio_original = os.getcwd()
+    diretorio = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(diretorio, "database"))
+        gerar_contas(diretorio, quantidade)
+        os.chdir(diretorio)
+        Repositorio.limpar()
+
+        inicio = time.perf_counter()
+        resumo = FechamentoMensal(Repositorio.contas()).executar(
+            processos=processos, particoes=processos * PARTICOES_POR_PROCESSO
+        )
+        duracao = time.perf_counter() - inicio
+
+        assert resumo["atualizadas"] == quantidade
+        return duracao
+    finally:
+        Repositorio.limpar()
+        os.chdir(diretorio_original)
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def main(quantidade: int, lista_processos: list[int]) -> None:
+    print(f"{'processos':>10} | {'tempo (s)':>10} | {'contas/s':>10} | {'aceleração':>10}")
+    base = None
+    for processos in lista_processos:
+        duracao = medir(quantidade, processos)
+        base = base or duracao
+        print(f"{processos:>10} | {duracao:>10.2f} | {quantidade / duracao:>10.0f} | {base / duracao:>9.2f}x")
+
+
+if __name__ == "__main__":
+    argumentos = [int(a) for a in sys.argv[1:]]
+    quantidade = argumentos[0] if argumentos else QUANTIDADE_PADRAO
+    nucleos = os.cpu_count() or 1
+    main(quantidade, argumentos[1:] or sorted({1, 2, 4, nucleos}))
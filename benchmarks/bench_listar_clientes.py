@@ -0,0 +1,79 @@
+"""
+Mede o tempo de ClienteDAO.listar_todos_objetos em bases sintéticas de tamanhos crescentes.
+
+Uso (na pasta raiz do projeto):
+    python -m benchmarks.bench_listar_clientes [tamanho ...]
+
+Cada cliente tem uma pessoa e duas contas. Se a hidratação for linear, o tempo por
+cliente deve permanecer aproximadamente constante entre os tamanhos.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from dao.repositorio import Repositorio
+from utils.constantes import ARQUIVO_CLIENTES, ARQUIVO_CONTAS, ARQUIVO_PESSOAS
+
+TAMANHOS_PADRAO = [10_000, 50_000, 100_000]
+
+
+def gerar_base(diretorio: str, quantidade: int) -> None:
+    """
+    Gera pessoas.json, clientes.json e contas.json com `quantidade` clientes.
+    """
+    pessoas, clientes, contas = [], [], []
+    for i in range(quantidade):
+        documento = f"{i:011d}"
+        pessoas.append({
+            "nome": "Cliente Teste", "email": f"cliente{i}@email.com", "numero_documento": documento,
+            "cep": "30130130", "numero_endereco": "10", "endereco": "Rua Teste, 10",
+            "telefone": "31999998888", "tipo": "fisica", "data_nascimento": "01/01/1990"
+        })
+        numeros = [str(10_000 + 2 * i), str(10_001 + 2 * i)]
+        clientes.append({"numero_documento": documento, "senha": "123", "contas": numeros})
+        contas.append({"numero": numeros[0], "saldo": 100.0, "historico": [], "ativa": True, "tipo": "corrente"})
+        contas.append({"numero": numeros[1], "saldo": 50.0, "historico": [], "ativa": True, "tipo": "poupanca"})
+
+    for arquivo, dados in ((ARQUIVO_PESSOAS, pessoas), (ARQUIVO_CLIENTES, clientes), (ARQUIVO_CONTAS, contas)):
+        with open(os.path.join(diretorio, "database", arquivo), "w", encoding="utf-8") as f:
+            json.dump(dados, f)
+
+
+def medir(quantidade: int) -> float:
+    """
+    Retorna o tempo, em segundos, de uma listagem completa de clientes a frio.
+    """
+    diretorio_original = os.getcwd()
+    diretorio = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(diretorio, "database"))
+        gerar_base(diretorio, quantidade)
+        os.chdir(diretorio)
+        Repositorio.limpar()
+
+        inicio = time.perf_counter()
+        clientes = Repositorio.clientes().listar_todos_objetos()
+        duracao = time.perf_counter() - inicio
+
+        assert len(clientes) == quantidade
+        return duracao
+    finally:
+        Repositorio.limpar()
+        os.chdir(diretorio_original)
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def main(tamanhos: list[int]) -> None:
+    with patch('utils.api.API.buscar_endereco_por_cep', return_value="Rua Teste, 10"):
+        print(f"{'clientes':>10} | {'tempo (s)':>10} | {'µs/cliente':>10}")
+        for quantidade in tamanhos:
+            duracao = medir(quantidade)
+            print(f"{quantidade:>10} | {duracao:>10.2f} | {duracao / quantidade * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main([int(t) for t in sys.argv[1:]] or TAMANHOS_PADRAO)
@@ -0,0 +1,94 @@
+"""
+Compara saldo_em (ponto de controle + reaplicação da cauda) com a reaplicação completa do
+histórico, em uma conta sintética com muitas transações.
+
+Uso (na pasta raiz do projeto):
+    python -m benchmarks.bench_saldo_em [quantidade_de_transacoes ...]
+
+Com pontos de controle, o tempo por consulta deve permanecer aproximadamente constante
+entre os tamanhos; a reaplicação completa cresce linearmente.
+"""
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from dao.livro_razao import LivroRazao
+from model.transacao import Transacao
+from utils.constantes import TRANSACAO_ENVIO, TRANSACAO_RECEBIMENTO
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+CONSULTAS = 200
+INICIO = 1_700_000_000
+INTERVALO_ENTRE_TRANSACOES = 60    # segundos
+
+
+def gerar_historico(livro: LivroRazao, quantidade: int) -> None:
+    """
+    Grava `quantidade` transações alternando créditos e débitos, em lotes.
+    """
+    saldo = 0
+    lote = []
+    for i in range(quantidade):
+        efeito = 1_000 if i % 3 else -700
+        saldo += efeito
+        tipo = TRANSACAO_RECEBIMENTO if efeito > 0 else TRANSACAO_ENVIO
+        lote.append(Transacao(INICIO + i * INTERVALO_ENTRE_TRANSACOES, tipo, abs(efeito), "2002", saldo))
+        if len(lote) == 10_000:
+            livro.anexar("1001", lote)
+            lote = []
+    livro.anexar("1001", lote)
+
+
+def saldo_reaplicando_tudo(livro: LivroRazao, momento: float) -> int:
+    """
+    Reaplica o histórico completo desde a primeira transação (sem pontos de controle).
+    """
+    saldo = 0
+    for transacao in livro.ler("1001"):
+        if transacao.timestamp > momento:
+            break
+        saldo += transacao.efeito_centavos
+    return saldo
+
+
+def medir(quantidade: int) -> tuple[float, float]:
+    """
+    Retorna o tempo médio, em segundos, por consulta: (saldo_em, reaplicação completa).
+    """
+    diretorio = tempfile.mkdtemp()
+    try:
+        livro = LivroRazao(diretorio, fsync=False)
+        gerar_historico(livro, quantidade)
+
+        fim = INICIO + quantidade * INTERVALO_ENTRE_TRANSACOES
+        momentos = [random.uniform(INICIO, fim) for _ in range(CONSULTAS)]
+
+        inicio = time.perf_counter()
+        resultados = [livro.saldo_em("1001", momento) for momento in momentos]
+        tempo_checkpoint = (time.perf_counter() - inicio) / CONSULTAS
+
+        amostra = momentos[:max(1, CONSULTAS // 20)]    # A reaplicação completa é lenta
+        inicio = time.perf_counter()
+        esperados = [saldo_reaplicando_tudo(livro, momento) for momento in amostra]
+        tempo_completo = (time.perf_counter() - inicio) / len(amostra)
+
+        assert resultados[:len(amostra)] == esperados
+        return tempo_checkpoint, tempo_completo
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def main(tamanhos: list[int]) -> None:
+    print(f"{'transações':>12} | {'saldo_em (ms)':>14} | {'reaplicação (ms)':>17} | {'ganho':>8}")
+    for quantidade in tamanhos:
+        tempo_checkpoint, tempo_completo = medir(quantidade)
+        print(
+            f"{quantidade:>12} | {tempo_checkpoint * 1e3:>14.3f} | {tempo_completo * 1e3:>17.1f} | "
+            f"{tempo_completo / tempo_checkpoint:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(t) for t in sys.argv[1:]] or TAMANHOS_PADRAO)
@@ -0,0 +1,75 @@
+"""
+Compara a vazão de transferências pelo GravadorContas nos modos de durabilidade síncrono
+(cada transferência gravada antes de retornar) e assíncrono (gravação em segundo plano).
+
+Uso (na pasta raiz do projeto):
+    python -m benchmarks.bench_transferencias [transferencias] [threads]
+
+As transferências são sorteadas entre 1.000 contas e divididas entre as threads.
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from dao.gravador_contas import GravadorContas
+from dao.repositorio import Repositorio
+from utils.constantes import ARQUIVO_CONTAS, DURABILIDADE_SINCRONA, DURABILIDADE_ASSINCRONA
+
+TRANSFERENCIAS_PADRAO = 5_000
+THREADS_PADRAO = 4
+CONTAS = 1_000
+
+
+def medir(durabilidade: str, transferencias: int, threads: int) -> float:
+    """
+    Retorna o tempo, em segundos, das transferências até estarem todas gravadas.
+    """
+    diretorio_original = os.getcwd()
+    diretorio = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(diretorio, "database"))
+        with open(os.path.join(diretorio, "database", ARQUIVO_CONTAS), "w", encoding="utf-8") as f:
+            json.dump([{"numero": str(10_000 + i), "saldo": 1e6, "ativa": True, "tipo": "corrente"}
+                       for i in range(CONTAS)], f)
+        os.chdir(diretorio)
+        Repositorio.limpar()
+        conta_dao = Repositorio.contas()
+        contas = conta_dao.listar_todos_objetos()
+        gravador = GravadorContas(conta_dao, durabilidade)
+
+        def transferir(semente: int) -> None:
+            sorteio = random.Random(semente)
+            for _ in range(transferencias // threads):
+                origem, destino = sorteio.sample(contas, 2)
+                gravador.transferir(origem, destino, float(sorteio.randint(1, 100)))
+
+        inicio = time.perf_counter()
+        trabalhadores = [threading.Thread(target=transferir, args=(i,)) for i in range(threads)]
+        for t in trabalhadores:
+            t.start()
+        for t in trabalhadores:
+            t.join()
+        gravador.fechar()
+        return time.perf_counter() - inicio
+    finally:
+        Repositorio.limpar()
+        os.chdir(diretorio_original)
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def main(transferencias: int, threads: int) -> None:
+    print(f"{'durabilidade':>12} | {'tempo (s)':>10} | {'transf./s':>10}")
+    for durabilidade in (DURABILIDADE_SINCRONA, DURABILIDADE_ASSINCRONA):
+        duracao = medir(durabilidade, transferencias, threads)
+        print(f"{durabilidade:>12} | {duracao:>10.2f} | {transferencias / duracao:>10.0f}")
+
+
+if __name__ == "__main__":
+    argumentos = [int(a) for a in sys.argv[1:]]
+    main(argumentos[0] if argumentos else TRANSFERENCIAS_PADRAO,
+         argumentos[1] if len(argumentos) > 1 else THREADS_PADRAO)
@@ -1,4 +1,4 @@
-from dao.cliente_dao import ClienteDAO
+from dao.repositorio import Repositorio
 from utils.logger import logger
 
 class AuthController:
@@ -11,23 +11,17 @@ class AuthController:
     """
 
     sessao_ativa = {}
-    _cache_clientes = {}
 
     @staticmethod
     def login(numero_documento: str, senha: str) -> dict:
         """
-        Realiza login de um cliente com base no documento e senha.
+        Realiza login de um cliente com base no documento (com ou sem formatação) e senha.
         """
         logger.info(f"Tentando login com documento: {numero_documento}")
 
         try:
-            # Verifica cache antes de acessar o DAO
-            if numero_documento in AuthController._cache_clientes:
-                cliente = AuthController._cache_clientes[numero_documento]
-            else:
-                cliente = ClienteDAO().buscar_por_id(numero_documento)
-                if cliente:
-                    AuthController._cache_clientes[numero_documento] = cliente
+            # O repositório mantém os clientes já carregados em memória
+            cliente = Repositorio.clientes().buscar_por_id(numero_documento)
 
             if cliente is None:
                 logger.warning(f"Cliente não encontrado: {numero_documento}")
@@ -43,7 +37,8 @@ class AuthController:
                     "mensagem" : "Senha incorreta."
                 }
 
-            # Armazena na sessão o cliente logado
+            # Armazena na sessão o cliente logado, pelo documento na forma canônica
+            numero_documento = cliente.pessoa.get_numero_documento()
             AuthController.sessao_ativa[numero_documento] = cliente
 
             logger.info("Login realizado com sucesso.")
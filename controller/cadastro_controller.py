@@ -1,7 +1,10 @@
 from utils.logger import logger
-from dao.pessoa_dao import PessoaDAO
-from dao.cliente_dao import ClienteDAO
+from dao.repositorio import Repositorio
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
 from model.cliente import Cliente
+from model.pessoa import Pessoa
+from mapper.pessoa_mapper import PessoaMapper
+from utils.resolvedor_cep import ResolvedorCEP
 
 
 class CadastroController:
@@ -26,18 +29,18 @@ class CadastroController:
 
         logger.info(f"Iniciando cadastro de cliente com documento: {numero_documento}")
 
-        cliente_dao = ClienteDAO()
-        pessoa_dao = PessoaDAO()
+        cliente_dao = Repositorio.clientes()
+        pessoa_dao = Repositorio.pessoas()
 
-        # Verifica se já existe cliente com mesmo documento
-        if cliente_dao.buscar_por_id(numero_documento):
+        # Verificações antecipadas pelos índices únicos (evitam instanciar Pessoa e consultar o CEP);
+        # a gravação repete a verificação, recusando cadastros simultâneos com os mesmos dados
+        if pessoa_dao.id_por_documento(numero_documento):
             return {
                 "status": "erro",
                 "mensagem": f"Já existe um cliente cadastrado com o documento {numero_documento}."
             }
 
-        # Verifica duplicidade de e-mail (evita instanciar Pessoa antes da verificação)
-        if any(p.get("email") == email for p in pessoa_dao._ler_dados_do_json()):
+        if pessoa_dao.id_por_email(email):
             return {
                 "status": "erro",
                 "mensagem": f"Já existe um cliente cadastrado com o e-mail {email}."
@@ -45,8 +48,11 @@ class CadastroController:
 
         # Tenta criar pessoa e cliente
         try:
-            CadastroController._criar_pessoa(dados)
-            CadastroController._criar_cliente(numero_documento, dados["senha"])
+            pessoa = CadastroController._criar_pessoa(dados)
+            # Pessoa e cliente são gravados juntos: nunca uma pessoa sem cliente
+            with UnidadeDeTrabalho() as unidade:
+                unidade.salvar(pessoa_dao, pessoa)
+                unidade.salvar(cliente_dao, Cliente(pessoa=pessoa, senha=dados["senha"]))
             return {
                 "status": "sucesso",
                 "mensagem": "Cadastro realizado com sucesso"
@@ -65,31 +71,49 @@ class CadastroController:
             logger.error(f"Erro inesperado no cadastro: {e}")
             return {"status": "erro", "mensagem": "Erro inesperado ao cadastrar cliente."}
 
+    @staticmethod
+    def cadastrar_clientes_em_lote(lista_dados: list[dict]) -> dict:
+        """
+        Cadastra vários clientes de uma vez (importação em lote).
+
+        Os CEPs de todo o lote são resolvidos antes, de forma assíncrona e sem repetições,
+        preenchendo o cache; depois cada cliente segue o fluxo normal de `cadastrar_cliente`.
+
+        Args:
+            lista_dados (list[dict]): Dados de cada cliente, no mesmo formato de `cadastrar_cliente`.
+
+        Returns:
+            dict: Status, quantidade de clientes cadastrados e lista de erros por documento.
+        """
+        logger.info(f"Iniciando cadastro em lote de {len(lista_dados)} cliente(s)")
+        ResolvedorCEP().resolver_em_lote(dados.get("cep") for dados in lista_dados)
+
+        erros = []
+        for dados in lista_dados:
+            resultado = CadastroController.cadastrar_cliente(dados)
+            if resultado["status"] == "erro":
+                erros.append({"numero_documento": dados.get("numero_documento"), "mensagem": resultado["mensagem"]})
+
+        cadastrados = len(lista_dados) - len(erros)
+        return {
+            "status": "sucesso" if not erros else "erro",
+            "mensagem": f"{cadastrados} de {len(lista_dados)} cliente(s) cadastrado(s).",
+            "cadastrados": cadastrados,
+            "erros": erros
+        }
+
     # === MÉTODOS AUXILIARES ===
 
     @staticmethod
-    def _criar_pessoa(dados: dict) -> None:
+    def _criar_pessoa(dados: dict) -> Pessoa:
         """
-        Cria e persiste um objeto Pessoa (física ou jurídica) com base no dicionário recebido.
+        Cria um objeto Pessoa (física ou jurídica) com base no dicionário recebido, sem gravá-lo.
         """
         from copy import deepcopy
-        pessoa_dao = PessoaDAO()
         dados_pessoa = deepcopy(dados)
 
         # Garante existência de campo opcional
         dados_pessoa["nome_fantasia"] = dados_pessoa.get("nome_fantasia", "").strip()
 
-        pessoa = pessoa_dao.criar_objeto(dados_pessoa)
-        pessoa_dao.salvar_objeto(pessoa)
-
-    @staticmethod
-    def _criar_cliente(numero_documento: str, senha: str) -> None:
-        """
-        Cria um cliente a partir do documento e senha informados, associando a uma Pessoa já criada.
-        """
-        pessoa = PessoaDAO().buscar_por_id(numero_documento)
-        if not pessoa:
-            raise ValueError(f"Pessoa não encontrada para o documento {numero_documento}.")
-
-        cliente = Cliente(pessoa=pessoa, senha=senha)
-        ClienteDAO().salvar_objeto(cliente)
+        # Pessoa nova: o endereço é sempre resolvido a partir do CEP
+        return PessoaMapper.from_dict(dados_pessoa)
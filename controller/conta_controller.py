@@ -1,8 +1,10 @@
-from dao.cliente_dao import ClienteDAO
-from dao.conta_dao import ContaDAO
+from datetime import datetime
+from dao.repositorio import Repositorio
+from dao.fechamento_mensal import FechamentoMensal
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
 from model.conta_corrente import ContaCorrente
 from model.conta_poupanca import ContaPoupanca
-from utils.constantes import TIPO_CCORRENTE, TIPO_CPOUPANCA
+from utils.constantes import TIPO_CCORRENTE, TIPO_CPOUPANCA, EXTRATO_LIMITE_PADRAO
 
 
 class ContaController:
@@ -11,22 +13,122 @@ class ContaController:
     criação, reativação, encerramento, extrato, listagem e identificação de destinatários.
     """
 
-    _cache_cliente_por_conta = {}
-
     @staticmethod
-    def obter_extrato(numero_conta: int):
+    def obter_extrato(
+        numero_conta: int,
+        limite: int = EXTRATO_LIMITE_PADRAO,
+        cursor: int = None,
+        desde: datetime = None,
+        ate: datetime = None,
+        tipo: str | tuple = None
+    ):
         """
-        Retorna o saldo e objeto da conta, se ativa.
+        Retorna o saldo da conta, se ativa, e uma página do extrato, da transação mais recente
+        para a mais antiga.
+
+        O histórico é lido de trás para frente, apenas até completar a página: o custo depende
+        do tamanho da página, não do tamanho do histórico.
+
+        Args:
+            numero_conta (int): Número da conta.
+            limite (int, opcional): Transações por página. Com 0, retorna apenas o saldo.
+            cursor (int, opcional): Cursor retornado pela página anterior, para continuar a leitura.
+            desde (datetime, opcional): Inclui apenas transações a partir desta data/hora.
+            ate (datetime, opcional): Inclui apenas transações até esta data/hora.
+            tipo (str | tuple, opcional): Tipo(s) de transação (constantes TRANSACAO_*) a incluir.
 
         Returns:
-            tuple: (saldo, conta), None se houver erro.
+            tuple: (extrato, erro). O extrato é um dict com "saldo", "conta", "transacoes"
+                   e "cursor" (None se não houver mais páginas); None se houver erro.
         """
-        conta = ContaDAO().buscar_por_id(numero_conta)
+        conta_dao = Repositorio.contas()
+        conta = conta_dao.buscar_por_id(numero_conta)
         if not conta:
             return None, "Conta não encontrada."
         if not conta.get_estado_da_conta():
             return None, "Conta inativa."
-        return (conta.get_saldo(), conta), None
+
+        extrato = {"saldo": conta.get_saldo(), "conta": conta, "transacoes": [], "cursor": None}
+        if limite <= 0:
+            return extrato, None
+
+        tipos = (tipo,) if isinstance(tipo, str) else tuple(tipo) if tipo else None
+        desde_ts = desde.timestamp() if desde else None
+        ate_ts = ate.timestamp() if ate else None
+
+        def incluir(transacao) -> bool:
+            if tipos and transacao.tipo not in tipos:
+                return False
+            if ate_ts is not None and transacao.timestamp is not None and transacao.timestamp > ate_ts:
+                return False
+            return True
+
+        def parar(transacao) -> bool:
+            return desde_ts is not None and transacao.timestamp is not None and transacao.timestamp < desde_ts
+
+        # Operações ainda não gravadas vão ao histórico antes da primeira página: todas as
+        # páginas saem do histórico gravado, e o cursor continua válido entre elas
+        if cursor is None and conta._transacoes_pendentes():
+            try:
+                Repositorio.gravador_contas().persistir_contas(conta)
+            except OSError as e:
+                return None, f"Não foi possível atualizar o extrato: {e}"
+
+        pagina, proximo = conta_dao.ler_extrato(conta.get_numero_conta(), limite, cursor, incluir, parar)
+        extrato["transacoes"] = pagina
+        extrato["cursor"] = proximo
+        return extrato, None
+
+    @staticmethod
+    def saldo_em(numero_conta: int, data: datetime):
+        """
+        Retorna o saldo que a conta tinha na data/hora informada (relatórios de fim de mês,
+        contestações). Vale também para contas encerradas.
+
+        Returns:
+            tuple: (saldo, erro). O saldo é None se houver erro.
+        """
+        conta_dao = Repositorio.contas()
+        conta = conta_dao.buscar_por_id(numero_conta)
+        if not conta:
+            return None, "Conta não encontrada."
+
+        momento = data.timestamp()
+        saldo = conta_dao.saldo_em(conta.get_numero_conta(), momento)
+
+        # Operações ainda não gravadas no histórico são as mais recentes
+        for transacao in conta._transacoes_pendentes():
+            if saldo is None:
+                saldo = (transacao.saldo_apos_centavos - transacao.efeito_centavos) / 100
+            if transacao.timestamp is not None and transacao.timestamp > momento:
+                break
+            saldo = transacao.saldo_apos
+
+        if saldo is None:
+            # Sem histórico: o saldo nunca mudou desde a abertura
+            saldo = conta.get_saldo()
+        return saldo, None
+
+    @staticmethod
+    def executar_fechamento_mensal(processos: int = None):
+        """
+        Aplica a atualização mensal (taxa de manutenção e rendimento) a todas as contas ativas,
+        em lote, uma única vez por mês. Uma execução interrompida é retomada de onde parou.
+
+        Args:
+            processos (int, opcional): Processos de trabalho. Padrão: um por núcleo.
+
+        Returns:
+            tuple: (resumo, erro). O resumo é o dict retornado por FechamentoMensal.executar;
+                   None se houver erro.
+        """
+        try:
+            fechamento = FechamentoMensal(Repositorio.contas())
+        except RuntimeError as e:
+            return None, str(e)
+        # O fechamento parte do arquivo de contas: na leitura inicial e na consolidação,
+        # as transferências ainda não gravadas vão antes e as novas esperam
+        return fechamento.executar(processos=processos, exclusivo=Repositorio.gravador_contas().pausar), None
 
     @staticmethod
     def criar_conta(usuario_id: str, tipo_conta: str) -> dict:
@@ -40,8 +142,8 @@ class ContaController:
         Returns:
             dict: Resultado da operação.
         """
-        cliente_dao = ClienteDAO()
-        conta_dao = ContaDAO()
+        cliente_dao = Repositorio.clientes()
+        conta_dao = Repositorio.contas()
         cliente = cliente_dao.buscar_por_id(usuario_id)
         if not cliente:
             return {"sucesso": False, "mensagem": "Cliente não encontrado."}
@@ -51,24 +153,21 @@ class ContaController:
                (tipo_conta == TIPO_CPOUPANCA and isinstance(conta, ContaPoupanca)):
                 return {"sucesso": False, "mensagem": f"Você já possui uma conta do tipo {tipo_conta}."}
 
-        existentes = [int(c.get_numero_conta()) for c in conta_dao.listar_todos_objetos()]
-        novo_numero = str(max(existentes, default=1000) + 1)
-
-        nova_conta = (
-            ContaCorrente(novo_numero) if tipo_conta == TIPO_CCORRENTE else
-            ContaPoupanca(novo_numero) if tipo_conta == TIPO_CPOUPANCA else None
-        )
-        if not nova_conta:
+        if tipo_conta not in (TIPO_CCORRENTE, TIPO_CPOUPANCA):
             return {"sucesso": False, "mensagem": "Tipo de conta inválido."}
 
-        conta_dao.salvar_objeto(nova_conta)
-
-        cliente_atualizado = cliente_dao.buscar_por_id(usuario_id)
-        if not cliente_atualizado:
-            return {"sucesso": False, "mensagem": "Erro ao recarregar cliente."}
+        novo_numero = conta_dao.proximo_numero()
+        nova_conta = ContaCorrente(novo_numero) if tipo_conta == TIPO_CCORRENTE else ContaPoupanca(novo_numero)
 
-        cliente_atualizado.contas.append(nova_conta)
-        cliente_dao.atualizar_objeto(cliente_atualizado)
+        # Conta e vínculo com o cliente são gravados juntos: nunca uma conta sem dono
+        cliente.contas.append(nova_conta)
+        try:
+            with UnidadeDeTrabalho() as unidade:
+                unidade.salvar(conta_dao, nova_conta)
+                unidade.atualizar(cliente_dao, cliente)
+        except Exception:
+            cliente.contas.remove(nova_conta)
+            raise
 
         return {"sucesso": True, "mensagem": f"Conta {novo_numero} criada com sucesso!"}
 
@@ -83,7 +182,7 @@ class ContaController:
         Returns:
             list: Contas atreladas ao cliente.
         """
-        cliente = ClienteDAO().buscar_por_id(usuario_id)
+        cliente = Repositorio.clientes().buscar_por_id(usuario_id)
         return cliente.contas if cliente else []
 
     @staticmethod
@@ -94,8 +193,7 @@ class ContaController:
         Returns:
             dict: Resultado com sucesso ou erro.
         """
-        cliente_dao = ClienteDAO()
-        conta_dao = ContaDAO()
+        cliente_dao = Repositorio.clientes()
 
         cliente = cliente_dao.buscar_por_id(usuario_id)
         if not cliente:
@@ -107,10 +205,7 @@ class ContaController:
         if not conta or not conta.get_estado_da_conta():
             return {"sucesso": False, "mensagem": "Conta não encontrada ou já está inativa."}
 
-        conta.encerrar_conta()
-        conta_dao.atualizar_objeto(conta)
-        cliente_dao.atualizar_objeto(cliente)
-
+        ContaController._alterar_e_gravar(conta, cliente, conta.encerrar_conta)
         return {"sucesso": True, "mensagem": f"Conta {numero_conta} encerrada com sucesso."}
 
     @staticmethod
@@ -121,8 +216,7 @@ class ContaController:
         Returns:
             dict: Resultado com sucesso ou erro.
         """
-        cliente_dao = ClienteDAO()
-        conta_dao = ContaDAO()
+        cliente_dao = Repositorio.clientes()
         cliente = cliente_dao.buscar_por_id(usuario_id)
 
         if not cliente:
@@ -136,16 +230,34 @@ class ContaController:
         if conta.get_estado_da_conta():
             return {"sucesso": False, "mensagem": "A conta já está ativa."}
 
-        conta._ativa = True
-        conta_dao.atualizar_objeto(conta)
-        cliente_dao.atualizar_objeto(cliente)
+        def reativar():
+            conta._ativa = True
 
+        ContaController._alterar_e_gravar(conta, cliente, reativar)
         return {"sucesso": True, "mensagem": f"Conta {numero_conta} reativada com sucesso."}
 
+    @staticmethod
+    def _alterar_e_gravar(conta, cliente, alterar) -> None:
+        """
+        Aplica `alterar` à conta (travada) e grava conta e cliente numa única unidade de
+        trabalho. Se a gravação falhar, a conta volta ao estado anterior e o erro é repassado.
+        """
+        conta_dao = Repositorio.contas()
+        with conta_dao.travar_contas(conta.get_numero_conta()):
+            estado = conta._capturar_estado()
+            alterar()
+            try:
+                with UnidadeDeTrabalho() as unidade:
+                    unidade.atualizar(conta_dao, conta)
+                    unidade.atualizar(Repositorio.clientes(), cliente)
+            except Exception:
+                conta._restaurar_estado(estado)
+                raise
+
 
     @staticmethod
     def contas_ativas_para_dropdown(cliente):
-        cliente_atualizado = ClienteDAO().buscar_por_id(cliente.pessoa.get_numero_documento())
+        cliente_atualizado = Repositorio.clientes().buscar_por_id(cliente.pessoa.get_numero_documento())
         return [
             str(conta.get_numero_conta())
             for conta in cliente_atualizado.contas if conta.get_estado_da_conta()
@@ -163,12 +275,7 @@ class ContaController:
         Returns:
             str: Informações de nome, documento e número da conta.
         """
-        if numero_conta in ContaController._cache_cliente_por_conta:
-            cliente = ContaController._cache_cliente_por_conta[numero_conta]
-        else:
-            cliente = ClienteDAO().buscar_cliente_por_numero_conta(numero_conta)
-            if cliente:
-                ContaController._cache_cliente_por_conta[numero_conta] = cliente
+        cliente = Repositorio.clientes().buscar_cliente_por_numero_conta(numero_conta)
 
         if not cliente:
             return f"Conta {numero_conta} (cliente não encontrado)"
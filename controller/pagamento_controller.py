@@ -1,6 +1,18 @@
-from dao.cliente_dao import ClienteDAO
-from dao.conta_dao import ContaDAO
+import csv
+import json
+import math
+import os
+import tempfile
+import time
+from dao.repositorio import Repositorio
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
 from model.exceptions import ContaInativaError
+from model.pessoa_juridica import PessoaJuridica
+from utils import cnab240
+from utils.cache_idempotencia import CacheIdempotencia, ChaveIdempotenciaReutilizadaError
+from utils.helpers import normalizar_documento
+from utils.logger import logger
+from utils.constantes import TRANSFERENCIAS_POR_BLOCO
 
 
 class PagamentoController:
@@ -8,6 +20,8 @@ class PagamentoController:
     Controlador responsável por processar transferências entre contas de clientes.
     """
 
+    _idempotencia = CacheIdempotencia()  # Resultados de pagamentos já feitos, por chave de idempotência
+
     @staticmethod
     def processar_pagamento(
         conta_origem_num: int,
@@ -15,14 +29,50 @@ class PagamentoController:
         valor: float,
         descricao: str,
         senha: str,
-        conta_destino_numero: int
+        conta_destino_numero: int,
+        chave_idempotencia: str = None
     ) -> dict:
         """
         Processa uma transferência entre contas, validando origem, destino, saldo e limites.
 
+        Com `chave_idempotencia`, uma nova chamada com a mesma chave (por exemplo, uma nova
+        tentativa após um tempo esgotado) devolve o resultado da transferência original sem
+        ler nem alterar contas ou arquivos. Só transferências realizadas ficam guardadas:
+        uma recusa não alterou nada e pode ser tentada de novo com a mesma chave.
+
         Returns:
             dict: Resultado com chaves 'sucesso' e 'mensagem' ou 'erros'.
         """
+        if not chave_idempotencia:
+            return PagamentoController._executar_pagamento(
+                conta_origem_num, doc_destino, valor, descricao, senha, conta_destino_numero
+            )
+
+        impressao = (str(conta_origem_num), str(doc_destino), str(conta_destino_numero), str(valor))
+        try:
+            return PagamentoController._idempotencia.executar(
+                chave_idempotencia,
+                impressao,
+                lambda: PagamentoController._executar_pagamento(
+                    conta_origem_num, doc_destino, valor, descricao, senha, conta_destino_numero
+                ),
+                guardar_se=lambda resultado: resultado["sucesso"]
+            )
+        except ChaveIdempotenciaReutilizadaError as e:
+            return {"sucesso": False, "erros": [str(e)]}
+
+    @staticmethod
+    def _executar_pagamento(
+        conta_origem_num: int,
+        doc_destino: str,
+        valor: float,
+        descricao: str,
+        senha: str,
+        conta_destino_numero: int
+    ) -> dict:
+        """
+        Efetiva a transferência de `processar_pagamento`, sem considerar a chave de idempotência.
+        """
         # Validação inicial
         if not all([doc_destino, valor, conta_origem_num, senha, conta_destino_numero]):
             return {"sucesso": False, "erros": ["Preencha todos os campos obrigatórios."]}
@@ -36,8 +86,8 @@ class PagamentoController:
         if valor <= 0:
             return {"sucesso": False, "erros": ["O valor da transferência deve ser maior que zero."]}
 
-        cliente_dao = ClienteDAO()
-        conta_dao = ContaDAO()
+        cliente_dao = Repositorio.clientes()
+        conta_dao = Repositorio.contas()
 
         # Busca cliente e conta de origem
         cliente_origem = cliente_dao.buscar_cliente_por_numero_conta(conta_origem_num)
@@ -75,16 +125,403 @@ class PagamentoController:
                 "erros": [f"Valor excede o limite de transferência da conta (R$ {conta_origem.limite_transferencia:.2f})."]
             }
 
-        # Efetiva a transferência
+        # Efetiva a transferência com as duas contas travadas (as regras são conferidas de novo
+        # por Conta.transferir); a gravação segue a durabilidade do GravadorContas
         try:
-            conta_origem.transferir(conta_destino, valor)
+            Repositorio.gravador_contas().transferir(conta_origem, conta_destino, valor)
         except (ContaInativaError, ValueError) as e:
             return {"sucesso": False, "erros": [str(e)]}
-
-        conta_dao.atualizar_objeto(conta_origem)
-        conta_dao.atualizar_objeto(conta_destino)
+        except OSError as e:
+            logger.error(f"Falha ao gravar transferência da conta {conta_origem_num}: {e}")
+            return {"sucesso": False, "erros": ["Não foi possível gravar a transferência. Tente novamente."]}
 
         return {
             "sucesso": True,
             "mensagem": f"Transferência de R$ {valor:.2f} realizada com sucesso para {cliente_destino.pessoa.get_nome()} (conta {conta_destino_numero})."
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def processar_lote(
+        caminho_entrada: str,
+        caminho_resultado: str = None,
+        tamanho_bloco: int = TRANSFERENCIAS_POR_BLOCO
+    ) -> dict:
+        """
+        Processa um arquivo de transferências em lote (folha de pagamento), em CSV ou JSONL.
+
+        Cada linha informa "conta_origem", "conta_destino" e "valor" e, opcionalmente,
+        "documento_destino" (conferido com o dono da conta de destino) e "descricao".
+
+        Todas as linhas são validadas antes de qualquer transferência, com as contas e seus
+        donos resolvidos pelos índices dos DAOs. As válidas são aplicadas em ordem, em memória,
+        com as mesmas regras de `processar_pagamento` (contas ativas, valor positivo, saldo e
+        limite de transferência); as contas alteradas são gravadas uma vez a cada
+        `tamanho_bloco` transferências, e não uma vez por transferência. Se a gravação de um
+        bloco falhar, suas transferências são desfeitas e suas linhas, informadas como recusadas.
+
+        O resultado de cada linha vai para `caminho_resultado` (padrão: o nome da entrada
+        com o sufixo "_resultado"), no mesmo formato da entrada.
+
+        Returns:
+            dict: "sucesso", "mensagem", "processadas", "aceitas", "recusadas",
+                  "arquivo_resultado", "duracao" (segundos) e "transferencias_por_segundo";
+                  ou "sucesso" e "erros", se o arquivo não puder ser lido.
+        """
+        inicio = time.perf_counter()
+        try:
+            linhas, delimitador = PagamentoController._ler_arquivo_lote(caminho_entrada)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            return {"sucesso": False, "erros": [f"Não foi possível ler o arquivo de lote: {e}"]}
+
+        conta_dao = Repositorio.contas()
+        contas = {}
+        for linha in linhas:
+            for campo in ("conta_origem", "conta_destino"):
+                numero = str(linha.get(campo) or "").strip()
+                if numero.isdigit() and str(int(numero)) not in contas:
+                    contas[str(int(numero))] = conta_dao.buscar_por_id(numero)
+        donos = Repositorio.clientes().buscar_clientes_por_numeros_conta({
+            str(int(numero)) for numero in (str(linha.get("conta_destino") or "").strip() for linha in linhas
+                                            if linha.get("documento_destino"))
+            if numero.isdigit()
+        })
+
+        # 1ª passagem: valida todas as linhas antes de qualquer transferência
+        resultados = []
+        validas = []
+        for i, linha in enumerate(linhas):
+            erro, transferencia = PagamentoController._validar_linha_lote(linha, contas, donos)
+            resultados.append({
+                "linha": i + 1,
+                "conta_origem": linha.get("conta_origem"),
+                "conta_destino": linha.get("conta_destino"),
+                "valor": linha.get("valor"),
+                "status": "recusada" if erro else "pendente",
+                "mensagem": erro or ""
+            })
+            if transferencia:
+                validas.append((i, *transferencia))
+
+        # 2ª passagem: aplica em ordem, gravando as contas alteradas a cada bloco
+        alteradas, estados, aceitas_no_bloco = {}, {}, []
+        for n, (i, origem, destino, valor) in enumerate(validas, 1):
+            try:
+                with conta_dao.travar_contas(origem.get_numero_conta(), destino.get_numero_conta()):
+                    for conta in (origem, destino):
+                        if conta.get_numero_conta() not in estados:
+                            estados[conta.get_numero_conta()] = (conta, conta._capturar_estado())
+                    origem.transferir(destino, valor)
+            except (ContaInativaError, ValueError) as e:
+                resultados[i].update(status="recusada", mensagem=str(e))
+            else:
+                resultados[i].update(status="aceita", mensagem="Transferência realizada.")
+                alteradas[origem.get_numero_conta()] = origem
+                alteradas[destino.get_numero_conta()] = destino
+                aceitas_no_bloco.append(i)
+            if n % tamanho_bloco == 0 and alteradas:
+                PagamentoController._gravar_bloco_lote(conta_dao, alteradas, estados, aceitas_no_bloco, resultados)
+        PagamentoController._gravar_bloco_lote(conta_dao, alteradas, estados, aceitas_no_bloco, resultados)
+
+        if caminho_resultado is None:
+            base, extensao = os.path.splitext(caminho_entrada)
+            caminho_resultado = f"{base}_resultado{extensao}"
+        PagamentoController._gravar_resultado_lote(caminho_resultado, resultados, delimitador)
+
+        duracao = time.perf_counter() - inicio
+        aceitas = sum(1 for r in resultados if r["status"] == "aceita")
+        vazao = len(resultados) / duracao if duracao > 0 else math.inf
+        logger.info(
+            f"Lote {caminho_entrada}: {len(resultados)} transferência(s), {aceitas} aceita(s), "
+            f"{len(resultados) - aceitas} recusada(s) em {duracao:.2f}s ({vazao:.0f}/s)."
+        )
+        return {
+            "sucesso": True,
+            "mensagem": f"{aceitas} de {len(resultados)} transferência(s) realizada(s).",
+            "processadas": len(resultados),
+            "aceitas": aceitas,
+            "recusadas": len(resultados) - aceitas,
+            "arquivo_resultado": caminho_resultado,
+            "duracao": duracao,
+            "transferencias_por_segundo": vazao
+        }
+
+    @staticmethod
+    def processar_cnab240(
+        caminho_remessa: str,
+        caminho_retorno: str = None,
+        tamanho_bloco: int = TRANSFERENCIAS_POR_BLOCO
+    ) -> dict:
+        """
+        Processa um arquivo de remessa de pagamentos CNAB 240 enviado por uma pessoa jurídica
+        e gera o arquivo de retorno correspondente.
+
+        O arquivo é percorrido duas vezes, registro a registro, sem ser carregado na memória:
+        a primeira confere a estrutura (nada é transferido se ela for inválida); a segunda
+        aplica cada segmento A como uma transferência por `Conta.transferir`, da conta do
+        header de lote para a conta do favorecido. O CNPJ do header de lote deve ser o do
+        dono da conta a debitar. As contas alteradas são gravadas a cada `tamanho_bloco`
+        pagamentos.
+
+        O retorno (padrão: o nome da remessa com o sufixo "_retorno") repete cada registro
+        com o código de ocorrência FEBRABAN nas posições 231-240 ("00" quando efetivado).
+
+        Returns:
+            dict: "sucesso", "mensagem", "processados", "efetivados", "rejeitados",
+                  "ocorrencias" (código -> quantidade), "arquivo_retorno", "duracao" (segundos)
+                  e "registros_por_segundo"; ou "sucesso" e "erros", se a remessa for inválida.
+        """
+        inicio = time.perf_counter()
+        try:
+            with open(caminho_remessa, encoding="latin-1", newline="") as f:
+                total_registros = cnab240.validar_estrutura(f)
+        except (OSError, cnab240.ArquivoCNABInvalidoError) as e:
+            return {"sucesso": False, "erros": [f"Arquivo CNAB 240 inválido: {e}"]}
+
+        if caminho_retorno is None:
+            base, extensao = os.path.splitext(caminho_remessa)
+            caminho_retorno = f"{base}_retorno{extensao}"
+
+        conta_dao = Repositorio.contas()
+        contas = {str(conta.get_numero_conta()): conta for conta in conta_dao.listar_todos_objetos()}
+        ocorrencias = {}
+        alteradas = {}
+        pagamentos = 0
+        pagadora = None
+        ocorrencia_lote = None
+
+        diretorio = os.path.dirname(os.path.abspath(caminho_retorno))
+        descritor, temporario = tempfile.mkstemp(dir=diretorio, suffix=".tmp")
+        try:
+            with open(caminho_remessa, encoding="latin-1", newline="") as remessa, \
+                    os.fdopen(descritor, "w", encoding="latin-1", newline="") as retorno:
+                for linha in cnab240.ler_registros(remessa):
+                    tipo = cnab240.tipo_registro(linha)
+                    ocorrencia = None
+                    if tipo == cnab240.REGISTRO_HEADER_LOTE:
+                        ocorrencia_lote, pagadora = PagamentoController._validar_lote_cnab(
+                            cnab240.ler_lote(linha), contas
+                        )
+                        ocorrencia = ocorrencia_lote
+                    elif tipo == cnab240.REGISTRO_DETALHE and cnab240.segmento(linha) == cnab240.SEGMENTO_PAGAMENTO:
+                        pagamento = cnab240.ler_pagamento(linha)
+                        ocorrencia = ocorrencia_lote
+                        if ocorrencia == cnab240.OCORRENCIA_EFETIVADO:
+                            ocorrencia, destino = PagamentoController._aplicar_pagamento_cnab(
+                                pagamento, pagadora, contas, conta_dao
+                            )
+                            if ocorrencia == cnab240.OCORRENCIA_EFETIVADO:
+                                alteradas[pagadora.get_numero_conta()] = pagadora
+                                alteradas[destino.get_numero_conta()] = destino
+                        ocorrencias[ocorrencia] = ocorrencias.get(ocorrencia, 0) + 1
+                        pagamentos += 1
+                        if pagamentos % tamanho_bloco == 0 and alteradas:
+                            PagamentoController._gravar_bloco(conta_dao, alteradas)
+                    retorno.write(cnab240.marcar_retorno(linha, ocorrencia) + "\r\n")
+            PagamentoController._gravar_bloco(conta_dao, alteradas)
+            os.replace(temporario, caminho_retorno)
+        except Exception:
+            # Grava os pagamentos já efetivados; uma falha aqui não encobre o erro original
+            try:
+                PagamentoController._gravar_bloco(conta_dao, alteradas)
+            except Exception as e:
+                logger.error(f"Falha ao gravar pagamentos da remessa CNAB 240 interrompida: {e}")
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+        duracao = time.perf_counter() - inicio
+        efetivados = ocorrencias.get(cnab240.OCORRENCIA_EFETIVADO, 0)
+        vazao = total_registros / duracao if duracao > 0 else math.inf
+        logger.info(
+            f"Remessa CNAB 240 {caminho_remessa}: {pagamentos} pagamento(s), {efetivados} efetivado(s) "
+            f"em {duracao:.2f}s ({vazao:.0f} registros/s)."
+        )
+        return {
+            "sucesso": True,
+            "mensagem": f"{efetivados} de {pagamentos} pagamento(s) efetivado(s).",
+            "processados": pagamentos,
+            "efetivados": efetivados,
+            "rejeitados": pagamentos - efetivados,
+            "ocorrencias": ocorrencias,
+            "arquivo_retorno": caminho_retorno,
+            "duracao": duracao,
+            "registros_por_segundo": vazao
+        }
+
+    # === MÉTODOS AUXILIARES ===
+
+    @staticmethod
+    def _validar_lote_cnab(lote: cnab240.LoteCNAB, contas: dict) -> tuple:
+        """
+        Confere o header de lote: a conta a debitar deve existir, estar ativa e pertencer
+        a uma pessoa jurídica com o CNPJ informado.
+
+        Returns:
+            tuple: (código de ocorrência do lote, conta pagadora ou None).
+        """
+        pagadora = contas.get(lote.conta)
+        if not pagadora or not pagadora.get_estado_da_conta():
+            return cnab240.OCORRENCIA_CONTA_PAGADOR_INVALIDA, None
+        dono = Repositorio.clientes().buscar_cliente_por_numero_conta(lote.conta)
+        if (not dono or not isinstance(dono.pessoa, PessoaJuridica)
+                or dono.pessoa.get_numero_documento() != normalizar_documento(lote.cnpj)):
+            return cnab240.OCORRENCIA_INSCRICAO_INVALIDA, None
+        return cnab240.OCORRENCIA_EFETIVADO, pagadora
+
+    @staticmethod
+    def _aplicar_pagamento_cnab(pagamento: cnab240.PagamentoCNAB, pagadora, contas: dict, conta_dao) -> tuple:
+        """
+        Aplica um segmento A como transferência da conta pagadora para a do favorecido.
+
+        Returns:
+            tuple: (código de ocorrência, conta de destino ou None).
+        """
+        if pagamento.movimento != cnab240.MOVIMENTO_INCLUSAO:
+            return cnab240.OCORRENCIA_MOVIMENTO_INVALIDO, None
+        destino = contas.get(pagamento.conta_favorecido)
+        if not destino or not destino.get_estado_da_conta() or destino is pagadora:
+            return cnab240.OCORRENCIA_CONTA_FAVORECIDO_INVALIDA, None
+
+        valor = pagamento.valor_centavos / 100
+        if valor <= 0 or valor > pagadora.limite_transferencia:
+            return cnab240.OCORRENCIA_VALOR_INVALIDO, None
+        with conta_dao.travar_contas(pagadora.get_numero_conta(), destino.get_numero_conta()):
+            if valor > pagadora.get_saldo():
+                return cnab240.OCORRENCIA_SALDO_INSUFICIENTE, None
+            try:
+                pagadora.transferir(destino, valor)
+            except ContaInativaError:
+                return cnab240.OCORRENCIA_CONTA_FAVORECIDO_INVALIDA, None
+            except ValueError:
+                return cnab240.OCORRENCIA_VALOR_INVALIDO, None
+        return cnab240.OCORRENCIA_EFETIVADO, destino
+
+    @staticmethod
+    def _gravar_bloco(conta_dao, alteradas: dict) -> None:
+        """
+        Grava as contas alteradas por um bloco de transferências, com todas elas travadas,
+        numa única UnidadeDeTrabalho (saldos e históricos juntos), e esvazia `alteradas`.
+        """
+        if not alteradas:
+            return
+        with conta_dao.travar_contas(*alteradas), UnidadeDeTrabalho() as unidade:
+            for conta in alteradas.values():
+                unidade.atualizar(conta_dao, conta)
+        alteradas.clear()
+
+    @staticmethod
+    def _gravar_bloco_lote(conta_dao, alteradas: dict, estados: dict, aceitas: list, resultados: list) -> None:
+        """
+        Grava um bloco do lote. Se a gravação falhar, as contas do bloco voltam ao estado de
+        antes dele (`estados`: número -> (conta, estado)) e as linhas `aceitas` no bloco passam
+        a recusadas. Em ambos os casos, prepara `estados` e `aceitas` para o próximo bloco.
+        """
+        try:
+            PagamentoController._gravar_bloco(conta_dao, alteradas)
+        except Exception as e:
+            logger.error(f"Falha ao gravar bloco do lote ({len(aceitas)} transferência(s) desfeitas): {e}")
+            with conta_dao.travar_contas(*estados):
+                for conta, estado in estados.values():
+                    conta._restaurar_estado(estado)
+            for i in aceitas:
+                resultados[i].update(status="recusada", mensagem="Não foi possível gravar a transferência.")
+            alteradas.clear()
+        estados.clear()
+        aceitas.clear()
+
+    @staticmethod
+    def _ler_arquivo_lote(caminho: str) -> tuple[list[dict], str]:
+        """
+        Lê as linhas do arquivo de lote: JSONL (um objeto por linha) ou CSV com cabeçalho,
+        separado por vírgula ou ponto e vírgula.
+
+        Returns:
+            tuple: (linhas como dicionários, delimitador do CSV ou None para JSONL).
+
+        Raises:
+            ValueError: Se uma linha JSONL for inválida.
+        """
+        if caminho.lower().endswith(".jsonl"):
+            linhas = []
+            with open(caminho, encoding="utf-8") as f:
+                for numero, texto in enumerate(f, 1):
+                    if not texto.strip():
+                        continue
+                    try:
+                        linha = json.loads(texto)
+                    except json.JSONDecodeError:
+                        raise ValueError(f"linha {numero} não é um JSON válido.")
+                    if not isinstance(linha, dict):
+                        raise ValueError(f"linha {numero} não é um objeto JSON.")
+                    linhas.append(linha)
+            return linhas, None
+
+        with open(caminho, encoding="utf-8-sig", newline="") as f:
+            cabecalho = f.readline()
+            delimitador = ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+            f.seek(0)
+            return list(csv.DictReader(f, delimiter=delimitador)), delimitador
+
+    @staticmethod
+    def _validar_linha_lote(linha: dict, contas: dict, donos: dict) -> tuple:
+        """
+        Valida uma linha do lote sem alterar nenhuma conta.
+
+        Returns:
+            tuple: (mensagem de erro, None) ou (None, (conta de origem, conta de destino, valor)).
+        """
+        origem_num = str(linha.get("conta_origem") or "").strip()
+        destino_num = str(linha.get("conta_destino") or "").strip()
+        if not origem_num or not destino_num or linha.get("valor") in (None, ""):
+            return "Preencha conta_origem, conta_destino e valor.", None
+        if not origem_num.isdigit() or not destino_num.isdigit():
+            return "Número de conta inválido.", None
+
+        valor = linha["valor"]
+        try:
+            if isinstance(valor, str):
+                valor = valor.strip()
+                valor = valor.replace(",", ".") if "." not in valor else valor
+            valor = float(valor)
+        except (TypeError, ValueError):
+            return "Valor inválido.", None
+        if not math.isfinite(valor) or valor <= 0:
+            return "O valor da transferência deve ser maior que zero.", None
+        if round(valor, 2) != valor:
+            return "O valor deve ter no máximo duas casas decimais.", None
+
+        origem_num, destino_num = str(int(origem_num)), str(int(destino_num))
+        origem = contas.get(origem_num)
+        destino = contas.get(destino_num)
+        if not origem:
+            return "Conta de origem não encontrada.", None
+        if not destino:
+            return "Conta de destino não encontrada.", None
+        if origem is destino:
+            return "Não é possível transferir para a mesma conta.", None
+
+        documento = str(linha.get("documento_destino") or "").strip()
+        if documento:
+            dono = donos.get(destino_num)
+            if not dono or dono.pessoa.get_numero_documento() != normalizar_documento(documento):
+                return f"A conta {destino_num} não pertence ao documento {documento}.", None
+
+        if valor > origem.limite_transferencia:
+            return f"Valor excede o limite de transferência da conta (R$ {origem.limite_transferencia:.2f}).", None
+        return None, (origem, destino, valor)
+
+    @staticmethod
+    def _gravar_resultado_lote(caminho: str, resultados: list[dict], delimitador: str = None) -> None:
+        """
+        Grava o resultado de cada linha do lote: JSONL se `delimitador` for None, senão CSV.
+        """
+        with open(caminho, "w", encoding="utf-8", newline="") as f:
+            if delimitador is None:
+                f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in resultados)
+                return
+            escritor = csv.DictWriter(
+                f, fieldnames=["linha", "conta_origem", "conta_destino", "valor", "status", "mensagem"],
+                delimiter=delimitador
+            )
+            escritor.writeheader()
+            escritor.writerows(resultados)
@@ -1,5 +1,5 @@
-from dao.cliente_dao import ClienteDAO
-from dao.pessoa_dao import PessoaDAO 
+from dao.repositorio import Repositorio
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
 from model.pessoa_fisica import PessoaFisica
 from model.cliente import Cliente
 from utils.logger import logger
@@ -17,7 +17,7 @@ class PerfilController:
         Busca um cliente pelo número do documento (CPF ou CNPJ).
         """
         logger.info(f"Buscando cliente pelo documento: {doc}")
-        return ClienteDAO().buscar_por_id(doc)
+        return Repositorio.clientes().buscar_por_id(doc)
 
     @staticmethod
     def buscar_cliente_por_conta(numero_conta: int) -> Optional[Cliente]:
@@ -25,15 +25,40 @@ class PerfilController:
         Busca um cliente associado a uma conta específica.
         """
         logger.info(f"Buscando cliente pela conta: {numero_conta}")
-        return ClienteDAO().buscar_cliente_por_numero_conta(numero_conta)
+        return Repositorio.clientes().buscar_cliente_por_numero_conta(numero_conta)
 
     @staticmethod
     def atualizar_cliente(cliente: Cliente):
         """
-        Atualiza os dados persistidos de um cliente.
+        Atualiza os dados persistidos de um cliente e de sua pessoa, numa única gravação.
         """
-        ClienteDAO().atualizar_objeto(cliente)
-        PessoaDAO().atualizar_objeto(cliente.pessoa)
+        with UnidadeDeTrabalho() as unidade:
+            unidade.atualizar(Repositorio.clientes(), cliente)
+            unidade.atualizar(Repositorio.pessoas(), cliente.pessoa)
+
+    @staticmethod
+    def atualizar_contato(cliente: Cliente, email: str, telefone: str, senha_atual: str, nova_senha: str = None):
+        """
+        Altera e-mail, telefone e, se informada, a senha do cliente, e grava tudo numa única
+        unidade de trabalho. Se a validação ou a gravação falhar, cliente e pessoa (objetos
+        compartilhados entre as sessões) voltam ao estado anterior.
+
+        Raises:
+            ValueError: Se um dado for inválido, a senha atual estiver incorreta ou o e-mail
+                já estiver em uso; nada é gravado.
+        """
+        pessoa = cliente.pessoa
+        anterior_pessoa, anterior_cliente = vars(pessoa).copy(), vars(cliente).copy()
+        try:
+            pessoa.set_email(email)
+            pessoa.set_telefone(telefone)
+            if nova_senha:
+                cliente.alterar_senha(senha_atual, nova_senha)
+            PerfilController.atualizar_cliente(cliente)
+        except Exception:
+            vars(pessoa).update(anterior_pessoa)
+            vars(cliente).update(anterior_cliente)
+            raise
 
     @staticmethod
     def obter_dados_perfil(documento: str) -> dict:
@@ -45,7 +70,7 @@ class PerfilController:
         """
         logger.info(f"Buscando dados de perfil para documento: {documento}")
         try:
-            cliente = ClienteDAO().buscar_por_id(documento)
+            cliente = Repositorio.clientes().buscar_por_id(documento)
             if cliente is None:
                 return {"status": "erro", "mensagem": "Cliente não encontrado."}
 
@@ -0,0 +1,572 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+from typing import List, Optional, Union
+
+from utils.logger import logger
+from utils.constantes import (
+    BACKEND_ARMAZENAMENTO,
+    BACKEND_JSON,
+    BACKEND_JOURNAL,
+    BACKEND_SQLITE,
+    DIRETORIO_DATABASE,
+    ARQUIVO_SQLITE,
+    LIMITE_JOURNAL_COMPACTACAO,
+    JOURNAL_FSYNC
+)
+
+
+class Armazenamento(ABC):
+    """
+    Classe abstrata que representa o meio físico onde os registros de um DAO são guardados.
+
+    Cada registro é um dicionário identificado pelo valor do campo `chave`
+    (o mesmo retornado por `DAO.tipo_de_id()`).
+
+    O atributo `busca_indexada` indica se `buscar` localiza um registro sem percorrer
+    todo o conteúdo armazenado, e `backend` identifica o tipo (ver `obter_armazenamento`).
+    """
+
+    busca_indexada = False
+    backend: str = None
+
+    def __init__(self, chave: str):
+        """
+        Inicializa o armazenamento com o nome do campo identificador dos registros.
+        """
+        self.chave = chave
+        self._trava = threading.RLock()
+
+    @abstractmethod
+    def ler_todos(self) -> List[dict]:
+        """
+        Retorna todos os registros armazenados.
+        """
+        pass
+
+    @abstractmethod
+    def salvar_todos(self, dados: List[dict]) -> None:
+        """
+        Substitui todo o conteúdo armazenado pela lista informada.
+        """
+        pass
+
+    @abstractmethod
+    def buscar(self, id_valor) -> Optional[dict]:
+        """
+        Retorna o registro com o identificador informado, ou None.
+        """
+        pass
+
+    @abstractmethod
+    def inserir(self, registro: dict) -> None:
+        """
+        Insere um novo registro.
+
+        Raises:
+            ValueError: Se já existir um registro com o mesmo identificador.
+        """
+        pass
+
+    @abstractmethod
+    def atualizar(self, registro: dict) -> bool:
+        """
+        Substitui o registro de mesmo identificador.
+        Retorna False se o registro não existir.
+        """
+        pass
+
+    @abstractmethod
+    def remover(self, id_valor) -> bool:
+        """
+        Remove o registro com o identificador informado.
+        Retorna False se o registro não existir.
+        """
+        pass
+
+    def atualizar_varios(self, registros: List[dict]) -> List[str]:
+        """
+        Substitui de uma só vez os registros de mesmo identificador (atualizações em lote).
+        Registros inexistentes são ignorados.
+
+        A implementação padrão lê e regrava todo o conteúdo uma única vez; subclasses com
+        escrita por registro podem sobrescrever.
+
+        Returns:
+            list[str]: Identificadores dos registros atualizados.
+        """
+        with self._trava:
+            dados = self.ler_todos()
+            novos = {str(registro[self.chave]): registro for registro in registros}
+            atualizados = []
+            for i, item in enumerate(dados):
+                id_item = str(item.get(self.chave))
+                if id_item in novos:
+                    dados[i] = novos[id_item]
+                    atualizados.append(id_item)
+            if atualizados:
+                self.salvar_todos(dados)
+            return atualizados
+
+    def aplicar(self, salvar: List[dict], remover: List = ()) -> None:
+        """
+        Grava de uma só vez um conjunto de alterações: cada registro de `salvar` substitui o
+        de mesmo identificador (ou é acrescentado) e os identificadores de `remover` são
+        apagados. Aplicar as mesmas alterações de novo não muda o resultado, o que permite
+        repeti-las na recuperação de uma UnidadeDeTrabalho interrompida.
+
+        A implementação padrão lê e regrava todo o conteúdo uma única vez.
+        """
+        with self._trava:
+            removidos = {str(id_valor) for id_valor in remover}
+            novos = {str(registro[self.chave]): registro for registro in salvar
+                     if str(registro[self.chave]) not in removidos}
+            dados = []
+            for item in self.ler_todos():
+                id_item = str(item.get(self.chave))
+                if id_item not in removidos:
+                    dados.append(novos.pop(id_item, item))
+            dados.extend(novos.values())
+            self.salvar_todos(dados)
+
+    def _erro_duplicado(self, registro: dict) -> ValueError:
+        return ValueError(f"Objeto com {self.chave} = '{registro[self.chave]}' já existe.")
+
+
+class ArmazenamentoJSON(Armazenamento):
+    """
+    Armazenamento em um arquivo JSON contendo a lista de registros.
+    Toda leitura interpreta o arquivo inteiro e toda escrita o reescreve.
+    """
+
+    backend = BACKEND_JSON
+
+    def __init__(self, caminho: str, chave: str):
+        super().__init__(chave)
+        self.caminho = caminho
+
+    def ler_todos(self) -> List[dict]:
+        """
+        Lê o arquivo JSON. Retorna lista vazia se ele não existir ou estiver corrompido.
+        """
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+    def salvar_todos(self, dados: List[dict]) -> None:
+        with self._trava:
+            _gravar_json_atomico(self.caminho, dados)
+
+    def buscar(self, id_valor) -> Optional[dict]:
+        for item in self.ler_todos():
+            if str(item.get(self.chave)) == str(id_valor):
+                return item
+        return None
+
+    def inserir(self, registro: dict) -> None:
+        with self._trava:
+            dados = self.ler_todos()
+            if any(item.get(self.chave) == registro[self.chave] for item in dados):
+                raise self._erro_duplicado(registro)
+            dados.append(registro)
+            self.salvar_todos(dados)
+
+    def atualizar(self, registro: dict) -> bool:
+        with self._trava:
+            dados = self.ler_todos()
+            for i, item in enumerate(dados):
+                if item.get(self.chave) == registro[self.chave]:
+                    dados[i] = registro
+                    self.salvar_todos(dados)
+                    return True
+            return False
+
+    def remover(self, id_valor) -> bool:
+        with self._trava:
+            dados = self.ler_todos()
+            novo_dados = [item for item in dados if item.get(self.chave) != id_valor]
+            if len(novo_dados) == len(dados):
+                return False
+            self.salvar_todos(novo_dados)
+            return True
+
+
+class ArmazenamentoJournal(Armazenamento):
+    """
+    Armazenamento em arquivo JSON (snapshot) acompanhado de um log de alterações.
+
+    Cada inserção, atualização ou remoção acrescenta uma única linha ao arquivo
+    `<arquivo>.journal`, de modo que o custo de escrita não depende do tamanho da base.
+    A leitura reaplica o log sobre o último snapshot e mantém o resultado em memória.
+    Quando o log atinge LIMITE_JOURNAL_COMPACTACAO linhas, uma thread em segundo plano
+    grava um novo snapshot (troca atômica via os.replace) e descarta o log antigo.
+    """
+
+    busca_indexada = True
+    backend = BACKEND_JOURNAL
+
+    def __init__(self, caminho: str, chave: str):
+        super().__init__(chave)
+        self.caminho = caminho
+        self.caminho_log = caminho + ".journal"
+        self.caminho_log_antigo = caminho + ".journal.antigo"
+        self._registros = None          # OrderedDict id -> registro, carregado sob demanda
+        self._assinatura = None         # Estado dos arquivos na última sincronização
+        self._linhas_log = 0
+        self._compactando = False
+
+    # === Leitura e reaplicação do log ===
+
+    def _assinatura_arquivos(self) -> tuple:
+        def estado(caminho):
+            try:
+                info = os.stat(caminho)
+                return info.st_mtime_ns, info.st_size
+            except FileNotFoundError:
+                return None
+        return estado(self.caminho), estado(self.caminho_log_antigo), estado(self.caminho_log)
+
+    def _sincronizar(self) -> None:
+        """
+        Recarrega o estado em memória caso os arquivos tenham sido alterados fora desta instância.
+        """
+        if self._registros is None or self._assinatura_arquivos() != self._assinatura:
+            self._carregar()
+
+    def _carregar(self) -> None:
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except FileNotFoundError:
+            dados = []
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Arquivo de dados corrompido: {self.caminho}") from e
+
+        self._registros = OrderedDict((str(item[self.chave]), item) for item in dados)
+        self._linhas_log = self._reaplicar_log(self.caminho_log_antigo)
+        self._linhas_log += self._reaplicar_log(self.caminho_log)
+        self._assinatura = self._assinatura_arquivos()
+
+    def _reaplicar_log(self, caminho_log: str) -> int:
+        """
+        Aplica as operações do log sobre o estado em memória.
+
+        Só a última linha pode estar incompleta (escrita interrompida): ela é descartada e
+        removida do arquivo. Uma linha inválida antes dela indica um log corrompido.
+
+        Returns:
+            int: Quantidade de operações aplicadas.
+
+        Raises:
+            ValueError: Se uma linha que não é a última for inválida; o log não é alterado.
+        """
+        try:
+            with open(caminho_log, 'rb') as f:
+                conteudo = f.read()
+        except FileNotFoundError:
+            return 0
+
+        linhas = conteudo.splitlines(keepends=True)
+        aplicadas = 0
+        posicao_valida = 0
+        for numero, linha in enumerate(linhas, 1):
+            try:
+                if not linha.endswith(b"\n"):
+                    raise ValueError("linha incompleta")
+                operacao = json.loads(linha)
+            except ValueError as e:
+                if numero < len(linhas):
+                    raise ValueError(f"Log de alterações corrompido na linha {numero}: {caminho_log}") from e
+                logger.warning(f"Descartando registro incompleto no final de {caminho_log}.")
+                with open(caminho_log, 'r+b') as f:
+                    f.truncate(posicao_valida)
+                break
+            self._aplicar(operacao)
+            posicao_valida += len(linha)
+            aplicadas += 1
+        return aplicadas
+
+    def _aplicar(self, operacao: dict) -> None:
+        if operacao["op"] == "salvar":
+            registro = operacao["registro"]
+            self._registros[str(registro[self.chave])] = registro
+        elif operacao["op"] == "remover":
+            self._registros.pop(str(operacao["id"]), None)
+
+    # === Escrita ===
+
+    def _anexar(self, *operacoes: dict) -> None:
+        """
+        Acrescenta as operações ao log (uma única escrita) e as aplica no estado em memória.
+        """
+        with open(self.caminho_log, 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(operacao) + "\n" for operacao in operacoes))
+            f.flush()
+            if JOURNAL_FSYNC:
+                os.fsync(f.fileno())
+
+        for operacao in operacoes:
+            self._aplicar(operacao)
+        self._linhas_log += len(operacoes)
+        self._assinatura = self._assinatura_arquivos()
+
+        if self._linhas_log >= LIMITE_JOURNAL_COMPACTACAO and not self._compactando:
+            self._compactando = True
+            threading.Thread(target=self.compactar, daemon=True).start()
+
+    def compactar(self) -> None:
+        """
+        Incorpora o log a um novo snapshot e descarta as linhas já incorporadas.
+
+        O log atual é renomeado antes da gravação, para que novas escritas sigam para
+        um log vazio sem esperar o snapshot ficar pronto. Se o processo for interrompido,
+        o log antigo é reaplicado na próxima leitura (as operações são idempotentes).
+        """
+        try:
+            with self._trava:
+                self._sincronizar()
+                if os.path.exists(self.caminho_log_antigo):
+                    # Uma compactação anterior foi interrompida: incorpora tudo de uma vez.
+                    _gravar_json_atomico(self.caminho, list(self._registros.values()))
+                    os.remove(self.caminho_log_antigo)
+                if not os.path.exists(self.caminho_log):
+                    return
+                os.replace(self.caminho_log, self.caminho_log_antigo)
+                dados = list(self._registros.values())
+                self._linhas_log = 0
+                self._assinatura = self._assinatura_arquivos()
+
+            _gravar_json_atomico(self.caminho, dados)
+
+            with self._trava:
+                os.remove(self.caminho_log_antigo)
+                self._assinatura = self._assinatura_arquivos()
+        finally:
+            self._compactando = False
+
+    # === Interface de Armazenamento ===
+
+    def ler_todos(self) -> List[dict]:
+        with self._trava:
+            self._sincronizar()
+            return list(self._registros.values())
+
+    def salvar_todos(self, dados: List[dict]) -> None:
+        with self._trava:
+            _gravar_json_atomico(self.caminho, dados)
+            for caminho_log in (self.caminho_log_antigo, self.caminho_log):
+                if os.path.exists(caminho_log):
+                    os.remove(caminho_log)
+            self._registros = None
+            self._carregar()
+
+    def buscar(self, id_valor) -> Optional[dict]:
+        with self._trava:
+            self._sincronizar()
+            return self._registros.get(str(id_valor))
+
+    def inserir(self, registro: dict) -> None:
+        with self._trava:
+            self._sincronizar()
+            if str(registro[self.chave]) in self._registros:
+                raise self._erro_duplicado(registro)
+            self._anexar({"op": "salvar", "registro": registro})
+
+    def atualizar(self, registro: dict) -> bool:
+        with self._trava:
+            self._sincronizar()
+            if str(registro[self.chave]) not in self._registros:
+                return False
+            self._anexar({"op": "salvar", "registro": registro})
+            return True
+
+    def remover(self, id_valor) -> bool:
+        with self._trava:
+            self._sincronizar()
+            if str(id_valor) not in self._registros:
+                return False
+            self._anexar({"op": "remover", "id": id_valor})
+            return True
+
+    def atualizar_varios(self, registros: List[dict]) -> List[str]:
+        with self._trava:
+            self._sincronizar()
+            existentes = [registro for registro in registros if str(registro[self.chave]) in self._registros]
+            if existentes:
+                self._anexar(*({"op": "salvar", "registro": registro} for registro in existentes))
+            return [str(registro[self.chave]) for registro in existentes]
+
+    def aplicar(self, salvar: List[dict], remover: List = ()) -> None:
+        operacoes = [{"op": "salvar", "registro": registro} for registro in salvar]
+        operacoes += [{"op": "remover", "id": id_valor} for id_valor in remover]
+        with self._trava:
+            self._sincronizar()
+            if operacoes:
+                self._anexar(*operacoes)
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """
+    Armazenamento em uma tabela SQLite, com uma linha por registro.
+
+    A coluna `id` (chave primária, portanto indexada) guarda o identificador do registro
+    e a coluna `dados` guarda o registro completo serializado em JSON. Inserções,
+    atualizações e remoções afetam apenas a linha correspondente.
+    """
+
+    busca_indexada = True
+    backend = BACKEND_SQLITE
+
+    def __init__(self, caminho_banco: str, tabela: str, chave: str):
+        super().__init__(chave)
+        self.caminho_banco = caminho_banco
+        self.tabela = tabela
+        self._conexao = sqlite3.connect(caminho_banco, check_same_thread=False)
+        with self._trava, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(
+                f"CREATE TABLE IF NOT EXISTS {tabela} (id TEXT PRIMARY KEY, dados TEXT NOT NULL)"
+            )
+
+    def ler_todos(self) -> List[dict]:
+        with self._trava:
+            linhas = self._conexao.execute(f"SELECT dados FROM {self.tabela} ORDER BY rowid").fetchall()
+        return [json.loads(dados) for (dados,) in linhas]
+
+    def salvar_todos(self, dados: List[dict]) -> None:
+        with self._trava, self._conexao:
+            self._conexao.execute(f"DELETE FROM {self.tabela}")
+            self._conexao.executemany(
+                f"INSERT INTO {self.tabela} (id, dados) VALUES (?, ?)",
+                [(str(item[self.chave]), json.dumps(item)) for item in dados]
+            )
+
+    def buscar(self, id_valor) -> Optional[dict]:
+        with self._trava:
+            linha = self._conexao.execute(
+                f"SELECT dados FROM {self.tabela} WHERE id = ?", (str(id_valor),)
+            ).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def inserir(self, registro: dict) -> None:
+        try:
+            with self._trava, self._conexao:
+                self._conexao.execute(
+                    f"INSERT INTO {self.tabela} (id, dados) VALUES (?, ?)",
+                    (str(registro[self.chave]), json.dumps(registro))
+                )
+        except sqlite3.IntegrityError:
+            raise self._erro_duplicado(registro)
+
+    def atualizar(self, registro: dict) -> bool:
+        with self._trava, self._conexao:
+            cursor = self._conexao.execute(
+                f"UPDATE {self.tabela} SET dados = ? WHERE id = ?",
+                (json.dumps(registro), str(registro[self.chave]))
+            )
+        return cursor.rowcount > 0
+
+    def remover(self, id_valor) -> bool:
+        with self._trava, self._conexao:
+            cursor = self._conexao.execute(f"DELETE FROM {self.tabela} WHERE id = ?", (str(id_valor),))
+        return cursor.rowcount > 0
+
+    def atualizar_varios(self, registros: List[dict]) -> List[str]:
+        atualizados = []
+        with self._trava, self._conexao:
+            for registro in registros:
+                cursor = self._conexao.execute(
+                    f"UPDATE {self.tabela} SET dados = ? WHERE id = ?",
+                    (json.dumps(registro), str(registro[self.chave]))
+                )
+                if cursor.rowcount:
+                    atualizados.append(str(registro[self.chave]))
+        return atualizados
+
+    def aplicar(self, salvar: List[dict], remover: List = ()) -> None:
+        with self._trava, self._conexao:
+            self._conexao.executemany(
+                f"INSERT INTO {self.tabela} (id, dados) VALUES (?, ?) "
+                f"ON CONFLICT(id) DO UPDATE SET dados = excluded.dados",
+                [(str(registro[self.chave]), json.dumps(registro)) for registro in salvar]
+            )
+            self._conexao.executemany(
+                f"DELETE FROM {self.tabela} WHERE id = ?", [(str(id_valor),) for id_valor in remover]
+            )
+
+    def importar_json(self, caminho_json: str) -> int:
+        """
+        Copia para a tabela os registros de um arquivo JSON legado, caso a tabela esteja vazia.
+
+        Returns:
+            int: Quantidade de registros importados.
+        """
+        with self._trava:
+            vazia = self._conexao.execute(f"SELECT 1 FROM {self.tabela} LIMIT 1").fetchone() is None
+            if not vazia:
+                return 0
+            dados = ArmazenamentoJSON(caminho_json, self.chave).ler_todos()
+            if dados:
+                self.salvar_todos(dados)
+            return len(dados)
+
+
+def _gravar_json_atomico(caminho: str, dados: Union[List[dict], dict]) -> None:
+    """
+    Grava a lista em um arquivo temporário e o renomeia sobre o destino,
+    para que uma interrupção nunca deixe o arquivo pela metade.
+    """
+    temporario = caminho + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+
+_armazenamentos = {}
+_trava_registro = threading.Lock()
+
+
+def obter_armazenamento(arquivo_json: str, chave: str, backend: str = None) -> Armazenamento:
+    """
+    Retorna o armazenamento configurado para o arquivo de dados informado.
+
+    A instância é compartilhada por todo o processo, de modo que diferentes DAOs
+    da mesma entidade usem a mesma conexão e a mesma trava de escrita.
+
+    Args:
+        arquivo_json (str): Nome do arquivo de dados (ex.: "contas.json").
+        chave (str): Campo identificador dos registros.
+        backend (str, opcional): "json", "journal" ou "sqlite". Padrão: BACKEND_ARMAZENAMENTO.
+
+    Raises:
+        ValueError: Se o backend for desconhecido.
+    """
+    backend = backend or BACKEND_ARMAZENAMENTO
+    caminho_json = os.path.join(DIRETORIO_DATABASE, arquivo_json)
+    identificador = (backend, os.path.abspath(caminho_json))
+
+    with _trava_registro:
+        if identificador in _armazenamentos:
+            return _armazenamentos[identificador]
+
+        if backend == BACKEND_JSON:
+            armazenamento = ArmazenamentoJSON(caminho_json, chave)
+        elif backend == BACKEND_JOURNAL:
+            armazenamento = ArmazenamentoJournal(caminho_json, chave)
+        elif backend == BACKEND_SQLITE:
+            tabela = os.path.splitext(arquivo_json)[0]
+            caminho_banco = os.path.join(DIRETORIO_DATABASE, ARQUIVO_SQLITE)
+            armazenamento = ArmazenamentoSQLite(caminho_banco, tabela, chave)
+            armazenamento.importar_json(caminho_json)
+        else:
+            raise ValueError(f"Backend de armazenamento desconhecido: {backend}")
+
+        _armazenamentos[identificador] = armazenamento
+        return armazenamento
@@ -1,8 +1,9 @@
-from typing import Optional, List
+from typing import Dict, Iterable, Optional
 from model.cliente import Cliente
 from dao.dao import DAO
 from dao.pessoa_dao import PessoaDAO
 from dao.conta_dao import ContaDAO
+from utils.helpers import normalizar_documento
 from utils.constantes import ARQUIVO_CLIENTES
 
 
@@ -12,33 +13,51 @@ class ClienteDAO(DAO):
     Pessoa, senha e lista de contas associadas.
     """
 
-    def __init__(self):
+    def __init__(self, pessoa_dao: PessoaDAO = None, conta_dao: ContaDAO = None):
         """
         Inicializa o DAO de clientes, bem como os DAOs auxiliares para Pessoa e Conta.
+
+        Os DAOs auxiliares podem ser compartilhados (ver dao.repositorio.Repositorio),
+        para que Cliente, Pessoa e Conta usem os mesmos objetos em memória.
         """
         super().__init__(ARQUIVO_CLIENTES)
-        self._pessoa_dao = PessoaDAO()
-        self._conta_dao = ContaDAO()
-        self._cache_clientes_objetos = None
+        self._pessoa_dao = pessoa_dao or PessoaDAO()
+        self._conta_dao = conta_dao or ContaDAO()
+
+        # Índice reverso numero_conta -> numero_documento, mantido junto ao mapa de identidade.
+        # Guarda também as contas indexadas por cliente, pois o objeto pode ser alterado antes
+        # de chegar ao atualizar_objeto.
+        self._cliente_por_conta: Dict[str, str] = {}
+        self._contas_indexadas: Dict[str, tuple] = {}
 
     def criar_objeto(self, dados: dict) -> Cliente:
         """
         Constrói um objeto Cliente a partir dos dados do JSON, incluindo as contas vinculadas.
+
+        Pessoa e contas são obtidas pelos mapas de identidade dos DAOs auxiliares (busca O(1)).
         """
         pessoa = self._pessoa_dao.buscar_por_id(dados["numero_documento"])
-        todas_contas = {c.get_numero_conta(): c for c in self._conta_dao.listar_todos_objetos()}
 
         contas = []
         for n in dados.get("contas", []):
             try:
-                numero = int(n)
-                if numero in todas_contas:
-                    contas.append(todas_contas[numero])
+                conta = self._conta_dao.buscar_por_id(int(n))
             except ValueError:
                 continue
+            if conta is not None:
+                contas.append(conta)
 
         return Cliente(pessoa=pessoa, senha=dados["senha"], contas=contas)
 
+    def _criar_objetos(self, dados: list) -> list:
+        """
+        Hidrata vários clientes carregando pessoas e contas uma única vez,
+        em vez de uma leitura por cliente. O custo total é linear no número de registros.
+        """
+        self._pessoa_dao.listar_todos_objetos()
+        self._conta_dao.listar_todos_objetos()
+        return [self.criar_objeto(item) for item in dados]
+
     def extrair_dados_do_objeto(self, obj: Cliente) -> dict:
         """
         Converte um objeto Cliente em dicionário para persistência no JSON.
@@ -55,51 +74,42 @@ class ClienteDAO(DAO):
         """
         return "numero_documento"
 
-    def listar_todos_objetos(self) -> List[Cliente]:
+    def _normalizar_id(self, id_valor) -> str:
         """
-        Retorna todos os clientes armazenados, com suporte a cache.
+        O cliente é identificado pelo documento na forma canônica (só dígitos): CPF/CNPJ com
+        ou sem formatação encontram o mesmo cliente.
         """
-        if self._cache_clientes_objetos is not None:
-            return self._cache_clientes_objetos
+        return normalizar_documento(id_valor)
 
-        dados_raw = self._ler_dados_do_json()
-        self._cache_clientes_objetos = [self.criar_objeto(d) for d in dados_raw]
-        return self._cache_clientes_objetos
-
-    def buscar_por_id(self, id_valor: str) -> Optional[Cliente]:
-        """
-        Retorna o cliente com o documento informado.
-        """
-        return super().buscar_por_id(id_valor)
+    def _indexar(self, id_objeto: str, obj: Cliente) -> None:
+        numeros = tuple(str(c.get_numero_conta()) for c in obj.contas)
+        self._contas_indexadas[id_objeto] = numeros
+        for numero in numeros:
+            self._cliente_por_conta[numero] = id_objeto
 
-    def salvar_objeto(self, obj: Cliente) -> None:
-        """
-        Salva um novo cliente e limpa o cache.
-        """
-        super().salvar_objeto(obj)
-        self._cache_clientes_objetos = None
+    def _desindexar(self, id_objeto: str, obj: Cliente) -> None:
+        for numero in self._contas_indexadas.pop(id_objeto, ()):
+            if self._cliente_por_conta.get(numero) == id_objeto:
+                del self._cliente_por_conta[numero]
 
-    def atualizar_objeto(self, obj: Cliente) -> bool:
+    def buscar_cliente_por_numero_conta(self, numero_conta: int) -> Optional[Cliente]:
         """
-        Atualiza um cliente existente e limpa o cache.
+        Retorna o cliente associado à conta informada, consultando o índice reverso.
         """
-        resultado = super().atualizar_objeto(obj)
-        self._cache_clientes_objetos = None
-        return resultado
+        return self.buscar_clientes_por_numeros_conta([numero_conta])[str(numero_conta)]
 
-    def deletar_objeto(self, id_valor: str) -> bool:
+    def buscar_clientes_por_numeros_conta(self, numeros_conta: Iterable) -> Dict[str, Optional[Cliente]]:
         """
-        Remove um cliente com base no número do documento e limpa o cache.
-        """
-        resultado = super().deletar_objeto(id_valor)
-        self._cache_clientes_objetos = None
-        return resultado
+        Resolve vários números de conta de uma só vez.
 
-    def buscar_cliente_por_numero_conta(self, numero_conta: int) -> Optional[Cliente]:
-        """
-        Retorna o cliente associado à conta informada.
-        """
-        for cliente in self.listar_todos_objetos():
-            if any(str(c.get_numero_conta()) == str(numero_conta) for c in cliente.contas):
-                return cliente
-        return None
\ No newline at end of file
+        Returns:
+            dict: Número da conta (str) -> Cliente dono da conta, ou None se não houver.
+        """
+        with self._trava_mapa:
+            if not self._mapa_completo:
+                self.listar_todos_objetos()  # Carrega uma vez para completar o índice reverso
+            resultado = {}
+            for numero in numeros_conta:
+                documento = self._cliente_por_conta.get(str(numero))
+                resultado[str(numero)] = self._mapa_identidade.get(documento) if documento else None
+            return resultado
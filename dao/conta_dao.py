@@ -1,27 +1,79 @@
+import os
+from typing import Callable, ContextManager, List, Optional
 from model.conta import Conta
+from model.transacao import Transacao
 from mapper.conta_mapper import ContaMapper
 from dao.dao import DAO
-from utils.constantes import ARQUIVO_CONTAS
+from dao.livro_razao import obter_livro_razao
+from dao.sequencia import SequenciaNumeros
+from utils.gerenciador_travas import GerenciadorTravas
+from utils.constantes import (
+    ARQUIVO_CONTAS,
+    ARQUIVO_SEQUENCIA_CONTAS,
+    DIRETORIO_DATABASE,
+    NUMERO_CONTA_INICIAL,
+    SEQUENCIA_BLOCO_CONTAS
+)
 
 
 class ContaDAO(DAO):
     """
     DAO responsável pela persistência de objetos do tipo Conta,
     como ContaCorrente e ContaPoupanca, no arquivo JSON de contas.
+
+    O histórico de cada conta não fica no arquivo de contas: as transações novas são
+    acrescentadas ao LivroRazao ao salvar/atualizar a conta, e o histórico só é lido
+    quando consultado.
+
+    Quem altera contas (saldo e transações pendentes) deve fazê-lo, até a gravação,
+    com as contas travadas por `travar_contas`.
     """
 
     def __init__(self):
         """
-        Inicializa o DAO com cache local e caminho do arquivo JSON.
+        Inicializa o DAO com o caminho do arquivo JSON de contas e o livro-razão do histórico.
         """
         super().__init__(ARQUIVO_CONTAS)
-        self._cache_contas = None
+        self._livro_razao = obter_livro_razao()
+        self._travas = GerenciadorTravas()
+        self._sequencia = SequenciaNumeros(
+            os.path.join(DIRETORIO_DATABASE, ARQUIVO_SEQUENCIA_CONTAS),
+            self._primeiro_numero_livre,
+            SEQUENCIA_BLOCO_CONTAS
+        )
+
+    def travar_contas(self, *numeros) -> ContextManager[None]:
+        """
+        Trava as contas informadas (em ordem fixa, sem risco de impasse) durante o bloco `with`.
+        Operações sobre contas diferentes não esperam umas pelas outras.
+        """
+        return self._travas.travar(*numeros)
+
+    def travar_todas_as_contas(self) -> ContextManager[None]:
+        """
+        Dá à thread atual acesso exclusivo a todas as contas durante o bloco `with`: espera as
+        operações com contas travadas em andamento e segura as novas até o fim do bloco.
+        """
+        return self._travas.travar_tudo()
+
+    def proximo_numero(self) -> str:
+        """
+        Retorna um número de conta novo, único mesmo entre processos, sem percorrer as contas.
+        """
+        return str(self._sequencia.proximo())
+
+    def _primeiro_numero_livre(self) -> int:
+        """
+        Inicia a sequência de uma base que ainda não tem uma: o maior número gravado mais um.
+        """
+        numeros = [int(r["numero"]) for r in self._ler_dados_do_json() if str(r.get("numero", "")).isdigit()]
+        return max(numeros, default=NUMERO_CONTA_INICIAL - 1) + 1
 
     def criar_objeto(self, dados: dict) -> Conta:
         """
         Constrói uma instância de Conta a partir de um dicionário.
         """
-        return ContaMapper.from_dict(dados)
+        return ContaMapper.from_dict(dados, carregador_historico=self._livro_razao.ler)
 
     def extrair_dados_do_objeto(self, conta: Conta) -> dict:
         """
@@ -35,45 +87,109 @@ class ContaDAO(DAO):
         """
         return "numero"
 
-    def listar_todos_objetos(self) -> list[Conta]:
-        """
-        Retorna todas as contas armazenadas, com suporte a cache local.
-        """
-        if self._cache_contas is not None:
-            return self._cache_contas
+    # === Histórico ===
 
-        dados = self._ler_dados_do_json()
-        self._cache_contas = [self.criar_objeto(d) for d in dados]
-        return self._cache_contas
+    def ler_extrato(
+        self,
+        numero: str,
+        limite: int,
+        cursor: Optional[int] = None,
+        filtro: Callable[[Transacao], bool] = None,
+        parar: Callable[[Transacao], bool] = None
+    ) -> tuple[list[Transacao], Optional[int]]:
+        """
+        Lê uma página do histórico gravado da conta, da transação mais recente para a mais antiga.
+
+        Args:
+            numero (str): Número da conta.
+            limite (int): Quantidade máxima de transações na página.
+            cursor (int, opcional): Cursor devolvido pela página anterior. Padrão: início (mais recentes).
+            filtro (Callable, opcional): Só inclui as transações para as quais retorna True.
+            parar (Callable, opcional): Encerra a leitura (sem mais páginas) na primeira transação
+                para a qual retorna True. Usado para limites de data, já que o histórico é cronológico.
+
+        Returns:
+            tuple: (transações da página, cursor da próxima página ou None se não houver mais).
+        """
+        pagina = []
+        ultima_posicao = self._livro_razao.tamanho(str(numero)) if cursor is None else cursor
+        for posicao, transacao in self._livro_razao.ler_do_fim(str(numero), cursor):
+            if parar and parar(transacao):
+                return pagina, None
+            if filtro and not filtro(transacao):
+                continue
+            if len(pagina) >= limite:
+                # Há ao menos mais uma transação: a próxima página começa antes da última incluída
+                return pagina, ultima_posicao
+            pagina.append(transacao)
+            ultima_posicao = posicao
+        return pagina, None
 
-    def buscar_por_id(self, id_valor: str) -> Conta | None:
+    def saldo_em(self, numero: str, momento: float) -> Optional[float]:
         """
-        Retorna a conta correspondente ao número informado.
+        Retorna o saldo gravado da conta no instante informado (segundos desde a época Unix),
+        usando os pontos de controle do livro-razão. None se a conta não tiver histórico.
         """
-        return next(
-            (c for c in self.listar_todos_objetos() if str(c.get_numero_conta()) == str(id_valor)),
-            None
-        )
+        saldo = self._livro_razao.saldo_em(str(numero), momento)
+        return None if saldo is None else saldo / 100
+
+    # As escritas de contas gravam o registro e o histórico numa UnidadeDeTrabalho, para que
+    # uma queda entre as duas escritas nunca deixe saldo e histórico divergentes.
+    # (importação local: a unidade de trabalho depende deste módulo)
 
     def salvar_objeto(self, conta: Conta) -> None:
-        """
-        Salva uma nova conta e limpa o cache.
-        """
-        super().salvar_objeto(conta)
-        self._cache_contas = None
+        from dao.unidade_de_trabalho import UnidadeDeTrabalho
+        with UnidadeDeTrabalho() as unidade:
+            unidade.salvar(self, conta)
 
     def atualizar_objeto(self, conta: Conta) -> bool:
-        """
-        Atualiza uma conta existente e limpa o cache.
-        """
-        atualizado = super().atualizar_objeto(conta)
-        self._cache_contas = None
-        return atualizado
+        from dao.unidade_de_trabalho import UnidadeDeTrabalho
+        if self.buscar_por_id(conta.get_numero_conta()) is None:
+            return False
+        with UnidadeDeTrabalho() as unidade:
+            unidade.atualizar(self, conta)
+        return True
+
+    def atualizar_objetos(self, contas: List[Conta]) -> List[Conta]:
+        """
+        Atualiza várias contas, com as transações ainda não gravadas de cada uma, numa única
+        UnidadeDeTrabalho. Contas não encontradas são ignoradas.
+        """
+        from dao.unidade_de_trabalho import UnidadeDeTrabalho
+        atualizadas = [c for c in contas if self.buscar_por_id(c.get_numero_conta()) is not None]
+        if atualizadas:
+            with UnidadeDeTrabalho() as unidade:
+                for conta in atualizadas:
+                    unidade.atualizar(self, conta)
+        return atualizadas
+
+    def deletar_objeto(self, id_valor) -> bool:
+        from dao.unidade_de_trabalho import UnidadeDeTrabalho
+        if self.buscar_por_id(id_valor) is None:
+            return False
+        with UnidadeDeTrabalho() as unidade:
+            unidade.remover(self, id_valor)
+        return True
 
-    def deletar_objeto(self, id_valor: str) -> bool:
+    def migrar_historicos(self) -> int:
         """
-        Remove uma conta com base no número e limpa o cache.
+        Move para o livro-razão os históricos ainda embutidos no arquivo de contas
+        (formato antigo), convertendo textos legados em Transacao.
+
+        Returns:
+            int: Quantidade de contas migradas.
         """
-        deletado = super().deletar_objeto(id_valor)
-        self._cache_contas = None
-        return deletado
\ No newline at end of file
+        dados = self._ler_dados_do_json()
+        migrados = 0
+        for i, registro in enumerate(dados):
+            if "historico" not in registro:
+                continue
+            conta = ContaMapper.from_dict(registro)
+            self._livro_razao.substituir(str(conta.get_numero_conta()), conta._transacoes_pendentes())
+            dados[i] = self.extrair_dados_do_objeto(conta)
+            migrados += 1
+
+        if migrados:
+            self._salvar_no_arquivo_json(dados)
+            self.invalidar_cache()
+        return migrados
@@ -1,23 +1,38 @@
 from abc import ABC, abstractmethod
-import json
 import os
-from typing import List, Optional, TypeVar, Generic
+import threading
+from typing import Dict, List, Optional, TypeVar, Generic
+from dao.armazenamento import obter_armazenamento
+from utils.gerenciador_travas import GerenciadorTravas
+from utils.constantes import DIRETORIO_DATABASE
 
 T = TypeVar("T")  # Tipo genérico para entidades manipuladas pelo DAO
 
 
 class DAO(ABC, Generic[T]):
     """
-    Classe abstrata genérica para DAOs com persistência em arquivos JSON.
+    Classe abstrata genérica para DAOs com persistência em arquivos JSON ou SQLite.
     Define a estrutura comum para salvar, buscar, atualizar e deletar entidades.
     """
 
     def __init__(self, arquivo_json: str):
         """
         Inicializa o DAO com o caminho do arquivo JSON de armazenamento.
+
+        O meio de armazenamento efetivo (arquivo JSON ou tabela SQLite) é escolhido
+        pela constante BACKEND_ARMAZENAMENTO.
         """
-        self.arquivo_json = os.path.join("database", arquivo_json)
-        self._cache_local = None  # Cache opcional de leitura
+        self.arquivo_json = os.path.join(DIRETORIO_DATABASE, arquivo_json)
+        self._armazenamento = obter_armazenamento(arquivo_json, self.tipo_de_id())
+
+        # Mapa de identidade: um único objeto vivo por ID enquanto este DAO existir
+        self._mapa_identidade: Dict[str, T] = {}
+        self._mapa_completo = False
+        self._trava_mapa = threading.RLock()
+
+        # Travas por registro (ID e valores únicos) durante a gravação: escritas em registros
+        # diferentes, inclusive as de UnidadeDeTrabalho, não esperam umas pelas outras
+        self._travas_registros = GerenciadorTravas()
 
     @abstractmethod
     def criar_objeto(self, data: dict) -> T:
@@ -42,80 +57,224 @@ class DAO(ABC, Generic[T]):
 
     def _ler_dados_do_json(self) -> List[dict]:
         """
-        Lê o conteúdo do JSON, retornando uma lista de dicionários.
+        Lê todos os registros armazenados, retornando uma lista de dicionários.
         Retorna lista vazia se o arquivo não existir ou estiver corrompido.
         """
-        try:
-            with open(self.arquivo_json, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return self._armazenamento.ler_todos()
 
     def _salvar_no_arquivo_json(self, dados: List[dict]) -> None:
         """
-        Salva uma lista de dicionários no arquivo JSON.
+        Substitui todos os registros armazenados pela lista de dicionários.
         """
-        with open(self.arquivo_json, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, indent=4)
+        self._armazenamento.salvar_todos(dados)
 
-    def listar_todos_objetos(self) -> List[T]:
+    def _criar_objetos(self, dados: List[dict]) -> List[T]:
         """
-        Retorna todas as entidades salvas no JSON.
+        Converte vários registros de uma vez.
+        Subclasses podem sobrescrever para preparar dependências uma única vez por carga.
         """
-        dados = self._ler_dados_do_json()
         return [self.criar_objeto(item) for item in dados]
 
+    def _normalizar_id(self, id_valor) -> str:
+        """
+        Retorna a forma canônica de um identificador: a chave do mapa de identidade e a forma
+        gravada no armazenamento. Subclasses podem sobrescrever para que variações de
+        formatação do mesmo identificador encontrem o mesmo objeto.
+        """
+        return str(id_valor)
+
+    def _id_do_registro(self, dados: dict) -> str:
+        """
+        Retorna a chave do mapa de identidade para um registro.
+        """
+        return self._normalizar_id(dados[self.tipo_de_id()])
+
+    def _indexar(self, id_objeto: str, obj: T) -> None:
+        """
+        Chamado sempre que um objeto entra no mapa de identidade.
+        Subclasses podem sobrescrever para manter índices secundários.
+        """
+        pass
+
+    def _desindexar(self, id_objeto: str, obj: T) -> None:
+        """
+        Chamado sempre que um objeto sai do mapa de identidade (ou é substituído).
+        """
+        pass
+
+    def _chaves_unicas(self, obj: T) -> List[str]:
+        """
+        Retorna os valores únicos do objeto além do ID (ex.: "email:<e-mail>"), travados durante
+        a gravação para que duas gravações simultâneas não usem o mesmo valor.
+        """
+        return []
+
+    def _travar_registros(self, *objs: T):
+        """
+        Trava, durante o bloco `with`, os IDs e os valores únicos dos objetos.
+        """
+        chaves = []
+        for obj in objs:
+            chaves.append(self._id_do_registro(self.extrair_dados_do_objeto(obj)))
+            chaves.extend(self._chaves_unicas(obj))
+        return self._travas_registros.travar(*chaves)
+
+    def _validar_unicidade(self, id_objeto: str, obj: T) -> None:
+        """
+        Chamado, com o mapa travado, antes de gravar um objeto novo ou alterado.
+        Subclasses podem sobrescrever para recusar valores únicos já usados por outro objeto.
+
+        Raises:
+            ValueError: Se o objeto violar uma restrição de unicidade.
+        """
+        pass
+
+    def _registrar_no_mapa(self, id_objeto: str, obj: T) -> None:
+        anterior = self._mapa_identidade.get(id_objeto)
+        if anterior is not None:
+            self._desindexar(id_objeto, anterior)
+        self._mapa_identidade[id_objeto] = obj
+        self._indexar(id_objeto, obj)
+
+    def _remover_do_mapa(self, id_objeto: str) -> None:
+        anterior = self._mapa_identidade.pop(id_objeto, None)
+        if anterior is not None:
+            self._desindexar(id_objeto, anterior)
+
+    def invalidar_cache(self) -> None:
+        """
+        Descarta os objetos carregados, forçando nova leitura do armazenamento.
+        """
+        with self._trava_mapa:
+            for id_objeto in list(self._mapa_identidade):
+                self._remover_do_mapa(id_objeto)
+            self._mapa_completo = False
+
+    def listar_todos_objetos(self) -> List[T]:
+        """
+        Retorna todas as entidades salvas.
+
+        Após a primeira chamada, os objetos são servidos pelo mapa de identidade,
+        sem nova leitura do armazenamento. Objetos já carregados individualmente são reaproveitados.
+        """
+        with self._trava_mapa:
+            if not self._mapa_completo:
+                dados = self._ler_dados_do_json()
+                ids_armazenados = {self._id_do_registro(item) for item in dados}
+                novos = [item for item in dados if self._id_do_registro(item) not in self._mapa_identidade]
+                for item, obj in zip(novos, self._criar_objetos(novos)):
+                    self._registrar_no_mapa(self._id_do_registro(item), obj)
+                for id_item in set(self._mapa_identidade) - ids_armazenados:
+                    self._remover_do_mapa(id_item)
+                self._mapa_completo = True
+            return list(self._mapa_identidade.values())
+
     def buscar_por_id(self, id_valor) -> Optional[T]:
         """
         Retorna a entidade correspondente ao identificador fornecido.
+
+        Chamadas repetidas com o mesmo ID (em qualquer formatação aceita por `_normalizar_id`)
+        retornam sempre o mesmo objeto.
         """
-        for item in self._ler_dados_do_json():
-            if str(item.get(self.tipo_de_id())) == str(id_valor):
-                return self.criar_objeto(item)
-        return None
+        chave = self._normalizar_id(id_valor)
+        with self._trava_mapa:
+            if chave in self._mapa_identidade:
+                return self._mapa_identidade[chave]
+            if self._mapa_completo:
+                return None
+            if not self._armazenamento.busca_indexada:
+                # Sem índice, buscar um registro custa o mesmo que ler todos: carrega tudo de uma vez
+                self.listar_todos_objetos()
+                return self._mapa_identidade.get(chave)
+
+            item = self._armazenamento.buscar(chave)
+            if item is None:
+                return None
+            obj = self.criar_objeto(item)
+            self._registrar_no_mapa(self._id_do_registro(item), obj)
+            return obj
 
     def salvar_objeto(self, obj: T) -> None:
         """
-        Salva um novo objeto no JSON, desde que não haja duplicação de ID.
-        """
-        dados = self._ler_dados_do_json()
-        novo = self.extrair_dados_do_objeto(obj)
-        chave = self.tipo_de_id()
-
-        if any(item.get(chave) == novo[chave] for item in dados):
-            raise ValueError(f"Objeto com {chave} = '{novo[chave]}' já existe.")
+        Salva um novo objeto, desde que não haja duplicação de ID.
 
-        dados.append(novo)
-        self._salvar_no_arquivo_json(dados)
+        Raises:
+            ValueError: Se já existir um objeto com o mesmo ID (ou com um valor único já usado).
+        """
+        dados = self.extrair_dados_do_objeto(obj)
+        with self._travar_registros(obj), self._trava_mapa:
+            self._validar_unicidade(self._id_do_registro(dados), obj)
+            self._armazenamento.inserir(dados)
+            self._registrar_no_mapa(self._id_do_registro(dados), obj)
 
     def atualizar_objeto(self, obj: T) -> bool:
         """
         Atualiza um objeto existente com base em seu identificador.
         Retorna True se atualizado com sucesso, False se não encontrado.
         """
-        dados = self._ler_dados_do_json()
-        id_chave = self.tipo_de_id()
-        novo_dado = self.extrair_dados_do_objeto(obj)
-        id_valor = novo_dado[id_chave]
+        dados = self.extrair_dados_do_objeto(obj)
+        with self._travar_registros(obj), self._trava_mapa:
+            self._validar_unicidade(self._id_do_registro(dados), obj)
+            atualizado = self._armazenamento.atualizar(dados)
+            if atualizado:
+                self._registrar_no_mapa(self._id_do_registro(dados), obj)
+            return atualizado
 
-        for i, item in enumerate(dados):
-            if item.get(id_chave) == id_valor:
-                dados[i] = novo_dado
-                self._salvar_no_arquivo_json(dados)
-                return True
+    def atualizar_objetos(self, objs: List[T]) -> List[T]:
+        """
+        Atualiza vários objetos existentes com uma única escrita no armazenamento
+        (processamentos em lote). Objetos não encontrados são ignorados.
 
-        return False
+        Returns:
+            list: Objetos efetivamente atualizados.
+        """
+        por_id = {}
+        for obj in objs:
+            por_id[self._id_do_registro(self.extrair_dados_do_objeto(obj))] = obj
+        with self._travas_registros.travar(*por_id), self._trava_mapa:
+            ids_atualizados = self._armazenamento.atualizar_varios(
+                [self.extrair_dados_do_objeto(obj) for obj in por_id.values()]
+            )
+            for id_objeto in ids_atualizados:
+                self._registrar_no_mapa(id_objeto, por_id[id_objeto])
+            return [por_id[id_objeto] for id_objeto in ids_atualizados]
 
-    def deletar_objeto(self, id_valor) -> bool:
+    def migrar_ids(self) -> int:
         """
-        Remove um objeto com o ID fornecido.
-        Retorna True se a exclusão for bem-sucedida, False se não encontrado.
+        Regrava na forma canônica (`_normalizar_id`) os identificadores armazenados em outra
+        forma (dados anteriores à normalização).
+
+        Returns:
+            int: Quantidade de registros alterados.
+
+        Raises:
+            ValueError: Se dois registros tiverem o mesmo identificador canônico; nada é alterado.
         """
+        chave = self.tipo_de_id()
         dados = self._ler_dados_do_json()
-        novo_dados = [item for item in dados if item.get(self.tipo_de_id()) != id_valor]
+        vistos = set()
+        alterados = 0
+        for registro in dados:
+            canonico = self._normalizar_id(registro[chave])
+            if canonico in vistos:
+                raise ValueError(f"Objetos distintos com {chave} = '{canonico}' após a normalização.")
+            vistos.add(canonico)
+            if registro[chave] != canonico:
+                registro[chave] = canonico
+                alterados += 1
 
-        if len(novo_dados) == len(dados):
-            return False
+        if alterados:
+            self._salvar_no_arquivo_json(dados)
+            self.invalidar_cache()
+        return alterados
 
-        self._salvar_no_arquivo_json(novo_dados)
-        return True
+    def deletar_objeto(self, id_valor) -> bool:
+        """
+        Remove um objeto com o ID fornecido.
+        Retorna True se a exclusão for bem-sucedida, False se não encontrado.
+        """
+        chave = self._normalizar_id(id_valor)
+        with self._travas_registros.travar(chave), self._trava_mapa:
+            deletado = self._armazenamento.remover(chave)
+            self._remover_do_mapa(chave)
+            return deletado
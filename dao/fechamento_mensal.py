@@ -0,0 +1,297 @@
+import json
+import math
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, ContextManager, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Dependência opcional: necessária apenas para o fechamento em lote
+    np = None
+
+from dao.armazenamento import _gravar_json_atomico
+from dao.conta_dao import ContaDAO
+from model.transacao import Transacao, para_centavos
+from utils.logger import logger
+from utils.constantes import (
+    DIRETORIO_DATABASE,
+    DIRETORIO_FECHAMENTOS,
+    FECHAMENTO_CONTAS_POR_PARTICAO,
+    TIPO_CCORRENTE,
+    TIPO_CPOUPANCA,
+    TAXA_MANUTENCAO_CCORRENTE,
+    RENDIMENTO_MENSAL_CPOUPANCA,
+    TRANSACAO_TAXA,
+    TRANSACAO_RENDIMENTO
+)
+
+
+def _periodo_de(momento: int) -> str:
+    return datetime.fromtimestamp(momento).strftime("%Y-%m")
+
+
+def _fechar_particao(registros: List[dict], periodo: str, momento: int) -> List[dict]:
+    """
+    Calcula o fechamento de uma partição sobre os saldos lidos no início da execução.
+
+    Returns:
+        list[dict]: Por conta atualizada, {"numero", "valor" (taxa ou rendimento exato, em reais),
+                    "transacao" (forma compacta)}; por conta recusada, {"numero", "recusada": True}.
+    """
+    pendentes = [r for r in registros if r.get("ultimo_fechamento") != periodo]
+    if not pendentes:
+        return []
+
+    saldos = np.array([float(r["saldo"]) for r in pendentes], dtype=np.float64)
+    tipos = np.array([r["tipo"] for r in pendentes], dtype=object)
+    ativas = np.array([r["ativa"] is True for r in pendentes], dtype=bool)
+    corrente = tipos == TIPO_CCORRENTE
+    novos, valores, aplicar, recusadas = FechamentoMensal.calcular(saldos, corrente, tipos == TIPO_CPOUPANCA, ativas)
+
+    # Em centavos como em `Conta._registrar_operacao` (np.rint arredonda metades para o par, como round())
+    centavos = np.rint(valores * 100).astype(np.int64)
+    saldos_apos = np.rint(novos * 100).astype(np.int64)
+
+    resultado = []
+    for i in np.flatnonzero(aplicar | recusadas).tolist():
+        numero = str(pendentes[i]["numero"])
+        if recusadas[i]:
+            resultado.append({"numero": numero, "recusada": True})
+            continue
+        tipo = TRANSACAO_TAXA if corrente[i] else TRANSACAO_RENDIMENTO
+        transacao = Transacao(momento, tipo, int(centavos[i]), None, int(saldos_apos[i]))
+        resultado.append({"numero": numero, "valor": float(valores[i]), "transacao": transacao.to_lista()})
+    return resultado
+
+
+def _processar_particao(tarefa: tuple) -> int:
+    """
+    Executa uma partição do fechamento (em um processo de trabalho ou no próprio processo)
+    e grava seu resultado em disco, marcando-a como concluída.
+    """
+    caminho_resultado, registros, periodo, momento = tarefa
+    resultado = _fechar_particao(registros, periodo, momento)
+    _gravar_json_atomico(caminho_resultado, resultado)
+    return len(resultado)
+
+
+class FechamentoMensal:
+    """
+    Aplica a atualização mensal (taxa de manutenção das contas correntes e rendimento das
+    poupanças) a todas as contas de uma vez.
+
+    Os registros são lidos diretamente do armazenamento, sem criar objetos Conta, e divididos
+    em partições pelo número da conta. Cada partição roda em um processo de trabalho: os saldos
+    vão para um vetor NumPy (float64), e a taxa e o rendimento são
+    aplicados com operações vetoriais, com máscaras para o tipo de conta e para as contas
+    inativas. Os resultados são idênticos aos de `atualizacao_mensal` conta a conta.
+
+    O progresso fica em `database/fechamentos/<AAAA-MM>/`: um manifesto com a data/hora das
+    transações e a quantidade de partições, e um arquivo por partição concluída. Uma execução
+    interrompida é retomada na próxima chamada a partir das partições que faltam. Ao final, as
+    transações são acrescentadas ao LivroRazao de cada conta e os saldos são gravados em uma
+    única regravação do arquivo de contas, junto com a marca "ultimo_fechamento" de cada conta,
+    que impede cobrar a taxa ou pagar o rendimento duas vezes no mesmo período.
+
+    Só a leitura inicial e a consolidação detêm acesso exclusivo a todas as contas
+    (`ContaDAO.travar_todas_as_contas`); enquanto as partições calculam, transferências e outras
+    operações seguem normalmente. A taxa e o rendimento são calculados sobre os saldos da leitura
+    inicial e somados aos saldos vigentes na consolidação. Alterações só em memória (gravação
+    adiada) devem ser gravadas antes de cada fase; veja `GravadorContas.pausar`.
+    """
+
+    def __init__(self, conta_dao: ContaDAO, diretorio: str = None):
+        """
+        Args:
+            conta_dao (ContaDAO): DAO das contas a atualizar.
+            diretorio (str, opcional): Pasta do progresso das execuções. Padrão: database/fechamentos.
+        """
+        if np is None:
+            raise RuntimeError("O fechamento mensal em lote requer a biblioteca NumPy.")
+        self.conta_dao = conta_dao
+        self.diretorio = diretorio or os.path.join(DIRETORIO_DATABASE, DIRETORIO_FECHAMENTOS)
+
+    @staticmethod
+    def calcular(saldos: 'np.ndarray', corrente: 'np.ndarray', poupanca: 'np.ndarray', ativas: 'np.ndarray'):
+        """
+        Calcula a atualização mensal de um vetor de contas.
+
+        Args:
+            saldos (np.ndarray): Saldos em reais (float64).
+            corrente, poupanca, ativas (np.ndarray): Máscaras booleanas por conta.
+
+        Returns:
+            tuple: (novos saldos em reais, valores da taxa/rendimento em reais,
+                    máscara das contas atualizadas, máscara das contas recusadas).
+                    Recusadas são as poupanças cujo saldo ficaria negativo, caso em que
+                    `ContaPoupanca.atualizacao_mensal` lança ValueError.
+        """
+        # Mesmas operações em ponto flutuante de `atualizacao_mensal`, portanto os mesmos resultados
+        rendimentos = saldos * RENDIMENTO_MENSAL_CPOUPANCA
+        valores = np.where(corrente, TAXA_MANUTENCAO_CCORRENTE, np.where(poupanca, rendimentos, 0.0))
+        novos = saldos + np.where(corrente, -valores, valores)
+
+        aplicar = ativas & (corrente | poupanca)
+        recusadas = aplicar & poupanca & (novos < 0)
+        aplicar &= ~recusadas
+        return np.where(aplicar, novos, saldos), np.where(aplicar, valores, 0.0), aplicar, recusadas
+
+    def _execucao_pendente(self) -> Optional[str]:
+        """
+        Retorna o período de uma execução interrompida, ou None.
+        """
+        if not os.path.isdir(self.diretorio):
+            return None
+        for periodo in sorted(os.listdir(self.diretorio)):
+            if os.path.exists(os.path.join(self.diretorio, periodo, "manifesto.json")):
+                return periodo
+        return None
+
+    def executar(
+        self,
+        periodo: str = None,
+        momento: int = None,
+        processos: int = None,
+        particoes: int = None,
+        exclusivo: Callable[[], ContextManager] = None
+    ) -> dict:
+        """
+        Executa (ou retoma) o fechamento mensal de todas as contas.
+
+        Args:
+            periodo (str, opcional): Período "AAAA-MM". Padrão: o de uma execução interrompida,
+                se houver; senão, o do momento.
+            momento (int, opcional): Data/hora das transações geradas (segundos desde a época Unix).
+                Padrão: agora. Ignorado ao retomar uma execução, que mantém o momento original.
+            processos (int, opcional): Processos de trabalho. Padrão: um por núcleo. Com 1, as
+                partições rodam no próprio processo.
+            particoes (int, opcional): Quantidade de partições. Padrão: uma a cada
+                FECHAMENTO_CONTAS_POR_PARTICAO contas. Ignorado ao retomar.
+            exclusivo (Callable, opcional): Fornece o acesso exclusivo às contas na leitura inicial
+                e na consolidação. Padrão: `ContaDAO.travar_todas_as_contas`.
+
+        Returns:
+            dict: Resumo com "periodo", "atualizadas", "ja_fechadas", "inativas", "recusadas"
+                  (números das contas), "total_taxas" e "total_rendimentos" (em reais),
+                  "particoes" e "retomadas" (partições já concluídas antes desta chamada).
+        """
+        dao = self.conta_dao
+        exclusivo = exclusivo or dao.travar_todas_as_contas
+
+        with exclusivo(), dao._trava_mapa:
+            dados = dao._ler_dados_do_json()
+
+            periodo = periodo or self._execucao_pendente() or _periodo_de(int(time.time()) if momento is None else momento)
+            pasta = os.path.join(self.diretorio, periodo)
+            caminho_manifesto = os.path.join(pasta, "manifesto.json")
+            retomando = os.path.exists(caminho_manifesto)
+            if retomando:
+                with open(caminho_manifesto, encoding="utf-8") as f:
+                    manifesto = json.load(f)
+            else:
+                manifesto = {
+                    "periodo": periodo,
+                    "momento": int(time.time()) if momento is None else int(momento),
+                    "particoes": particoes or max(1, math.ceil(len(dados) / FECHAMENTO_CONTAS_POR_PARTICAO))
+                }
+                os.makedirs(pasta, exist_ok=True)
+                _gravar_json_atomico(caminho_manifesto, manifesto)
+            momento, particoes = manifesto["momento"], manifesto["particoes"]
+
+        # As partições calculam sobre essa leitura sem travar as contas: as operações feitas
+        # enquanto isso são levadas em conta na consolidação
+        grupos = [[] for _ in range(particoes)]
+        for registro in dados:
+            grupos[int(registro["numero"]) % particoes].append(registro)
+
+        tarefas = []
+        for k, grupo in enumerate(grupos):
+            caminho_resultado = os.path.join(pasta, f"particao_{k}.json")
+            if not os.path.exists(caminho_resultado):
+                tarefas.append((caminho_resultado, grupo, periodo, momento))
+
+        processos = processos or os.cpu_count() or 1
+        if processos == 1 or len(tarefas) <= 1:
+            for tarefa in tarefas:
+                _processar_particao(tarefa)
+        else:
+            with ProcessPoolExecutor(max_workers=min(processos, len(tarefas))) as executor:
+                list(executor.map(_processar_particao, tarefas))
+
+        with exclusivo(), dao._trava_mapa:
+            resumo = self._consolidar(pasta, periodo, particoes, retomando)
+        resumo["retomadas"] = particoes - len(tarefas)
+
+        shutil.rmtree(pasta, ignore_errors=True)
+        logger.info(
+            f"Fechamento mensal {periodo}: {resumo['atualizadas']} contas atualizadas, "
+            f"{resumo['ja_fechadas']} já fechadas, {resumo['inativas']} inativas, "
+            f"{len(resumo['recusadas'])} recusadas, {resumo['retomadas']} de {particoes} partições retomadas."
+        )
+        return resumo
+
+    def _consolidar(self, pasta: str, periodo: str, particoes: int, retomando: bool) -> dict:
+        """
+        Aplica aos registros atuais das contas o resultado de todas as partições: acrescenta as
+        transações ao histórico, com o saldo após calculado sobre o saldo atual, e grava o arquivo
+        de contas uma única vez. Contas já marcadas com o período não são alteradas de novo.
+
+        Args:
+            retomando (bool): Se True (execução retomada), não grava de novo uma transação que
+                já seja a última do histórico da conta.
+        """
+        dao = self.conta_dao
+        livro = dao._livro_razao
+        dados = dao._ler_dados_do_json()
+        resumo = {
+            "periodo": periodo,
+            "atualizadas": 0,
+            "ja_fechadas": sum(1 for r in dados if r.get("ultimo_fechamento") == periodo),
+            "inativas": sum(1 for r in dados if r["ativa"] is not True),
+            "recusadas": [],
+            "total_taxas": 0,
+            "total_rendimentos": 0,
+            "particoes": particoes
+        }
+        indices = {str(registro["numero"]): i for i, registro in enumerate(dados)}
+        aplicadas, lancamentos = [], {}
+        for k in range(particoes):
+            with open(os.path.join(pasta, f"particao_{k}.json"), encoding="utf-8") as f:
+                resultado = json.load(f)
+            for item in resultado:
+                i = indices.get(item["numero"])
+                if i is None or dados[i].get("ultimo_fechamento") == periodo:
+                    continue
+                if item.get("recusada"):
+                    resumo["recusadas"].append(item["numero"])
+                    continue
+                transacao = Transacao.from_lista(item["transacao"])
+                valor = -item["valor"] if transacao.tipo == TRANSACAO_TAXA else item["valor"]
+                saldo = float(dados[i]["saldo"]) + valor
+                transacao = transacao._replace(saldo_apos_centavos=para_centavos(saldo))
+                dados[i]["saldo"] = saldo
+                dados[i]["ultimo_fechamento"] = periodo
+                chave = "total_taxas" if transacao.tipo == TRANSACAO_TAXA else "total_rendimentos"
+                resumo[chave] += transacao.valor_centavos
+                aplicadas.append((item["numero"], transacao, saldo))
+                if not (retomando and next(livro.ler_do_fim(item["numero"]), (None, None))[1] == transacao):
+                    lancamentos[item["numero"]] = [transacao]
+
+        if aplicadas:
+            livro.anexar_em_lote(lancamentos)
+            dao._salvar_no_arquivo_json(dados)
+
+        # Objetos já carregados continuam válidos (e únicos por ID)
+        for numero, transacao, saldo in aplicadas:
+            conta = dao._mapa_identidade.get(numero)
+            if conta is not None:
+                conta._aplicar_transacao_gravada(transacao, saldo)
+                conta._marcar_fechamento(periodo)
+
+        resumo["atualizadas"] = len(aplicadas)
+        resumo["total_taxas"] /= 100
+        resumo["total_rendimentos"] /= 100
+        return resumo
@@ -0,0 +1,258 @@
+import atexit
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from dao.conta_dao import ContaDAO
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
+from model.conta import Conta
+from utils.logger import logger
+from utils.constantes import (
+    DURABILIDADE_SINCRONA,
+    DURABILIDADE_ASSINCRONA,
+    DURABILIDADE_CONTAS,
+    GRAVACAO_PARTICOES,
+    PERSISTENCIA_INTERVALO,
+    PERSISTENCIA_LIMITE_SUJAS
+)
+
+
+class _ParticaoSujas:
+    """
+    Uma partição do conjunto de contas sujas: sua trava e as contas alteradas ainda não gravadas.
+    """
+
+    def __init__(self):
+        self.trava = threading.Lock()
+        self.sujas: Dict[str, Conta] = {}
+
+
+class GravadorContas:
+    """
+    Gravação adiada das contas alteradas por transferências (conjunto de contas sujas).
+
+    Não guarda estado próprio das contas: as contas vivas continuam sendo as do mapa de
+    identidade do ContaDAO, e as transferências travam as contas envolvidas pelo
+    `ContaDAO.travar_contas`. O gravador só decide quando as contas alteradas vão ao disco.
+    O conjunto de contas sujas é dividido em `particoes` pelo hash do número, cada partição
+    com sua trava, para que marcar contas sujas não serialize as transferências.
+
+    Durabilidade:
+        - DURABILIDADE_SINCRONA: cada transferência é gravada antes de retornar, numa
+          UnidadeDeTrabalho que trava apenas as duas contas.
+        - DURABILIDADE_ASSINCRONA: a transferência só altera a memória e marca as contas como
+          sujas; uma thread de fundo grava as partições sujas a cada `intervalo` segundos,
+          ou antes, quando houver `limite_sujas` contas sujas. Numa queda, perdem-se no
+          máximo as transferências desse intervalo. `persistir` grava tudo na hora e
+          `fechar` (também chamado ao sair do processo) grava e encerra a thread.
+    """
+
+    def __init__(
+        self,
+        conta_dao: ContaDAO,
+        durabilidade: str = DURABILIDADE_CONTAS,
+        particoes: int = GRAVACAO_PARTICOES,
+        intervalo: float = PERSISTENCIA_INTERVALO,
+        limite_sujas: int = PERSISTENCIA_LIMITE_SUJAS
+    ):
+        """
+        Args:
+            conta_dao (ContaDAO): DAO (e backend configurado) onde as contas são gravadas.
+            durabilidade (str, opcional): DURABILIDADE_SINCRONA ou DURABILIDADE_ASSINCRONA.
+            particoes (int, opcional): Quantidade de partições do conjunto de contas sujas.
+            intervalo (float, opcional): Segundos entre gravações no modo assíncrono.
+            limite_sujas (int, opcional): Contas sujas que antecipam a gravação no modo assíncrono.
+
+        Raises:
+            ValueError: Se a durabilidade não for reconhecida.
+        """
+        if durabilidade not in (DURABILIDADE_SINCRONA, DURABILIDADE_ASSINCRONA):
+            raise ValueError(f"Durabilidade desconhecida: {durabilidade}.")
+        self.conta_dao = conta_dao
+        self.durabilidade = durabilidade
+        self.intervalo = intervalo
+        self.limite_sujas = limite_sujas
+
+        self._particoes = [_ParticaoSujas() for _ in range(max(1, particoes))]
+        self._quantidade_sujas = 0
+        self._trava_contagem = threading.Lock()
+        self._trava_gravacao = threading.Lock()   # Uma gravação das contas sujas por vez
+        self._acordar = threading.Event()
+        self._encerrar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._contadores = {"transferencias": 0, "gravacoes": 0, "contas_gravadas": 0, "falhas": 0}
+
+    # === Contas sujas ===
+
+    def _particao(self, numero) -> _ParticaoSujas:
+        indice = zlib.crc32(str(numero).encode()) % len(self._particoes)
+        return self._particoes[indice]
+
+    def _marcar_sujas(self, *contas: Conta) -> None:
+        novas = 0
+        for conta in contas:
+            numero = str(conta.get_numero_conta())
+            particao = self._particao(numero)
+            with particao.trava:
+                if numero not in particao.sujas:
+                    novas += 1
+                particao.sujas[numero] = conta
+        with self._trava_contagem:
+            self._quantidade_sujas += novas
+            if self._quantidade_sujas >= self.limite_sujas:
+                self._acordar.set()
+
+    # === Operações ===
+
+    def obter(self, numero) -> Optional[Conta]:
+        """
+        Retorna a conta viva (servida pelo mapa de identidade do DAO).
+        """
+        return self.conta_dao.buscar_por_id(numero)
+
+    def saldo(self, numero) -> Optional[float]:
+        """
+        Retorna o saldo atual da conta, incluindo alterações ainda não gravadas.
+        """
+        conta = self.obter(numero)
+        return None if conta is None else conta.get_saldo()
+
+    def transferir(self, origem: Conta, destino: Conta, valor: float) -> None:
+        """
+        Transfere entre duas contas com ambas travadas e registra a alteração conforme a
+        durabilidade: gravada antes de retornar (síncrona) ou marcada para a próxima
+        gravação em segundo plano (assíncrona).
+
+        Raises:
+            ContaInativaError, ValueError: As mesmas de `Conta.transferir`; nada é alterado.
+            OSError: Se a gravação síncrona falhar; as contas voltam ao estado anterior.
+        """
+        with self.conta_dao.travar_contas(origem.get_numero_conta(), destino.get_numero_conta()):
+            estados = origem._capturar_estado(), destino._capturar_estado()
+            origem.transferir(destino, valor)
+            if self.durabilidade == DURABILIDADE_SINCRONA:
+                try:
+                    self._gravar([origem, destino])
+                except Exception:
+                    origem._restaurar_estado(estados[0])
+                    destino._restaurar_estado(estados[1])
+                    raise
+            else:
+                self._marcar_sujas(origem, destino)
+        with self._trava_contagem:
+            self._contadores["transferencias"] += 1
+        if self.durabilidade == DURABILIDADE_ASSINCRONA:
+            self._iniciar_thread()
+
+    # === Gravação ===
+
+    def persistir(self) -> int:
+        """
+        Grava agora todas as contas sujas, uma partição por vez.
+
+        Returns:
+            int: Quantidade de contas gravadas.
+        """
+        with self._trava_gravacao:
+            return self._persistir_particoes()
+
+    def persistir_contas(self, *contas: Conta) -> None:
+        """
+        Grava agora as contas informadas, com suas transações ainda não gravadas no histórico
+        (ex.: antes de ler o extrato do histórico gravado).
+        """
+        with self.conta_dao.travar_contas(*(c.get_numero_conta() for c in contas)):
+            self._gravar(contas)
+
+    @contextmanager
+    def pausar(self) -> Iterator[None]:
+        """
+        Grava as contas sujas e suspende transferências e gravações durante o bloco `with`,
+        com acesso exclusivo a todas as contas (ex.: fechamento mensal, que parte do arquivo
+        de contas). A thread atual pode travar contas dentro do bloco.
+        """
+        with self._trava_gravacao, self.conta_dao.travar_todas_as_contas():
+            self._persistir_particoes()
+            yield
+
+    def _persistir_particoes(self) -> int:
+        gravadas = 0
+        for particao in self._particoes:
+            with particao.trava:
+                sujas, particao.sujas = particao.sujas, {}
+            if not sujas:
+                continue
+            with self._trava_contagem:
+                self._quantidade_sujas -= len(sujas)
+            try:
+                # As contas travadas garantem que nenhuma transferência as altere durante a gravação
+                with self.conta_dao.travar_contas(*sujas):
+                    self._gravar(sujas.values())
+            except Exception:
+                # Devolve as contas à partição: serão gravadas na próxima tentativa
+                self._marcar_sujas(*sujas.values())
+                with self._trava_contagem:
+                    self._contadores["falhas"] += 1
+                raise
+            gravadas += len(sujas)
+        if gravadas:
+            with self._trava_contagem:
+                self._contadores["gravacoes"] += 1
+                self._contadores["contas_gravadas"] += gravadas
+        return gravadas
+
+    def _gravar(self, contas) -> None:
+        """
+        Grava as contas (e seus históricos) numa única UnidadeDeTrabalho: uma queda no meio
+        nunca deixa o dinheiro debitado de uma conta sem ter sido creditado na outra.
+        """
+        with UnidadeDeTrabalho() as unidade:
+            for conta in contas:
+                unidade.atualizar(self.conta_dao, conta)
+
+    def _iniciar_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._trava_contagem:
+            if self._thread is None and not self._encerrar.is_set():
+                self._thread = threading.Thread(target=self._laco_thread, name="gravador-contas", daemon=True)
+                self._thread.start()
+                atexit.register(self.fechar)
+
+    def _laco_thread(self) -> None:
+        while not self._encerrar.is_set():
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+            try:
+                self.persistir()
+            except Exception as e:
+                logger.error(f"Falha ao gravar contas em segundo plano: {e}")
+
+    def fechar(self) -> None:
+        """
+        Grava as contas pendentes e encerra a thread de gravação (se houver).
+        """
+        self._encerrar.set()
+        self._acordar.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+            atexit.unregister(self.fechar)
+        self.persistir()
+
+    def pendentes(self) -> int:
+        """
+        Retorna quantas contas têm alterações ainda não gravadas.
+        """
+        with self._trava_contagem:
+            return self._quantidade_sujas
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os contadores de transferências, gravações e falhas de gravação.
+        """
+        with self._trava_contagem:
+            estatisticas = dict(self._contadores)
+            estatisticas["pendentes"] = self._quantidade_sujas
+        return estatisticas
@@ -0,0 +1,518 @@
+import json
+import os
+import struct
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from model.transacao import Transacao
+from utils.logger import logger
+from utils.constantes import (
+    DIRETORIO_DATABASE,
+    DIRETORIO_HISTORICO,
+    LIVRO_RAZAO_FSYNC,
+    BLOCO_LEITURA_HISTORICO,
+    CHECKPOINT_INTERVALO
+)
+
+
+# Ponto de controle: (timestamp, posição em bytes logo após a transação, nº de transações, saldo em centavos)
+_CHECKPOINT = struct.Struct("<qqqq")
+
+
+def _serializar(transacao: Transacao) -> bytes:
+    return (json.dumps(transacao.to_lista(), ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _mes(timestamp: int) -> tuple[int, int]:
+    data = datetime.fromtimestamp(timestamp)
+    return data.year, data.month
+
+
+class LivroRazao:
+    """
+    Histórico de transações das contas, fora do arquivo de contas.
+
+    Cada conta tem seu próprio arquivo de segmento, `<diretorio>/<numero>.jsonl`, apenas
+    de acréscimo: uma linha JSON por transação, na forma compacta de Transacao. Registrar
+    uma transação é um único append no final do arquivo, independentemente do tamanho do
+    histórico, e as operações de saldo nunca leem esses arquivos.
+
+    Ao lado de cada segmento fica `<numero>.chk`, com pontos de controle de saldo em registros
+    binários de tamanho fixo, gravados a cada CHECKPOINT_INTERVALO transações e na virada de
+    cada mês. `saldo_em` faz busca binária nesse arquivo e reaplica apenas as transações
+    posteriores ao ponto de controle encontrado.
+    """
+
+    _QUANTIDADE_TRAVAS = 64
+
+    def __init__(self, diretorio: str = None, fsync: bool = LIVRO_RAZAO_FSYNC):
+        """
+        Args:
+            diretorio (str, opcional): Pasta dos segmentos. Padrão: database/historico.
+            fsync (bool, opcional): Se True, força a gravação em disco a cada acréscimo.
+        """
+        self.diretorio = diretorio or os.path.join(DIRETORIO_DATABASE, DIRETORIO_HISTORICO)
+        self.fsync = fsync
+        # Travas por faixa de contas: acréscimos na mesma conta são serializados
+        self._travas = [threading.Lock() for _ in range(self._QUANTIDADE_TRAVAS)]
+        # Por conta: [transações gravadas, último timestamp, saldo em centavos, nº no último ponto de controle,
+        #             tamanho do segmento correspondente]
+        self._estado_checkpoint = {}
+
+    def _trava(self, numero: str) -> threading.Lock:
+        return self._travas[hash(str(numero)) % self._QUANTIDADE_TRAVAS]
+
+    def caminho(self, numero: str) -> str:
+        """
+        Retorna o caminho do segmento de histórico da conta.
+        """
+        return os.path.join(self.diretorio, f"{numero}.jsonl")
+
+    def caminho_checkpoints(self, numero: str) -> str:
+        """
+        Retorna o caminho do arquivo de pontos de controle de saldo da conta.
+        """
+        return os.path.join(self.diretorio, f"{numero}.chk")
+
+    @staticmethod
+    def _reparar_final(f) -> bool:
+        """
+        Descarta uma última linha incompleta (escrita interrompida), para que o próximo
+        acréscimo não seja colado a ela. O arquivo deve estar aberto em modo binário de leitura e escrita.
+
+        Returns:
+            bool: True se o arquivo foi truncado.
+        """
+        tamanho = f.seek(0, os.SEEK_END)
+        if tamanho == 0:
+            return False
+        f.seek(tamanho - 1)
+        if f.read(1) == b"\n":
+            return False
+
+        f.truncate(LivroRazao._inicio_da_ultima_linha(f, tamanho))
+        logger.warning(f"Linha incompleta descartada no final de {f.name}.")
+        return True
+
+    def anexar(self, numero: str, transacoes: List[Transacao]) -> None:
+        """
+        Acrescenta as transações ao final do histórico da conta.
+        """
+        self._anexar(numero, transacoes, self.fsync)
+
+    def anexar_em_lote(self, lancamentos: Dict[str, List[Transacao]]) -> None:
+        """
+        Acrescenta transações ao histórico de várias contas de uma vez (processamentos em lote).
+
+        Todas as escritas são feitas antes de qualquer sincronização com o disco; com fsync
+        ativo, cada arquivo é sincronizado uma única vez, ao final.
+        """
+        for numero, transacoes in lancamentos.items():
+            self._anexar(str(numero), transacoes, False)
+        if not self.fsync:
+            return
+        for numero, transacoes in lancamentos.items():
+            if not transacoes:
+                continue
+            for caminho in (self.caminho(numero), self.caminho_checkpoints(numero)):
+                try:
+                    descritor = os.open(caminho, os.O_RDONLY)
+                except FileNotFoundError:
+                    continue
+                try:
+                    os.fsync(descritor)
+                finally:
+                    os.close(descritor)
+
+    def _anexar(self, numero: str, transacoes: List[Transacao], sincronizar: bool) -> None:
+        if not transacoes:
+            return
+        linhas = [_serializar(t) for t in transacoes]
+
+        with self._trava(numero):
+            os.makedirs(self.diretorio, exist_ok=True)
+            caminho = self.caminho(numero)
+            modo = "r+b" if os.path.exists(caminho) else "w+b"
+            with open(caminho, modo) as f:
+                if self._reparar_final(f):
+                    self._descartar_checkpoints_apos(numero, f.seek(0, os.SEEK_END))
+                inicio = f.seek(0, os.SEEK_END)
+                estado = self._obter_estado_checkpoint(numero, inicio)
+                checkpoints = self._planejar_checkpoints(estado, transacoes, linhas, inicio)
+
+                try:
+                    f.write(b"".join(linhas))
+                    f.flush()
+                    if sincronizar:
+                        os.fsync(f.fileno())
+                except OSError:
+                    self._estado_checkpoint.pop(numero, None)
+                    raise
+
+            self._gravar_checkpoints(numero, checkpoints, sincronizar)
+
+    def ler(self, numero: str) -> List[Transacao]:
+        """
+        Retorna todo o histórico da conta, da transação mais antiga para a mais recente.
+        Uma última linha incompleta é ignorada.
+        """
+        try:
+            with open(self.caminho(numero), "r", encoding="utf-8") as f:
+                linhas = f.read().split("\n")
+        except FileNotFoundError:
+            return []
+
+        transacoes = []
+        for i, linha in enumerate(linhas):
+            if not linha:
+                continue
+            try:
+                transacoes.append(Transacao.from_lista(json.loads(linha)))
+            except (json.JSONDecodeError, ValueError):
+                if i < len(linhas) - 1:
+                    raise ValueError(f"Histórico da conta {numero} corrompido na linha {i + 1}.")
+                logger.warning(f"Linha incompleta ignorada no final do histórico da conta {numero}.")
+        return transacoes
+
+    def ler_do_fim(self, numero: str, antes_de: Optional[int] = None) -> Iterator[tuple[int, Transacao]]:
+        """
+        Percorre o histórico da conta de trás para frente, lendo o arquivo em blocos a partir do final.
+
+        O custo depende apenas de quantas transações são consumidas, não do tamanho do histórico.
+
+        Args:
+            antes_de (int, opcional): Posição (em bytes) onde parar; só são retornadas as transações
+                que começam antes dela. Padrão: final do arquivo.
+
+        Yields:
+            tuple[int, Transacao]: Posição em bytes do início da linha e a transação, da mais recente
+                para a mais antiga. A posição pode ser usada como `antes_de` para continuar a leitura.
+        """
+        try:
+            f = open(self.caminho(numero), "rb")
+        except FileNotFoundError:
+            return
+
+        with f:
+            tamanho = f.seek(0, os.SEEK_END)
+            posicao = tamanho if antes_de is None else min(antes_de, tamanho)
+
+            # Uma última linha sem quebra de linha é uma escrita interrompida: é ignorada
+            if posicao == tamanho and posicao > 0:
+                f.seek(posicao - 1)
+                if f.read(1) != b"\n":
+                    posicao = self._inicio_da_ultima_linha(f, posicao)
+
+            restante = b""
+            while posicao > 0:
+                inicio = max(0, posicao - BLOCO_LEITURA_HISTORICO)
+                f.seek(inicio)
+                linhas = (f.read(posicao - inicio) + restante).split(b"\n")
+                # A primeira linha do bloco pode ter começado em um bloco anterior
+                restante = linhas[0]
+                deslocamento = inicio + len(linhas[0]) + 1
+                inicios = []
+                for linha in linhas[1:]:
+                    inicios.append(deslocamento)
+                    deslocamento += len(linha) + 1
+                for linha, inicio_linha in zip(reversed(linhas[1:]), reversed(inicios)):
+                    if linha:
+                        yield inicio_linha, Transacao.from_lista(json.loads(linha))
+                posicao = inicio
+
+            if restante:
+                yield 0, Transacao.from_lista(json.loads(restante))
+
+    def tamanho(self, numero: str) -> int:
+        """
+        Retorna o tamanho, em bytes, do histórico gravado da conta (0 se não houver).
+        """
+        try:
+            return os.path.getsize(self.caminho(numero))
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _inicio_da_ultima_linha(f, posicao: int) -> int:
+        """
+        Retorna a posição logo após a última quebra de linha antes de `posicao` (ou 0).
+        """
+        while posicao > 0:
+            inicio = max(0, posicao - 4096)
+            f.seek(inicio)
+            quebra = f.read(posicao - inicio).rfind(b"\n")
+            if quebra != -1:
+                return inicio + quebra + 1
+            posicao = inicio
+        return 0
+
+    def substituir(self, numero: str, transacoes: List[Transacao]) -> None:
+        """
+        Regrava todo o histórico da conta (usado em migrações), de forma atômica.
+        """
+        linhas = [_serializar(t) for t in transacoes]
+        with self._trava(numero):
+            os.makedirs(self.diretorio, exist_ok=True)
+            caminho = self.caminho(numero)
+            temporario = caminho + ".tmp"
+            with open(temporario, "wb") as f:
+                f.write(b"".join(linhas))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, caminho)
+
+            self._apagar_checkpoints(numero)
+            estado = self._estado_checkpoint[numero] = [0, None, None, 0, 0]
+            self._gravar_checkpoints(numero, self._planejar_checkpoints(estado, transacoes, linhas, 0), self.fsync)
+
+    def faltantes(self, numero: str, tamanho: int, transacoes: List[Transacao]) -> List[Transacao]:
+        """
+        Retorna as transações de um acréscimo, feito a partir de `tamanho` bytes, que ainda não
+        estão no histórico da conta, para que um acréscimo interrompido possa ser refeito sem
+        duplicar transações.
+
+        Nada é descartado: linhas completas após `tamanho` que não pertencem ao acréscimo
+        (gravadas por outros caminhos depois dele) são mantidas, e uma última linha incompleta
+        é reparada pelo próprio `anexar`.
+        """
+        linhas = [_serializar(t) for t in transacoes]
+        with self._trava(numero):
+            try:
+                with open(self.caminho(numero), "rb") as f:
+                    if f.seek(0, os.SEEK_END) < tamanho:
+                        # Histórico reescrito depois do registro, já com as transações em memória
+                        logger.warning(f"Histórico da conta {numero} menor que o registrado; acréscimo ignorado.")
+                        return []
+                    f.seek(tamanho)
+                    gravadas, alheias = 0, 0
+                    for linha in f:
+                        if not linha.endswith(b"\n"):
+                            break
+                        if gravadas < len(linhas) and linha == linhas[gravadas]:
+                            gravadas += 1
+                        else:
+                            alheias += 1
+            except FileNotFoundError:
+                return list(transacoes)
+        if alheias:
+            logger.warning(f"Histórico da conta {numero}: {alheias} transação(ões) gravada(s) após o registro mantida(s).")
+        return list(transacoes[gravadas:])
+
+    def remover(self, numero: str) -> None:
+        """
+        Apaga o histórico da conta e seus pontos de controle.
+        """
+        with self._trava(numero):
+            try:
+                os.remove(self.caminho(numero))
+            except FileNotFoundError:
+                pass
+            self._apagar_checkpoints(numero)
+
+    # === Pontos de controle de saldo ===
+
+    def _ler_adiante(self, f, posicao: int) -> Iterator[tuple[int, Transacao]]:
+        """
+        Percorre o segmento aberto `f` (modo binário) a partir de `posicao`, em ordem cronológica.
+        Uma última linha incompleta é ignorada.
+
+        Yields:
+            tuple[int, Transacao]: Posição em bytes logo após a linha e a transação.
+        """
+        f.seek(posicao)
+        for linha in f:
+            if not linha.endswith(b"\n"):
+                return
+            posicao += len(linha)
+            yield posicao, Transacao.from_lista(json.loads(linha))
+
+    def _ultimo_checkpoint(self, numero: str) -> Optional[tuple[int, int, int, int]]:
+        """
+        Retorna o último ponto de controle gravado da conta, ou None.
+        """
+        try:
+            with open(self.caminho_checkpoints(numero), "rb") as f:
+                quantidade = f.seek(0, os.SEEK_END) // _CHECKPOINT.size
+                if quantidade == 0:
+                    return None
+                f.seek((quantidade - 1) * _CHECKPOINT.size)
+                return _CHECKPOINT.unpack(f.read(_CHECKPOINT.size))
+        except FileNotFoundError:
+            return None
+
+    def _obter_estado_checkpoint(self, numero: str, tamanho: int) -> list:
+        """
+        Retorna o estado usado para decidir os próximos pontos de controle da conta.
+
+        Na primeira vez (por processo), parte do último ponto de controle gravado e lê apenas
+        as transações posteriores a ele (no máximo CHECKPOINT_INTERVALO). O estado em memória é
+        refeito da mesma forma se o segmento mudou de tamanho por fora desta instância (outro
+        processo acrescentou transações).
+        """
+        estado = self._estado_checkpoint.get(numero)
+        if estado is not None and estado[4] == tamanho:
+            return estado
+
+        ultimo = self._ultimo_checkpoint(numero)
+        if ultimo is not None and ultimo[1] <= tamanho:
+            timestamp, posicao, indice, saldo = ultimo
+            estado = [indice, timestamp, saldo, indice, tamanho]
+        else:
+            posicao = 0
+            estado = [0, None, None, 0, tamanho]
+
+        try:
+            with open(self.caminho(numero), "rb") as f:
+                for _, transacao in self._ler_adiante(f, posicao):
+                    self._avancar_estado(estado, transacao)
+        except FileNotFoundError:
+            pass
+
+        self._estado_checkpoint[numero] = estado
+        return estado
+
+    @staticmethod
+    def _avancar_estado(estado: list, transacao: Transacao) -> None:
+        estado[0] += 1
+        if transacao.timestamp is not None:
+            estado[1] = transacao.timestamp
+        if transacao.saldo_apos_centavos is not None:
+            estado[2] = transacao.saldo_apos_centavos
+        else:
+            estado[2] = (estado[2] or 0) + transacao.efeito_centavos
+
+    def _planejar_checkpoints(self, estado: list, transacoes: List[Transacao], linhas: List[bytes], posicao: int) -> list:
+        """
+        Avança o estado da conta pelas transações a gravar e retorna os pontos de controle devidos:
+        um ao fechar cada mês (antes da primeira transação do mês seguinte) e um a cada
+        CHECKPOINT_INTERVALO transações.
+        """
+        checkpoints = []
+        for transacao, linha in zip(transacoes, linhas):
+            virou_o_mes = (
+                estado[1] is not None and transacao.timestamp is not None
+                and _mes(transacao.timestamp) != _mes(estado[1])
+            )
+            if virou_o_mes and estado[0] > estado[3]:
+                checkpoints.append((estado[1], posicao, estado[0], estado[2]))
+                estado[3] = estado[0]
+
+            posicao += len(linha)
+            self._avancar_estado(estado, transacao)
+
+            if estado[0] - estado[3] >= CHECKPOINT_INTERVALO:
+                checkpoints.append((estado[1] or 0, posicao, estado[0], estado[2]))
+                estado[3] = estado[0]
+        estado[4] = posicao
+        return checkpoints
+
+    def _gravar_checkpoints(self, numero: str, checkpoints: list, sincronizar: bool) -> None:
+        if not checkpoints:
+            return
+        with open(self.caminho_checkpoints(numero), "ab") as f:
+            # Descarta um registro incompleto deixado por uma escrita interrompida
+            tamanho = f.seek(0, os.SEEK_END)
+            if tamanho % _CHECKPOINT.size:
+                f.truncate(tamanho - tamanho % _CHECKPOINT.size)
+            f.write(b"".join(_CHECKPOINT.pack(*c) for c in checkpoints))
+            f.flush()
+            if sincronizar:
+                os.fsync(f.fileno())
+
+    def _descartar_checkpoints_apos(self, numero: str, tamanho: int) -> None:
+        """
+        Remove os pontos de controle que apontam além do final do segmento (após um truncamento).
+        """
+        self._estado_checkpoint.pop(numero, None)
+        try:
+            with open(self.caminho_checkpoints(numero), "r+b") as f:
+                quantidade = f.seek(0, os.SEEK_END) // _CHECKPOINT.size
+                while quantidade > 0:
+                    f.seek((quantidade - 1) * _CHECKPOINT.size)
+                    if _CHECKPOINT.unpack(f.read(_CHECKPOINT.size))[1] <= tamanho:
+                        break
+                    quantidade -= 1
+                f.truncate(quantidade * _CHECKPOINT.size)
+        except FileNotFoundError:
+            pass
+
+    def _apagar_checkpoints(self, numero: str) -> None:
+        self._estado_checkpoint.pop(numero, None)
+        try:
+            os.remove(self.caminho_checkpoints(numero))
+        except FileNotFoundError:
+            pass
+
+    def _buscar_checkpoint(self, numero: str, momento: float) -> Optional[tuple[int, int, int, int]]:
+        """
+        Busca binária pelo último ponto de controle com timestamp até `momento`.
+        """
+        try:
+            f = open(self.caminho_checkpoints(numero), "rb")
+        except FileNotFoundError:
+            return None
+
+        with f:
+            inferior, superior = 0, f.seek(0, os.SEEK_END) // _CHECKPOINT.size
+            encontrado = None
+            while inferior < superior:
+                meio = (inferior + superior) // 2
+                f.seek(meio * _CHECKPOINT.size)
+                registro = _CHECKPOINT.unpack(f.read(_CHECKPOINT.size))
+                if registro[0] <= momento:
+                    encontrado = registro
+                    inferior = meio + 1
+                else:
+                    superior = meio
+            return encontrado
+
+    def saldo_em(self, numero: str, momento: float) -> Optional[int]:
+        """
+        Retorna o saldo da conta, em centavos, no instante informado.
+
+        Localiza por busca binária o ponto de controle mais próximo antes de `momento` e reaplica
+        apenas as transações seguintes até esse instante. Antes da primeira transação,
+        retorna o saldo anterior a ela.
+
+        Args:
+            momento (float): Instante desejado (segundos desde a época Unix).
+
+        Returns:
+            int | None: Saldo em centavos, ou None se a conta não tiver histórico.
+        """
+        checkpoint = self._buscar_checkpoint(numero, momento)
+        posicao, saldo = (checkpoint[1], checkpoint[3]) if checkpoint else (0, None)
+
+        try:
+            with open(self.caminho(numero), "rb") as f:
+                for _, transacao in self._ler_adiante(f, posicao):
+                    if saldo is None:
+                        saldo_apos = transacao.saldo_apos_centavos
+                        saldo = (saldo_apos - transacao.efeito_centavos) if saldo_apos is not None else 0
+                    if transacao.timestamp is not None and transacao.timestamp > momento:
+                        break
+                    if transacao.saldo_apos_centavos is not None:
+                        saldo = transacao.saldo_apos_centavos
+                    else:
+                        saldo += transacao.efeito_centavos
+        except FileNotFoundError:
+            return None
+        return saldo
+
+
+_livros = {}
+_trava_registro = threading.Lock()
+
+
+def obter_livro_razao(diretorio: str = None) -> LivroRazao:
+    """
+    Retorna o LivroRazao do diretório informado (padrão: database/historico),
+    compartilhado por todo o processo para que as travas por conta sejam únicas.
+    """
+    diretorio = diretorio or os.path.join(DIRETORIO_DATABASE, DIRETORIO_HISTORICO)
+    chave = os.path.abspath(diretorio)
+    with _trava_registro:
+        if chave not in _livros:
+            _livros[chave] = LivroRazao(chave)
+        return _livros[chave]
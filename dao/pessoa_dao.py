@@ -1,6 +1,8 @@
+from typing import Dict, Optional
 from dao.dao import DAO
 from model.pessoa import Pessoa
 from mapper.pessoa_mapper import PessoaMapper
+from utils.helpers import normalizar_documento, normalizar_email
 from utils.constantes import ARQUIVO_PESSOAS
 
 
@@ -8,20 +10,30 @@ class PessoaDAO(DAO):
     """
     DAO responsável pela persistência de objetos Pessoa (ou suas subclasses)
     no arquivo JSON correspondente.
+
+    O identificador é o documento na forma canônica (só dígitos): CPF/CNPJ com ou sem
+    formatação encontram a mesma pessoa. Um índice único de e-mail (normalizado) é mantido
+    junto ao mapa de identidade: verificar se um e-mail já está em uso é uma consulta a
+    dicionário, e gravar uma pessoa com o e-mail de outra é recusado.
     """
 
     def __init__(self):
         """
-        Inicializa o DAO de pessoas com cache opcional em memória.
+        Inicializa o DAO de pessoas com o caminho do arquivo JSON correspondente.
         """
         super().__init__(ARQUIVO_PESSOAS)
-        self._cache_pessoas = None
+
+        # Índice único e-mail normalizado -> ID da pessoa. Guarda também o e-mail indexado
+        # por pessoa, pois o objeto pode ser alterado antes de chegar ao atualizar_objeto.
+        self._pessoa_por_email: Dict[str, str] = {}
+        self._emails_indexados: Dict[str, str] = {}
 
     def criar_objeto(self, dados: dict) -> Pessoa:
         """
-        Constrói um objeto Pessoa (ou subclasse) a partir de um dicionário.
+        Constrói um objeto Pessoa (ou subclasse) a partir de um registro persistido,
+        reaproveitando o endereço salvo (sem acesso à rede).
         """
-        return PessoaMapper.from_dict(dados)
+        return PessoaMapper.from_dict(dados, reidratar=True)
 
     def extrair_dados_do_objeto(self, pessoa: Pessoa) -> dict:
         """
@@ -35,45 +47,47 @@ class PessoaDAO(DAO):
         """
         return "numero_documento"
 
-    def listar_todos_objetos(self) -> list[Pessoa]:
-        """
-        Retorna todas as pessoas cadastradas, com uso de cache.
-        """
-        if self._cache_pessoas is not None:
-            return self._cache_pessoas
+    def _normalizar_id(self, id_valor) -> str:
+        return normalizar_documento(id_valor)
 
-        dados = self._ler_dados_do_json()
-        self._cache_pessoas = [self.criar_objeto(d) for d in dados]
-        return self._cache_pessoas
+    # === Índice único de e-mail ===
 
-    def buscar_por_id(self, id_valor: str) -> Pessoa | None:
-        """
-        Retorna a pessoa com o documento informado, usando cache.
-        """
-        return next(
-            (p for p in self.listar_todos_objetos() if str(p.get_numero_documento()) == str(id_valor)),
-            None
-        )
+    def _indexar(self, id_objeto: str, obj: Pessoa) -> None:
+        email = normalizar_email(obj.get_email())
+        self._emails_indexados[id_objeto] = email
+        self._pessoa_por_email[email] = id_objeto
+
+    def _desindexar(self, id_objeto: str, obj: Pessoa) -> None:
+        email = self._emails_indexados.pop(id_objeto, None)
+        if self._pessoa_por_email.get(email) == id_objeto:
+            del self._pessoa_por_email[email]
 
-    def salvar_objeto(self, pessoa: Pessoa) -> None:
+    def _carregar_indices(self) -> None:
         """
-        Salva uma nova pessoa e invalida o cache.
+        Completa o índice na primeira consulta (carga única de todas as pessoas).
         """
-        super().salvar_objeto(pessoa)
-        self._cache_pessoas = None
+        if not self._mapa_completo:
+            self.listar_todos_objetos()
+
+    def _chaves_unicas(self, obj: Pessoa) -> list:
+        return [f"email:{normalizar_email(obj.get_email())}"]
+
+    def _validar_unicidade(self, id_objeto: str, obj: Pessoa) -> None:
+        # O documento é o próprio ID: sua unicidade já é garantida pelo armazenamento
+        email = obj.get_email()
+        if self.id_por_email(email) not in (None, id_objeto):
+            raise ValueError(f"Já existe um cliente cadastrado com o e-mail {email}.")
 
-    def atualizar_objeto(self, pessoa: Pessoa) -> bool:
+    def id_por_email(self, email: str) -> Optional[str]:
         """
-        Atualiza uma pessoa existente e invalida o cache.
+        Retorna o ID da pessoa que usa o e-mail (sem diferenciar maiúsculas), ou None.
         """
-        atualizado = super().atualizar_objeto(pessoa)
-        self._cache_pessoas = None
-        return atualizado
+        with self._trava_mapa:
+            self._carregar_indices()
+            return self._pessoa_por_email.get(normalizar_email(email))
 
-    def deletar_objeto(self, id_valor: str) -> bool:
+    def id_por_documento(self, documento: str) -> Optional[str]:
         """
-        Remove uma pessoa pelo documento e invalida o cache.
+        Retorna o ID da pessoa com o CPF/CNPJ informado (com ou sem formatação), ou None.
         """
-        deletado = super().deletar_objeto(id_valor)
-        self._cache_pessoas = None
-        return deletado
\ No newline at end of file
+        return None if self.buscar_por_id(documento) is None else self._normalizar_id(documento)
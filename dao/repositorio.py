@@ -0,0 +1,102 @@
+import threading
+from dao.pessoa_dao import PessoaDAO
+from dao.conta_dao import ContaDAO
+from dao.cliente_dao import ClienteDAO
+from dao.gravador_contas import GravadorContas
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
+
+
+class Repositorio:
+    """
+    Registro único, por processo, dos DAOs do sistema.
+
+    Todos os controladores obtêm os DAOs por aqui, de modo que os mapas de identidade
+    (um objeto vivo por Conta, Pessoa ou Cliente) sejam compartilhados e permaneçam
+    aquecidos entre chamadas. O ClienteDAO reutiliza os mesmos PessoaDAO e ContaDAO,
+    portanto um Cliente referencia exatamente os objetos Pessoa e Conta do repositório.
+
+    Antes do primeiro DAO, conclui uma UnidadeDeTrabalho interrompida (se houver), para que
+    os objetos sejam carregados já com todas as alterações confirmadas. Pessoas e clientes
+    gravados com documento formatado são migrados para a forma canônica (só dígitos).
+    """
+
+    _trava = threading.Lock()
+    _pessoa_dao = None
+    _conta_dao = None
+    _cliente_dao = None
+    _gravador_contas = None
+    _recuperado = False
+
+    @staticmethod
+    def _recuperar() -> None:
+        """
+        Aplica, uma vez por processo (ou após `limpar`), o registro de uma unidade de trabalho
+        interrompida. Deve ser chamado com a trava do repositório.
+        """
+        if not Repositorio._recuperado:
+            UnidadeDeTrabalho.recuperar()
+            Repositorio._recuperado = True
+
+    @staticmethod
+    def pessoas() -> PessoaDAO:
+        """
+        Retorna o PessoaDAO compartilhado.
+        """
+        with Repositorio._trava:
+            if Repositorio._pessoa_dao is None:
+                Repositorio._recuperar()
+                Repositorio._pessoa_dao = PessoaDAO()
+                Repositorio._pessoa_dao.migrar_ids()
+            return Repositorio._pessoa_dao
+
+    @staticmethod
+    def contas() -> ContaDAO:
+        """
+        Retorna o ContaDAO compartilhado.
+        """
+        with Repositorio._trava:
+            if Repositorio._conta_dao is None:
+                Repositorio._recuperar()
+                Repositorio._conta_dao = ContaDAO()
+            return Repositorio._conta_dao
+
+    @staticmethod
+    def clientes() -> ClienteDAO:
+        """
+        Retorna o ClienteDAO compartilhado, ligado aos PessoaDAO e ContaDAO compartilhados.
+        """
+        pessoa_dao = Repositorio.pessoas()
+        conta_dao = Repositorio.contas()
+        with Repositorio._trava:
+            if Repositorio._cliente_dao is None:
+                Repositorio._cliente_dao = ClienteDAO(pessoa_dao=pessoa_dao, conta_dao=conta_dao)
+                Repositorio._cliente_dao.migrar_ids()
+            return Repositorio._cliente_dao
+
+    @staticmethod
+    def gravador_contas() -> GravadorContas:
+        """
+        Retorna o GravadorContas compartilhado, ligado ao ContaDAO compartilhado.
+        """
+        conta_dao = Repositorio.contas()
+        with Repositorio._trava:
+            if Repositorio._gravador_contas is None:
+                Repositorio._gravador_contas = GravadorContas(conta_dao)
+            return Repositorio._gravador_contas
+
+    @staticmethod
+    def limpar() -> None:
+        """
+        Descarta os DAOs compartilhados e seus objetos em memória.
+        Alterações de contas ainda não gravadas pelo GravadorContas são gravadas antes.
+        """
+        with Repositorio._trava:
+            gravador = Repositorio._gravador_contas
+            Repositorio._gravador_contas = None
+        if gravador is not None:
+            gravador.fechar()
+        with Repositorio._trava:
+            Repositorio._pessoa_dao = None
+            Repositorio._conta_dao = None
+            Repositorio._cliente_dao = None
+            Repositorio._recuperado = False
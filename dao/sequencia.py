@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: trava de arquivo pelo msvcrt
+    fcntl = None
+    import msvcrt
+
+from dao.armazenamento import _gravar_json_atomico
+
+
+@contextmanager
+def _travar_arquivo(caminho: str) -> Iterator[None]:
+    """
+    Trava exclusiva entre processos, mantida num arquivo auxiliar durante o bloco `with`.
+    """
+    with open(caminho, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SequenciaNumeros:
+    """
+    Sequência persistente de números únicos (por exemplo, números de conta), segura entre
+    threads, processos e quedas.
+
+    O arquivo guarda apenas o próximo número ainda não reservado. Cada processo reserva um
+    bloco de `bloco` números de uma vez (uma leitura e uma gravação atômica do arquivo, sob
+    trava de arquivo) e os entrega da memória, sem acessar o disco, até o bloco acabar: o
+    custo de cada número não depende da quantidade de números já emitidos. Números de um
+    bloco não usados até o fim do processo são pulados, nunca repetidos.
+    """
+
+    def __init__(self, caminho: str, inicial: Callable[[], int], bloco: int):
+        """
+        Args:
+            caminho (str): Arquivo da sequência.
+            inicial (Callable): Retorna o primeiro número, usado apenas quando o arquivo
+                ainda não existe (ex.: o maior número já gravado mais um).
+            bloco (int): Quantidade de números reservados por vez.
+        """
+        self.caminho = caminho
+        self.bloco = max(1, bloco)
+        self._inicial = inicial
+        self._proximo = 0
+        self._limite = 0   # Fim (exclusivo) do bloco reservado por este processo
+        self._trava = threading.Lock()
+
+    def _reservar_bloco(self) -> None:
+        os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+        with _travar_arquivo(self.caminho + ".lock"):
+            try:
+                with open(self.caminho, "r", encoding="utf-8") as f:
+                    proximo = int(json.load(f)["proximo"])
+            except FileNotFoundError:
+                proximo = int(self._inicial())
+            _gravar_json_atomico(self.caminho, {"proximo": proximo + self.bloco})
+        self._proximo, self._limite = proximo, proximo + self.bloco
+
+    def proximo(self) -> int:
+        """
+        Retorna um número nunca entregue antes por esta sequência.
+        """
+        with self._trava:
+            if self._proximo >= self._limite:
+                self._reservar_bloco()
+            numero = self._proximo
+            self._proximo += 1
+            return numero
@@ -0,0 +1,335 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Set
+
+from dao.dao import DAO
+from dao.conta_dao import ContaDAO
+from dao.armazenamento import obter_armazenamento, _gravar_json_atomico
+from dao.livro_razao import obter_livro_razao
+from model.transacao import Transacao
+from utils.logger import logger
+from utils.constantes import DIRETORIO_DATABASE, DIRETORIO_UNIDADES_TRABALHO
+
+_SALVAR = "salvar"
+_ATUALIZAR = "atualizar"
+_REMOVER = "remover"
+
+
+class _RegistroPendente:
+    """
+    Registro já confirmado cuja aplicação falhou neste processo, com as chaves que ele altera
+    e as alterações a refletir na memória quando ele for aplicado.
+    """
+
+    def __init__(self, caminho: str, registro: dict, chaves: Dict[DAO, Set[str]], efetivas: dict):
+        self.caminho = caminho
+        self.registro = registro
+        self.chaves = chaves
+        self.efetivas = efetivas
+
+    def intercepta(self, chaves: Dict[DAO, Set[str]]) -> bool:
+        return any(self.chaves.get(dao, set()) & ids for dao, ids in chaves.items())
+
+
+# Registros confirmados que ainda precisam ser aplicados, na ordem de confirmação
+_pendentes: List[_RegistroPendente] = []
+_trava_pendentes = threading.Lock()
+
+
+class UnidadeDeTrabalho:
+    """
+    Agrupa alterações em vários DAOs (ContaDAO, ClienteDAO, PessoaDAO) e as confirma juntas:
+    ou todas chegam ao armazenamento, ou nenhuma.
+
+    As alterações ficam em memória até `confirmar`. A confirmação grava primeiro um registro
+    com tudo o que será escrito (os registros de cada arquivo e as transações a acrescentar
+    ao histórico das contas), num arquivo próprio da unidade, e só então aplica as alterações,
+    uma escrita por arquivo. Se o processo cair no meio da aplicação, `recuperar` refaz os
+    registros na próxima inicialização; aplicar o mesmo registro mais de uma vez não muda o
+    resultado.
+
+    Durante a confirmação ficam travados apenas os registros alterados (ID e valores únicos,
+    pelas travas por registro de cada DAO): unidades que alteram registros diferentes são
+    confirmadas em paralelo.
+
+    Uso:
+        with UnidadeDeTrabalho() as unidade:
+            unidade.salvar(conta_dao, nova_conta)
+            unidade.atualizar(cliente_dao, cliente)
+        # Confirmada ao sair do bloco; descartada se o bloco lançar uma exceção.
+    """
+
+    def __init__(self, diretorio: str = None):
+        """
+        Args:
+            diretorio (str, opcional): Pasta dos registros. Padrão: database/unidades_de_trabalho.
+        """
+        self.diretorio = diretorio or os.path.join(DIRETORIO_DATABASE, DIRETORIO_UNIDADES_TRABALHO)
+        self._alteracoes: Dict[DAO, Dict[str, tuple]] = {}   # DAO -> id -> (operação, objeto)
+
+    def __enter__(self) -> 'UnidadeDeTrabalho':
+        return self
+
+    def __exit__(self, tipo_excecao, excecao, rastreamento) -> bool:
+        if tipo_excecao is None:
+            self.confirmar()
+        else:
+            self.descartar()
+        return False
+
+    # === Registro das alterações ===
+
+    def _registrar(self, dao: DAO, id_objeto, operacao: str, obj=None) -> None:
+        self._alteracoes.setdefault(dao, {})[str(id_objeto)] = (operacao, obj)
+
+    def salvar(self, dao: DAO, obj) -> None:
+        """
+        Inclui um novo objeto. A duplicação de ID é verificada na confirmação.
+        """
+        self._registrar(dao, dao._id_do_registro(dao.extrair_dados_do_objeto(obj)), _SALVAR, obj)
+
+    def atualizar(self, dao: DAO, obj) -> None:
+        """
+        Atualiza um objeto existente. Objetos não encontrados na confirmação são ignorados,
+        como em `DAO.atualizar_objeto`.
+        """
+        self._registrar(dao, dao._id_do_registro(dao.extrair_dados_do_objeto(obj)), _ATUALIZAR, obj)
+
+    def remover(self, dao: DAO, id_valor) -> None:
+        """
+        Remove o objeto com o ID informado (e, para contas, seu histórico).
+        """
+        self._registrar(dao, dao._normalizar_id(id_valor), _REMOVER)
+
+    def descartar(self) -> None:
+        """
+        Esquece as alterações ainda não confirmadas.
+        """
+        self._alteracoes.clear()
+
+    # === Confirmação ===
+
+    def confirmar(self) -> None:
+        """
+        Grava todas as alterações registradas de forma atômica.
+
+        Raises:
+            ValueError: Se um objeto incluído com `salvar` já existir, ou se um objeto violar uma
+                restrição de unicidade do DAO; nada é gravado.
+            OSError: Se o registro não puder ser gravado, ou se um registro anterior com as mesmas
+                chaves ainda não puder ser aplicado; nada é gravado.
+        """
+        if not self._alteracoes:
+            return
+        try:
+            self._confirmar()
+        finally:
+            self._alteracoes.clear()
+
+    def _chaves(self) -> Dict[DAO, Set[str]]:
+        """
+        Retorna, por DAO, os IDs e valores únicos alterados pela unidade.
+        """
+        chaves = {}
+        for dao, alteracoes in self._alteracoes.items():
+            chaves[dao] = set(alteracoes)
+            for operacao, obj in alteracoes.values():
+                if operacao != _REMOVER:
+                    chaves[dao].update(dao._chaves_unicas(obj))
+        return chaves
+
+    def _confirmar(self) -> None:
+        chaves = self._chaves()
+        with _travar_com_pendentes(chaves) as pendentes:
+            # Um registro anterior que não chegou ao disco vai antes: a unidade atual é mais nova
+            for pendente in pendentes:
+                _aplicar_pendente(pendente)
+
+            daos = sorted(self._alteracoes, key=lambda dao: dao.arquivo_json)
+            efetivas = self._filtrar(daos)
+            registro = self._montar_registro(efetivas)
+            os.makedirs(self.diretorio, exist_ok=True)
+            caminho = os.path.join(self.diretorio, f"{time.time_ns():020d}-{uuid.uuid4().hex}.json")
+            _gravar_json_atomico(caminho, registro)
+
+            # Gravado o registro, a unidade está confirmada: uma falha ao aplicar fica para a
+            # próxima unidade com as mesmas chaves (ou a recuperação). A memória só passa a
+            # refletir a unidade, e as transações só deixam de ser pendentes, depois de aplicada.
+            try:
+                _aplicar(registro)
+            except Exception as e:
+                logger.error(f"Falha ao aplicar unidade de trabalho (será refeita antes da próxima): {e}")
+                with _trava_pendentes:
+                    _pendentes.append(_RegistroPendente(caminho, registro, chaves, efetivas))
+                return
+            _refletir_na_memoria(efetivas, registro)
+            os.remove(caminho)
+
+    def _filtrar(self, daos: List[DAO]) -> Dict[DAO, Dict[str, tuple]]:
+        """
+        Verifica duplicações e unicidade e descarta atualizações de objetos inexistentes.
+        """
+        efetivas = {}
+        for dao in daos:
+            efetivas[dao] = {}
+            for id_objeto, (operacao, obj) in self._alteracoes[dao].items():
+                existente = dao.buscar_por_id(id_objeto) if operacao != _REMOVER else None
+                if operacao == _SALVAR and existente is not None and existente is not obj:
+                    raise dao._armazenamento._erro_duplicado({dao.tipo_de_id(): id_objeto})
+                if operacao == _ATUALIZAR and existente is None:
+                    continue
+                if operacao != _REMOVER:
+                    dao._validar_unicidade(id_objeto, obj)
+                efetivas[dao][id_objeto] = (operacao, obj)
+        return efetivas
+
+    def _montar_registro(self, efetivas: Dict[DAO, Dict[str, tuple]]) -> dict:
+        registro = {"operacoes": [], "historico": {}, "historicos_removidos": [], "diretorio_historico": None}
+        for dao, alteracoes in efetivas.items():
+            salvar = [dao.extrair_dados_do_objeto(obj) for operacao, obj in alteracoes.values() if operacao != _REMOVER]
+            remover = [id_objeto for id_objeto, (operacao, _) in alteracoes.items() if operacao == _REMOVER]
+            registro["operacoes"].append({
+                "arquivo": os.path.basename(dao.arquivo_json),
+                "chave": dao.tipo_de_id(),
+                "backend": dao._armazenamento.backend,
+                "salvar": salvar,
+                "remover": remover
+            })
+            if not isinstance(dao, ContaDAO):
+                continue
+
+            # Transações pendentes das contas e o tamanho do histórico antes delas
+            livro = dao._livro_razao
+            registro["diretorio_historico"] = livro.diretorio
+            registro["historicos_removidos"] += remover
+            for id_objeto, (operacao, conta) in alteracoes.items():
+                if operacao == _REMOVER:
+                    continue
+                pendentes = conta._transacoes_pendentes()
+                if pendentes:
+                    registro["historico"][id_objeto] = {
+                        "tamanho": livro.tamanho(id_objeto),
+                        "transacoes": [t.to_lista() for t in pendentes]
+                    }
+        return registro
+
+    # === Recuperação ===
+
+    @staticmethod
+    def recuperar(diretorio: str = None) -> int:
+        """
+        Conclui a aplicação das unidades de trabalho interrompidas, na ordem em que foram
+        confirmadas. Deve ser chamado antes de os DAOs carregarem seus objetos.
+
+        Returns:
+            int: Quantidade de registros aplicados.
+        """
+        diretorio = diretorio or os.path.join(DIRETORIO_DATABASE, DIRETORIO_UNIDADES_TRABALHO)
+        if not os.path.isdir(diretorio):
+            return 0
+        aplicados = 0
+        for nome in sorted(os.listdir(diretorio)):
+            caminho = os.path.join(diretorio, nome)
+            if not nome.endswith(".json"):
+                # Gravação atômica: só o arquivo temporário pode estar incompleto, nunca o registro
+                os.remove(caminho)
+                continue
+            try:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    registro = json.load(f)
+            except json.JSONDecodeError:
+                logger.warning(f"Registro de unidade de trabalho ilegível descartado: {caminho}")
+                os.remove(caminho)
+                continue
+            logger.warning(f"Aplicando unidade de trabalho interrompida: {nome}")
+            _aplicar(registro)
+            os.remove(caminho)
+            aplicados += 1
+        with _trava_pendentes:
+            # Os pendentes deste processo estavam na pasta e acabaram de ser aplicados
+            _pendentes[:] = [p for p in _pendentes if os.path.exists(p.caminho)]
+        return aplicados
+
+
+@contextmanager
+def _travar_com_pendentes(chaves: Dict[DAO, Set[str]]) -> Iterator[List[_RegistroPendente]]:
+    """
+    Trava as chaves da unidade e as dos registros pendentes que as interceptam (aplicar um
+    pendente exige todas as suas chaves). Produz esses pendentes, em ordem de confirmação.
+    """
+    while True:
+        with _trava_pendentes:
+            pendentes = [p for p in _pendentes if p.intercepta(chaves)]
+        travadas = {dao: set(ids) for dao, ids in chaves.items()}
+        for pendente in pendentes:
+            for dao, ids in pendente.chaves.items():
+                travadas.setdefault(dao, set()).update(ids)
+
+        with ExitStack() as travas:
+            # DAOs sempre na mesma ordem (e as chaves ordenadas em cada um): sem impasse
+            for dao in sorted(travadas, key=lambda d: d.arquivo_json):
+                travas.enter_context(dao._travas_registros.travar(*travadas[dao]))
+            with _trava_pendentes:
+                atuais = [p for p in _pendentes if p.intercepta(chaves)]
+            if all(p in pendentes for p in atuais):
+                yield atuais
+                return
+        # Surgiu um pendente com chaves não travadas: trava de novo incluindo-as
+
+
+def _aplicar_pendente(pendente: _RegistroPendente) -> None:
+    """
+    Aplica um registro pendente (com suas chaves travadas) e o esquece.
+
+    Raises:
+        OSError: Se ainda não for possível aplicá-lo.
+    """
+    try:
+        _aplicar(pendente.registro)
+    except Exception as e:
+        raise OSError(f"Unidade de trabalho anterior ainda não aplicada: {e}") from e
+    _refletir_na_memoria(pendente.efetivas, pendente.registro)
+    os.remove(pendente.caminho)
+    with _trava_pendentes:
+        _pendentes.remove(pendente)
+
+
+def _refletir_na_memoria(efetivas: Dict[DAO, Dict[str, tuple]], registro: dict) -> None:
+    """
+    Atualiza os mapas de identidade com uma unidade já aplicada e marca como gravadas as
+    transações que ela acrescentou ao histórico.
+    """
+    for dao, alteracoes in efetivas.items():
+        with dao._trava_mapa:
+            for id_objeto, (operacao, obj) in alteracoes.items():
+                if operacao == _REMOVER:
+                    dao._remover_do_mapa(id_objeto)
+                    continue
+                dao._registrar_no_mapa(id_objeto, obj)
+                if isinstance(dao, ContaDAO):
+                    obj._definir_carregador_historico(dao._livro_razao.ler)
+                    gravadas = registro["historico"].get(id_objeto, {}).get("transacoes", ())
+                    obj._confirmar_transacoes_gravadas(len(gravadas))
+
+
+def _aplicar(registro: dict) -> None:
+    """
+    Escreve as alterações do registro: uma escrita por arquivo e, no histórico de cada conta,
+    o acréscimo das transações que ainda não estão lá.
+    """
+    for operacao in registro["operacoes"]:
+        armazenamento = obter_armazenamento(operacao["arquivo"], operacao["chave"], operacao.get("backend"))
+        armazenamento.aplicar(operacao["salvar"], operacao["remover"])
+
+    livro = obter_livro_razao(registro.get("diretorio_historico"))
+    lancamentos = {}
+    for numero, historico in registro.get("historico", {}).items():
+        transacoes = [Transacao.from_lista(t) for t in historico["transacoes"]]
+        lancamentos[numero] = livro.faltantes(numero, historico["tamanho"], transacoes)
+    livro.anexar_em_lote(lancamentos)
+    for numero in registro.get("historicos_removidos", []):
+        livro.remover(str(numero))
@@ -1,3 +1,4 @@
+from typing import Callable
 from model.conta import Conta
 from model.conta_corrente import ContaCorrente
 from model.conta_poupanca import ContaPoupanca
@@ -11,14 +12,18 @@ class ContaMapper:
     """
 
     @staticmethod
-    def from_dict(dados: dict) -> Conta:
+    def from_dict(dados: dict, carregador_historico: Callable = None) -> Conta:
         """
         Constrói uma instância de ContaCorrente ou ContaPoupanca a partir de um dicionário.
 
+        O histórico fica fora do registro da conta (ver LivroRazao) e é carregado sob demanda
+        por `carregador_historico`. Um campo "historico" no dicionário (formato antigo, com o
+        histórico embutido) é aceito e tratado como transações ainda não gravadas no histórico.
+
         Raises:
             ValueError: Se campos obrigatórios estiverem ausentes ou tipo for inválido.
         """
-        campos_obrigatorios = ["tipo", "numero", "saldo", "historico", "ativa"]
+        campos_obrigatorios = ["tipo", "numero", "saldo", "ativa"]
         campos_faltantes = [campo for campo in campos_obrigatorios if campo not in dados]
         if campos_faltantes:
             raise ValueError(f"Campos obrigatórios ausentes: {', '.join(campos_faltantes)}")
@@ -26,13 +31,14 @@ class ContaMapper:
         tipo = dados["tipo"]
         numero = int(dados["numero"])
         saldo = float(dados["saldo"])
-        historico = dados["historico"]
+        historico = dados.get("historico")
         ativa = dados["ativa"]
+        ultimo_fechamento = dados.get("ultimo_fechamento")
 
         if tipo == TIPO_CCORRENTE:
-            return ContaCorrente(numero, saldo, historico, ativa)
+            return ContaCorrente(numero, saldo, historico, ativa, carregador_historico, ultimo_fechamento)
         elif tipo == TIPO_CPOUPANCA:
-            return ContaPoupanca(numero, saldo, historico, ativa)
+            return ContaPoupanca(numero, saldo, historico, ativa, carregador_historico, ultimo_fechamento)
         else:
             raise ValueError(f"Tipo de conta desconhecido: {tipo}")
 
@@ -40,13 +46,17 @@ class ContaMapper:
     def to_dict(conta: Conta) -> dict:
         """
         Converte uma instância de Conta em um dicionário serializável.
+        O histórico não faz parte do registro: é gravado à parte, no LivroRazao.
+        O campo "ultimo_fechamento" só é incluído depois do primeiro fechamento mensal da conta.
         """
         tipo = TIPO_CCORRENTE if isinstance(conta, ContaCorrente) else TIPO_CPOUPANCA
 
-        return {
+        dados = {
             "numero": str(conta.get_numero_conta()),
             "saldo": conta.get_saldo(),
-            "historico": conta.get_historico(),
             "ativa": conta.get_estado_da_conta(),
             "tipo": tipo
-        }
\ No newline at end of file
+        }
+        if conta.get_ultimo_fechamento() is not None:
+            dados["ultimo_fechamento"] = conta.get_ultimo_fechamento()
+        return dados
\ No newline at end of file
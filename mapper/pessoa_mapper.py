@@ -10,10 +10,15 @@ class PessoaMapper:
     """
 
     @staticmethod
-    def from_dict(dados: dict):
+    def from_dict(dados: dict, reidratar: bool = False):
         """
         Constrói uma instância de PessoaFisica ou PessoaJuridica a partir de um dicionário.
 
+        Args:
+            dados (dict): Dados da pessoa.
+            reidratar (bool, opcional): Indica que os dados vêm do armazenamento do sistema;
+                nesse caso o endereço salvo é reaproveitado, sem consulta à API de CEP.
+
         Raises:
             ValueError: Se o tipo for desconhecido ou os dados forem inválidos.
         """
@@ -28,7 +33,8 @@ class PessoaMapper:
                 numero_endereco=dados["numero_endereco"],
                 endereco=dados.get("endereco", ""),
                 telefone=dados["telefone"],
-                data_nascimento=dados["data_nascimento"]
+                data_nascimento=dados["data_nascimento"],
+                consultar_endereco=not reidratar
             )
 
         if tipo == TIPO_PJURIDICA.lower():
@@ -40,7 +46,8 @@ class PessoaMapper:
                 numero_endereco=dados["numero_endereco"],
                 endereco=dados["endereco"],
                 telefone=dados["telefone"],
-                nome_fantasia=dados.get("nome_fantasia", "")
+                nome_fantasia=dados.get("nome_fantasia", ""),
+                consultar_endereco=not reidratar
             )
 
         raise ValueError(f"Tipo de pessoa desconhecido: {tipo}")
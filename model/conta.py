@@ -1,8 +1,15 @@
+import time
 from abc import ABC, abstractmethod
-from utils.helpers import data_hora_atual_str
+from typing import Callable
 from utils.validadores.validar_conta import ValidarConta as Validar
-from utils.constantes import LIMITE_TRANSFERENCIA_CCORRENTE
+from utils.constantes import (
+    LIMITE_TRANSFERENCIA_CCORRENTE,
+    TRANSACAO_ENVIO,
+    TRANSACAO_RECEBIMENTO,
+    TRANSACAO_ENCERRAMENTO
+)
 from model.exceptions import ContaInativaError
+from model.transacao import Transacao, para_centavos
 
 class Conta(ABC):
     """
@@ -11,11 +18,22 @@ class Conta(ABC):
     Attributes:
         _numero_conta (str): Número único da conta.
         _saldo (float): Saldo atual da conta.
-        _historico (list[str]): Lista de operações realizadas.
+        _historico (list[Transacao] | None): Operações realizadas; None enquanto não carregado.
+        _novas_transacoes (list[Transacao]): Operações ainda não gravadas no histórico persistente.
         _ativa (bool): Indica se a conta está ativa.
+        _ultimo_fechamento (str | None): Último período ("AAAA-MM") em que a atualização mensal
+            foi aplicada pelo fechamento em lote.
     """
 
-    def __init__(self, numero: str, saldo: float = 0.0, historico: list[str] = None, ativa: bool = True) -> None:
+    def __init__(
+        self,
+        numero: str,
+        saldo: float = 0.0,
+        historico: list = None,
+        ativa: bool = True,
+        carregador_historico: Callable[[str], list[Transacao]] = None,
+        ultimo_fechamento: str = None
+    ) -> None:
         """
         Inicializa uma conta bancária com os dados necessários.
         
@@ -25,8 +43,12 @@ class Conta(ABC):
         Args:
             numero (str): Número da conta.
             saldo (float, opcional): Saldo da conta (pode ser negativo). Padrão: 0.0.
-            historico (list[str], opcional): Lista de transações registradas. Padrão: lista vazia.
+            historico (list, opcional): Transações ainda não gravadas no histórico persistente
+                (Transacao, forma compacta em lista ou texto legado, que é convertido). Padrão: nenhuma.
             ativa (bool, opcional): Estado da conta (ativa ou inativa). Padrão: True.
+            carregador_historico (Callable, opcional): Função que recebe o número da conta e
+                retorna o histórico persistido. Só é chamada quando o histórico é consultado.
+            ultimo_fechamento (str, opcional): Último período ("AAAA-MM") já fechado. Padrão: nenhum.
 
         Raises:
             ValueError: Se um ou mais valores forem inválidos e/ou esiverem com tipo incorreto.
@@ -39,8 +61,11 @@ class Conta(ABC):
 
         self._numero_conta = numero
         self._saldo = saldo
-        self._historico = historico
         self._ativa = ativa
+        self._carregador_historico = carregador_historico
+        self._novas_transacoes = Transacao.migrar_historico(historico, saldo)
+        self._historico = None
+        self._ultimo_fechamento = ultimo_fechamento
 
     @abstractmethod
     def atualizacao_mensal(self) -> None:
@@ -94,12 +119,8 @@ class Conta(ABC):
 
         self._set_saldo(self._saldo - valor)
         destino._set_saldo(destino._saldo + valor)
-        self._registrar_operacao(
-            f"Transferência de R$ {valor:.2f} para conta {destino.get_numero_conta()}"
-        )
-        destino._registrar_operacao(
-            f"Recebido R$ {valor:.2f} da conta {self.get_numero_conta()}"
-        )
+        self._registrar_operacao(TRANSACAO_ENVIO, valor, contraparte=destino.get_numero_conta())
+        destino._registrar_operacao(TRANSACAO_RECEBIMENTO, valor, contraparte=self.get_numero_conta())
 
     def encerrar_conta(self) -> None:
         """
@@ -107,7 +128,7 @@ class Conta(ABC):
         Faz o registro de encerramento e adiciona no histórico.
         """
         self._ativa = False
-        self._registrar_operacao("Conta encerrada")
+        self._registrar_operacao(TRANSACAO_ENCERRAMENTO)
 
     def get_estado_da_conta(self) -> bool:
         """
@@ -118,6 +139,12 @@ class Conta(ABC):
         """
         return self._ativa
 
+    def get_ultimo_fechamento(self) -> str | None:
+        """
+        Retorna o último período ("AAAA-MM") em que o fechamento mensal foi aplicado à conta.
+        """
+        return self._ultimo_fechamento
+
     def get_saldo(self) -> float:
         """
         Retorna o saldo atual da conta.
@@ -150,13 +177,85 @@ class Conta(ABC):
 
     def get_historico(self) -> list[str]:
         """
-        Retorna o histórico de transações da conta.
+        Retorna o histórico de transações da conta em texto.
+
+        Returns:
+            list[str]: Lista de descrições de transações, no formato "[data] descrição".
+        """
+        return [str(transacao) for transacao in self.get_transacoes()]
+
+    def get_transacoes(self) -> list[Transacao]:
+        """
+        Retorna o histórico de transações da conta como registros estruturados.
 
         Returns:
-            list[str]: Lista de descrições de transações.
+            list[Transacao]: Transações, da mais antiga para a mais recente.
         """
+        self._carregar_historico()
         return self._historico.copy()
 
+    def _carregar_historico(self) -> None:
+        """
+        Carrega o histórico persistido na primeira consulta, somando as operações ainda não gravadas.
+        """
+        if self._historico is None:
+            persistido = self._carregador_historico(str(self._numero_conta)) if self._carregador_historico else []
+            self._historico = persistido + self._novas_transacoes
+
+    def _definir_carregador_historico(self, carregador: Callable[[str], list[Transacao]]) -> None:
+        """
+        Define a origem do histórico persistido, caso a conta ainda não tenha uma.
+        """
+        if self._carregador_historico is None:
+            self._carregador_historico = carregador
+
+    def _transacoes_pendentes(self) -> list[Transacao]:
+        """
+        Retorna as operações registradas que ainda não foram gravadas no histórico persistente.
+        """
+        return self._novas_transacoes.copy()
+
+    def _confirmar_transacoes_gravadas(self, quantidade: int) -> None:
+        """
+        Marca as `quantidade` primeiras operações pendentes como gravadas.
+        """
+        del self._novas_transacoes[:quantidade]
+
+    def _capturar_estado(self) -> tuple:
+        """
+        Retorna o estado alterável da conta, para desfazer com `_restaurar_estado` uma
+        operação cuja gravação falhou.
+        """
+        historico = None if self._historico is None else len(self._historico)
+        return self._saldo, self._ativa, len(self._novas_transacoes), historico
+
+    def _restaurar_estado(self, estado: tuple) -> None:
+        """
+        Volta ao estado capturado por `_capturar_estado`, descartando as operações registradas depois.
+        """
+        self._saldo, self._ativa, pendentes, historico = estado
+        del self._novas_transacoes[pendentes:]
+        if historico is None:
+            self._historico = None
+        elif self._historico is not None:
+            del self._historico[historico:]
+
+    def _aplicar_transacao_gravada(self, transacao: Transacao, saldo: float = None) -> None:
+        """
+        Reflete no objeto uma operação já gravada por fora dele (processamento em lote):
+        assume o saldo após a operação (`saldo`, se informado; senão, o da transação, em
+        centavos) e a acrescenta ao histórico, se já carregado.
+        """
+        self._saldo = transacao.saldo_apos if saldo is None else saldo
+        if self._historico is not None:
+            self._historico.append(transacao)
+
+    def _marcar_fechamento(self, periodo: str) -> None:
+        """
+        Registra o período ("AAAA-MM") cujo fechamento mensal já foi aplicado à conta.
+        """
+        self._ultimo_fechamento = periodo
+
     def get_numero_conta(self) -> str:
         """
         Retorna o número da conta.
@@ -166,15 +265,26 @@ class Conta(ABC):
         """
         return self._numero_conta
 
-    def _registrar_operacao(self, descricao: str) -> None:
+    def _registrar_operacao(self, tipo: str, valor: float = 0.0, contraparte: str = None) -> None:
         """
-        Adiciona um registro da operação no histórico da conta, com data e hora.
+        Adiciona um registro da operação no histórico da conta, com data e hora
+        e o saldo resultante.
 
         Args:
-            descricao (str): Descrição da operação.
+            tipo (str): Tipo da operação (constantes TRANSACAO_*).
+            valor (float, opcional): Valor da operação, em reais.
+            contraparte (str, opcional): Número da outra conta, em transferências.
         """
-        registro = f"[{data_hora_atual_str()}] {descricao}"
-        self._historico.append(registro)
+        registro = Transacao(
+            timestamp=int(time.time()),
+            tipo=tipo,
+            valor_centavos=para_centavos(valor),
+            contraparte=None if contraparte is None else str(contraparte),
+            saldo_apos_centavos=para_centavos(self._saldo)
+        )
+        self._novas_transacoes.append(registro)
+        if self._historico is not None:
+            self._historico.append(registro)
 
     def __str__(self) -> str:
         """
@@ -1,6 +1,6 @@
 from model.conta import Conta
 from model.exceptions import ContaInativaError
-from utils.constantes import TAXA_MANUTENCAO_CCORRENTE
+from utils.constantes import TAXA_MANUTENCAO_CCORRENTE, TRANSACAO_TAXA
 
 
 class ContaCorrente(Conta):
@@ -24,6 +24,4 @@ class ContaCorrente(Conta):
 
         novo_saldo = self._saldo - TAXA_MANUTENCAO_CCORRENTE
         self._set_saldo(novo_saldo, permitir_negativo=True)
-        self._registrar_operacao(
-            f"Atualização mensal: taxa de manutenção de R$ {TAXA_MANUTENCAO_CCORRENTE:.2f} cobrada."
-        )
\ No newline at end of file
+        self._registrar_operacao(TRANSACAO_TAXA, TAXA_MANUTENCAO_CCORRENTE)
\ No newline at end of file
@@ -2,7 +2,8 @@ from model.conta import Conta
 from model.exceptions import ContaInativaError
 from utils.constantes import (
     LIMITE_TRANSFERENCIA_CPOUPANCA,
-    RENDIMENTO_MENSAL_CPOUPANCA
+    RENDIMENTO_MENSAL_CPOUPANCA,
+    TRANSACAO_RENDIMENTO
 )
 
 
@@ -31,4 +32,4 @@ class ContaPoupanca(Conta):
 
         rendimento = self._saldo * RENDIMENTO_MENSAL_CPOUPANCA
         self._set_saldo(self._saldo + rendimento)
-        self._registrar_operacao(f"Atualização mensal: rendimento de R$ {rendimento:.2f} aplicado.")
\ No newline at end of file
+        self._registrar_operacao(TRANSACAO_RENDIMENTO, rendimento)
\ No newline at end of file
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from utils.validadores.validar_pessoa import ValidarPessoa as Validar
 from utils.api import API
+from utils.cliente_http import ServicoIndisponivelError
+from utils.helpers import normalizar_documento
 
 
 class Pessoa(ABC):
@@ -20,7 +22,8 @@ class Pessoa(ABC):
         cep: str,
         numero_endereco: str,
         telefone: str,
-        endereco: str = None 
+        endereco: str = None,
+        consultar_endereco: bool = True
     ) -> None:
         """
         Inicializa uma instância de Pessoa com os dados fornecidos.
@@ -29,17 +32,23 @@ class Pessoa(ABC):
             As validações são feitas nas subclasses.
             Esta classe assume que os dados recebidos já são válidos.
 
+        Args:
+            consultar_endereco (bool, opcional): Se False e um endereço for informado,
+                o endereço é aceito como está, sem consulta à API. Usado ao reidratar
+                registros já persistidos. Padrão: True.
+
         Raises:
             ValueError: Em caso de falha ao buscar o endereço via API.
         """
         self._nome = nome
         self._email = email
-        self._numero_documento = numero_documento
+        self._numero_documento = normalizar_documento(numero_documento)  # Forma canônica: só dígitos
         self._cep = cep
         self._numero_endereco = numero_endereco
         self._telefone = telefone
         self._endereco = endereco
-        self._atualizar_endereco()
+        if consultar_endereco or not endereco:
+            self._atualizar_endereco()
 
     @abstractmethod
     def __str__(self) -> str:
@@ -73,14 +82,18 @@ class Pessoa(ABC):
 
     def set_cep(self, novo_cep: str) -> None:
         Validar.cep(novo_cep)
-        self._cep = novo_cep
+        if novo_cep != self._cep:
+            self._cep = novo_cep
+            self._atualizar_endereco()
 
     def get_numero_endereco(self) -> str:
         return self._numero_endereco
 
     def set_numero_endereco(self, novo_numero: str) -> None:
         Validar.numero_endereco(novo_numero)
-        self._numero_endereco = novo_numero
+        if novo_numero != self._numero_endereco:
+            self._numero_endereco = novo_numero
+            self._atualizar_endereco()
 
     def get_endereco(self) -> str:
         return self._endereco
@@ -98,6 +111,13 @@ class Pessoa(ABC):
         """
         Consulta a API externa e atualiza o endereço completo da pessoa.
 
-        Otimizado para evitar chamada se o endereço já estiver preenchido.
+        Chamado na criação de uma nova pessoa e quando o CEP ou o número do endereço mudam.
+        Se a API estiver indisponível e o CEP não mudou, mantém o endereço atual com o novo número.
         """
-        self._endereco = API.buscar_endereco_por_cep(self._cep, self._numero_endereco)
\ No newline at end of file
+        try:
+            self._endereco = API.buscar_endereco_por_cep(self._cep, self._numero_endereco)
+        except ServicoIndisponivelError:
+            endereco = API.recompor_endereco(self._endereco, self._cep, self._numero_endereco)
+            if endereco is None:
+                raise
+            self._endereco = endereco
\ No newline at end of file
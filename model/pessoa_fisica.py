@@ -18,7 +18,8 @@ class PessoaFisica(Pessoa):
         numero_endereco: str,
         endereco: str,
         telefone: str,
-        data_nascimento: str | datetime
+        data_nascimento: str | datetime,
+        consultar_endereco: bool = True
     ):
         """
         Inicializa uma Pessoa Física com os dados pessoais fornecidos.
@@ -32,7 +33,9 @@ class PessoaFisica(Pessoa):
         if erros:
             raise ValueError("\n".join(erros))
 
-        super().__init__(nome, email, numero_documento, cep, numero_endereco, telefone, endereco)
+        super().__init__(
+            nome, email, numero_documento, cep, numero_endereco, telefone, endereco, consultar_endereco
+        )
 
         self._data_nascimento = (
             datetime.strptime(data_nascimento, "%d/%m/%Y")
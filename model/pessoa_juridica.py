@@ -17,7 +17,8 @@ class PessoaJuridica(Pessoa):
         numero_endereco: str,
         endereco: str,
         telefone: str,
-        nome_fantasia: str = ""
+        nome_fantasia: str = "",
+        consultar_endereco: bool = True
     ):
         """
         Inicializa a pessoa jurídica com os dados obrigatórios e nome fantasia opcional.
@@ -31,7 +32,9 @@ class PessoaJuridica(Pessoa):
         if erros:
             raise ValueError("\n".join(erros))
 
-        super().__init__(nome, email, numero_documento, cep, numero_endereco, telefone, endereco)
+        super().__init__(
+            nome, email, numero_documento, cep, numero_endereco, telefone, endereco, consultar_endereco
+        )
         self._nome_fantasia = nome_fantasia
 
     def __str__(self) -> str:
@@ -0,0 +1,197 @@
+import re
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from utils.constantes import (
+    TRANSACAO_DEPOSITO,
+    TRANSACAO_ENVIO,
+    TRANSACAO_RECEBIMENTO,
+    TRANSACAO_TAXA,
+    TRANSACAO_RENDIMENTO,
+    TRANSACAO_ENCERRAMENTO,
+    TRANSACAO_OUTRA
+)
+
+
+# Efeito de cada tipo de transação sobre o saldo da conta
+_SINAL_POR_TIPO = {
+    TRANSACAO_DEPOSITO: 1,
+    TRANSACAO_RECEBIMENTO: 1,
+    TRANSACAO_RENDIMENTO: 1,
+    TRANSACAO_ENVIO: -1,
+    TRANSACAO_TAXA: -1,
+    TRANSACAO_ENCERRAMENTO: 0,
+    TRANSACAO_OUTRA: 0,
+}
+
+# Formatos do histórico legado em texto ("[AAAA-MM-DD HH:MM:SS] descrição")
+_VALOR = r"R\$ (-?\d+(?:\.\d+)?)"
+_PADROES_LEGADOS = [
+    (re.compile(rf"^Transferência de {_VALOR} para conta (\d+)$"), TRANSACAO_ENVIO),
+    (re.compile(rf"^Recebido {_VALOR} da conta (\d+)$"), TRANSACAO_RECEBIMENTO),
+    (re.compile(rf"^Depósito inicial de {_VALOR}$"), TRANSACAO_DEPOSITO),
+    (re.compile(rf"^Atualização mensal: taxa de manutenção de {_VALOR} cobrada\.$"), TRANSACAO_TAXA),
+    (re.compile(rf"^Atualização mensal: rendimento de {_VALOR} aplicado\.$"), TRANSACAO_RENDIMENTO),
+    (re.compile(r"^Conta encerrada$"), TRANSACAO_ENCERRAMENTO),
+]
+_DATA_LEGADA = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (.*)$")
+_FORMATO_DATA = "%Y-%m-%d %H:%M:%S"
+
+
+def para_centavos(valor: float) -> int:
+    """
+    Converte um valor em reais para centavos, arredondando para o centavo mais próximo.
+    """
+    return int(round(valor * 100))
+
+
+class Transacao(NamedTuple):
+    """
+    Registro de uma operação no histórico da conta.
+
+    Attributes:
+        timestamp (int | None): Momento da operação (segundos desde a época Unix).
+            None apenas em registros legados sem data.
+        tipo (str): Um dos tipos TRANSACAO_* de utils.constantes.
+        valor_centavos (int): Valor da operação, em centavos (sempre não-negativo).
+        contraparte (str | None): Número da outra conta, em transferências.
+        saldo_apos_centavos (int | None): Saldo da conta logo após a operação, em centavos.
+        descricao (str | None): Texto livre, usado apenas no tipo TRANSACAO_OUTRA.
+
+    É armazenada de forma compacta como lista:
+        [timestamp, tipo, valor_centavos, contraparte, saldo_apos_centavos(, descricao)]
+    """
+
+    timestamp: Optional[int]
+    tipo: str
+    valor_centavos: int = 0
+    contraparte: Optional[str] = None
+    saldo_apos_centavos: Optional[int] = None
+    descricao: Optional[str] = None
+
+    # === Conversões ===
+
+    def to_lista(self) -> list:
+        """
+        Retorna a forma compacta, serializável em JSON.
+        """
+        lista = [self.timestamp, self.tipo, self.valor_centavos, self.contraparte, self.saldo_apos_centavos]
+        if self.descricao is not None:
+            lista.append(self.descricao)
+        return lista
+
+    @staticmethod
+    def from_lista(lista: list) -> 'Transacao':
+        """
+        Reconstrói a transação a partir da forma compacta.
+
+        Raises:
+            ValueError: Se a lista não tiver o formato esperado.
+        """
+        if not isinstance(lista, (list, tuple)) or not 5 <= len(lista) <= 6:
+            raise ValueError(f"Registro de transação inválido: {lista!r}")
+        return Transacao(*lista)
+
+    # === Consultas ===
+
+    @property
+    def valor(self) -> float:
+        return self.valor_centavos / 100
+
+    @property
+    def saldo_apos(self) -> Optional[float]:
+        return None if self.saldo_apos_centavos is None else self.saldo_apos_centavos / 100
+
+    @property
+    def data_hora(self) -> Optional[datetime]:
+        return None if self.timestamp is None else datetime.fromtimestamp(self.timestamp)
+
+    @property
+    def efeito_centavos(self) -> int:
+        """
+        Variação do saldo causada pela operação, em centavos (negativa em débitos).
+        """
+        return _SINAL_POR_TIPO.get(self.tipo, 0) * self.valor_centavos
+
+    def e_transferencia(self) -> bool:
+        return self.tipo in (TRANSACAO_ENVIO, TRANSACAO_RECEBIMENTO)
+
+    def texto(self) -> str:
+        """
+        Descrição legível da operação, sem a data.
+        """
+        if self.tipo == TRANSACAO_ENVIO:
+            return f"Transferência de R$ {self.valor:.2f} para conta {self.contraparte}"
+        if self.tipo == TRANSACAO_RECEBIMENTO:
+            return f"Recebido R$ {self.valor:.2f} da conta {self.contraparte}"
+        if self.tipo == TRANSACAO_DEPOSITO:
+            return f"Depósito inicial de R$ {self.valor:.2f}"
+        if self.tipo == TRANSACAO_TAXA:
+            return f"Atualização mensal: taxa de manutenção de R$ {self.valor:.2f} cobrada."
+        if self.tipo == TRANSACAO_RENDIMENTO:
+            return f"Atualização mensal: rendimento de R$ {self.valor:.2f} aplicado."
+        if self.tipo == TRANSACAO_ENCERRAMENTO:
+            return "Conta encerrada"
+        return self.descricao or ""
+
+    def __str__(self) -> str:
+        """
+        Representação no formato do histórico: "[AAAA-MM-DD HH:MM:SS] descrição".
+        """
+        if self.timestamp is None:
+            return self.texto()
+        return f"[{self.data_hora.strftime(_FORMATO_DATA)}] {self.texto()}"
+
+    # === Migração do histórico legado ===
+
+    @staticmethod
+    def from_texto_legado(texto: str) -> 'Transacao':
+        """
+        Converte uma linha do histórico legado (texto livre) em Transacao, sem o saldo após.
+        Textos não reconhecidos são preservados como TRANSACAO_OUTRA.
+        """
+        timestamp = None
+        descricao = texto
+        correspondencia = _DATA_LEGADA.match(texto)
+        if correspondencia:
+            timestamp = int(datetime.strptime(correspondencia.group(1), _FORMATO_DATA).timestamp())
+            descricao = correspondencia.group(2)
+
+        for padrao, tipo in _PADROES_LEGADOS:
+            encontrado = padrao.match(descricao)
+            if encontrado:
+                grupos = encontrado.groups()
+                valor = para_centavos(float(grupos[0])) if grupos else 0
+                contraparte = grupos[1] if len(grupos) > 1 else None
+                return Transacao(timestamp, tipo, valor, contraparte)
+
+        return Transacao(timestamp, TRANSACAO_OUTRA, descricao=descricao)
+
+    @staticmethod
+    def migrar_historico(historico: list, saldo_atual: float) -> list['Transacao']:
+        """
+        Converte um histórico (legado em texto, compacto em listas ou já em Transacao)
+        para uma lista de Transacao.
+
+        Nas linhas legadas o saldo após cada operação é reconstruído de trás para frente,
+        partindo do saldo atual da conta.
+        """
+        transacoes = []
+        for item in historico:
+            if isinstance(item, Transacao):
+                transacoes.append(item)
+            elif isinstance(item, str):
+                transacoes.append(Transacao.from_texto_legado(item))
+            else:
+                transacoes.append(Transacao.from_lista(item))
+
+        saldo = para_centavos(saldo_atual)
+        for i in range(len(transacoes) - 1, -1, -1):
+            transacao = transacoes[i]
+            if transacao.saldo_apos_centavos is not None:
+                saldo = transacao.saldo_apos_centavos
+            else:
+                transacoes[i] = transacao._replace(saldo_apos_centavos=saldo)
+            saldo -= transacao.efeito_centavos
+
+        return transacoes
@@ -0,0 +1,473 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from utils.api import API
+from utils.cache_cep import CacheCEP
+from utils.cliente_http import ClienteHTTP, DisjuntorCircuito, ServicoIndisponivelError
+from utils.resolvedor_cep import ResolvedorCEP
+from utils.voo_unico import VooUnico
+
+
+RESPOSTA_VIACEP = {
+    "cep": "30130-130",
+    "logradouro": "Rua Rio Grande do Norte",
+    "bairro": "Santa Efigênia",
+    "localidade": "Belo Horizonte",
+    "uf": "MG"
+}
+
+
+class TestCacheCEP(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Cache de CEP ****************************
+        Cria um diretório temporário para o banco SQLite do cache.
+        *********************************************************************************
+        """
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.diretorio, "cache_cep.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_cache_persiste_entre_instancias(self):
+        """
+        /************************ Teste 1 ****************************
+        Verifica que um CEP guardado continua disponível para uma nova instância
+        (simulando o reinício do sistema) e que os contadores registram memória e disco.
+        *****************************************************************/
+        """
+        cache = CacheCEP(self.caminho)
+        cache.guardar("30130130", RESPOSTA_VIACEP)
+        self.assertEqual(cache.obter("30130130"), RESPOSTA_VIACEP)
+
+        reiniciado = CacheCEP(self.caminho)
+        self.assertEqual(reiniciado.obter("30130130"), RESPOSTA_VIACEP)
+        self.assertEqual(reiniciado.obter("30130130"), RESPOSTA_VIACEP)
+        self.assertIsNone(reiniciado.obter("01001000"))
+
+        estatisticas = reiniciado.estatisticas()
+        self.assertEqual(estatisticas["acertos_disco"], 1)
+        self.assertEqual(estatisticas["acertos_memoria"], 1)
+        self.assertEqual(estatisticas["falhas"], 1)
+
+    def test_cache_respeita_ttl(self):
+        """
+        /************************ Teste 2 ****************************
+        Verifica que respostas fora da validade não são usadas, exceto quando
+        o chamador aceita explicitamente uma resposta expirada.
+        *****************************************************************/
+        """
+        cache = CacheCEP(self.caminho, ttl=60)
+        with patch('utils.cache_cep.time.time', return_value=1000.0):
+            cache.guardar("30130130", RESPOSTA_VIACEP)
+
+        cache.limpar_memoria()
+        with patch('utils.cache_cep.time.time', return_value=1061.0):
+            self.assertIsNone(cache.obter("30130130"))
+            self.assertEqual(cache.obter("30130130", permitir_expirado=True), RESPOSTA_VIACEP)
+        self.assertEqual(cache.estatisticas()["expirados"], 1)
+
+    def test_cache_descarta_menos_usados(self):
+        """
+        /************************ Teste 3 ****************************
+        Verifica o descarte LRU ao exceder o limite de CEPs guardados.
+        *****************************************************************/
+        """
+        cache = CacheCEP(self.caminho, limite=2, limite_memoria=1)
+        agora = time.time()
+        with patch('utils.cache_cep.time.time', side_effect=[agora - 3, agora - 2, agora - 1, agora]):
+            cache.guardar("00000001", RESPOSTA_VIACEP)
+            cache.guardar("00000002", RESPOSTA_VIACEP)
+            cache.obter("00000001")                       # Passa a ser o mais recente
+            cache.guardar("00000003", RESPOSTA_VIACEP)    # Descarta 00000002
+
+        cache.limpar_memoria()
+        self.assertIsNotNone(cache.obter("00000001"))
+        self.assertIsNone(cache.obter("00000002"))
+        self.assertIsNotNone(cache.obter("00000003"))
+        self.assertEqual(cache.estatisticas()["descartados"], 1)
+
+
+class _ServidorViaCEP(BaseHTTPRequestHandler):
+    """
+    Servidor local que imita a API ViaCEP, com conexões keep-alive (HTTP/1.1).
+    Registra os CEPs consultados e o maior número de requisições simultâneas.
+    """
+    protocol_version = "HTTP/1.1"
+    atraso = 0.0
+    consultados = []
+    simultaneas = 0
+    maximo_simultaneas = 0
+    trava = threading.Lock()
+
+    def do_GET(self):
+        cls = _ServidorViaCEP
+        cep = self.path.strip("/").split("/")[1]
+        with cls.trava:
+            cls.consultados.append(cep)
+            cls.simultaneas += 1
+            cls.maximo_simultaneas = max(cls.maximo_simultaneas, cls.simultaneas)
+        time.sleep(cls.atraso)
+        with cls.trava:
+            cls.simultaneas -= 1
+
+        resposta = {"erro": True} if cep == "00000000" else dict(RESPOSTA_VIACEP, cep=cep)
+        corpo = json.dumps(resposta).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestClienteHTTP(unittest.TestCase):
+
+    def _resposta(self, status: int, dados: dict = None) -> MagicMock:
+        return MagicMock(status_code=status, json=MagicMock(return_value=dados or {}))
+
+    def test_reaproveita_conexoes_do_pool(self):
+        """
+        /************************ Teste 1 ****************************
+        Faz várias requisições a um servidor local e verifica que todas usam
+        a mesma conexão keep-alive, conforme as métricas do cliente.
+        *****************************************************************/
+        """
+        servidor = ThreadingHTTPServer(("127.0.0.1", 0), _ServidorViaCEP)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        cliente = ClienteHTTP()
+        try:
+            url = f"http://127.0.0.1:{servidor.server_address[1]}/ws/30130130/json/"
+            for _ in range(5):
+                self.assertEqual(cliente.get_json(url)["logradouro"], RESPOSTA_VIACEP["logradouro"])
+
+            estatisticas = cliente.estatisticas()
+            self.assertEqual(estatisticas["requisicoes"], 5)
+            self.assertEqual(estatisticas["conexoes_abertas"], 1)
+            self.assertEqual(estatisticas["conexoes_reaproveitadas"], 4)
+        finally:
+            cliente.fechar()
+            servidor.shutdown()
+            servidor.server_close()
+
+    def test_repete_falhas_transitorias_com_timeout(self):
+        """
+        /************************ Teste 2 ****************************
+        Verifica que timeouts e respostas 5xx são repetidos com os timeouts configurados,
+        e que respostas 4xx não são repetidas.
+        *****************************************************************/
+        """
+        cliente = ClienteHTTP(timeout_conexao=1, timeout_leitura=2, tentativas=2, espera_base=0)
+        with patch.object(cliente._sessao, 'get', side_effect=[
+            requests.Timeout("lento"), self._resposta(503), self._resposta(200, {"ok": True})
+        ]) as mock_get:
+            self.assertEqual(cliente.get_json("https://exemplo/"), {"ok": True})
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], (1, 2))
+        self.assertEqual(cliente.estatisticas()["repeticoes"], 2)
+
+        with patch.object(cliente._sessao, 'get', return_value=self._resposta(400)) as mock_get:
+            with self.assertRaises(ValueError):
+                cliente.get_json("https://exemplo/")
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_disjuntor_abre_e_falha_rapido(self):
+        """
+        /************************ Teste 3 ****************************
+        Verifica que o disjuntor abre após falhas seguidas, recusa chamadas sem tocar
+        a rede enquanto aberto e fecha novamente após um teste bem-sucedido.
+        *****************************************************************/
+        """
+        disjuntor = DisjuntorCircuito(limite_falhas=2, tempo_recuperacao=60)
+        cliente = ClienteHTTP(tentativas=0, disjuntor=disjuntor)
+
+        with patch.object(cliente._sessao, 'get', side_effect=requests.ConnectionError("fora do ar")) as mock_get:
+            for _ in range(2):
+                with self.assertRaises(ServicoIndisponivelError):
+                    cliente.get_json("https://exemplo/")
+            self.assertEqual(disjuntor.get_estado(), DisjuntorCircuito.ABERTO)
+
+            with self.assertRaises(ServicoIndisponivelError):
+                cliente.get_json("https://exemplo/")
+            self.assertEqual(mock_get.call_count, 2)
+
+        with patch('utils.cliente_http.time.monotonic', return_value=time.monotonic() + 61), \
+             patch.object(cliente._sessao, 'get', return_value=self._resposta(200, {"ok": True})):
+            self.assertEqual(cliente.get_json("https://exemplo/"), {"ok": True})
+        self.assertEqual(disjuntor.get_estado(), DisjuntorCircuito.FECHADO)
+        self.assertEqual(cliente.estatisticas()["disjuntor"]["recusadas"], 1)
+
+    def test_chamada_de_teste_sempre_concluida(self):
+        """
+        /************************ Teste 4 ****************************
+        Verifica que a chamada de teste do disjuntor meio-aberto é concluída mesmo quando a
+        requisição termina com um erro que não é de conexão nem timeout: o disjuntor volta a
+        abrir, em vez de ficar recusando todas as chamadas.
+        *****************************************************************/
+        """
+        disjuntor = DisjuntorCircuito(limite_falhas=1, tempo_recuperacao=60)
+        cliente = ClienteHTTP(tentativas=0, disjuntor=disjuntor)
+        disjuntor.registrar_falha()
+
+        depois = time.monotonic() + 61
+        with patch('utils.cliente_http.time.monotonic', return_value=depois):
+            with patch.object(cliente._sessao, 'get', side_effect=requests.TooManyRedirects("laço")):
+                with self.assertRaises(ServicoIndisponivelError):
+                    cliente.get_json("https://exemplo/")
+            self.assertEqual(disjuntor.get_estado(), DisjuntorCircuito.ABERTO)
+
+        with patch('utils.cliente_http.time.monotonic', return_value=depois + 61):
+            with patch.object(cliente._sessao, 'get', side_effect=RuntimeError("inesperado")):
+                with self.assertRaises(RuntimeError):
+                    cliente.get_json("https://exemplo/")
+            self.assertEqual(disjuntor.get_estado(), DisjuntorCircuito.ABERTO)
+
+        with patch('utils.cliente_http.time.monotonic', return_value=depois + 122), \
+             patch.object(cliente._sessao, 'get', return_value=self._resposta(200, {"ok": True})):
+            self.assertEqual(cliente.get_json("https://exemplo/"), {"ok": True})
+        self.assertEqual(disjuntor.get_estado(), DisjuntorCircuito.FECHADO)
+
+
+class TestVooUnico(unittest.TestCase):
+
+    def _aguardar(self, condicao) -> None:
+        limite = time.monotonic() + 5
+        while not condicao():
+            self.assertLess(time.monotonic(), limite, "tempo esgotado")
+            time.sleep(0.001)
+
+    def test_threads_compartilham_resultado_e_erro(self):
+        """
+        /************************ Teste 1 ****************************
+        Dez threads pedem a mesma chave ao mesmo tempo: a função roda uma única vez
+        e todas recebem o mesmo resultado; depois, o mesmo vale para uma exceção.
+        *****************************************************************/
+        """
+        voo = VooUnico()
+        liberar = threading.Event()
+        chamadas = []
+
+        def buscar():
+            chamadas.append(1)
+            liberar.wait(5)
+            if len(chamadas) > 1:
+                raise ValueError("falhou")
+            return {"cep": "30130130"}
+
+        def rodar_em_threads(resultados: list) -> None:
+            def chamar():
+                try:
+                    resultados.append(voo.executar("30130130", buscar))
+                except ValueError as e:
+                    resultados.append(e)
+
+            threads = [threading.Thread(target=chamar) for _ in range(10)]
+            threads[0].start()
+            self._aguardar(lambda: voo.estatisticas()["em_andamento"] == 1)
+            agrupadas = voo.estatisticas()["agrupadas"]
+            for thread in threads[1:]:
+                thread.start()
+            self._aguardar(lambda: voo.estatisticas()["agrupadas"] == agrupadas + 9)
+            liberar.set()
+            for thread in threads:
+                thread.join()
+            liberar.clear()
+
+        resultados = []
+        rodar_em_threads(resultados)
+        self.assertEqual(len(chamadas), 1)
+        self.assertTrue(all(r is resultados[0] for r in resultados))
+
+        erros = []
+        rodar_em_threads(erros)
+        self.assertEqual(len(chamadas), 2)
+        self.assertEqual(len(erros), 10)
+        self.assertTrue(all(isinstance(e, ValueError) and e is erros[0] for e in erros))
+        self.assertEqual(voo.estatisticas(), {"executadas": 2, "agrupadas": 18, "em_andamento": 0})
+
+    def test_corrotinas_e_threads_agrupadas(self):
+        """
+        /************************ Teste 2 ****************************
+        Corrotinas e uma thread pedindo a mesma chave compartilham uma única execução.
+        *****************************************************************/
+        """
+        voo = VooUnico()
+        liberar = threading.Event()
+        chamadas = []
+
+        def buscar():
+            chamadas.append(1)
+            liberar.wait(5)
+            return "resultado"
+
+        async def principal():
+            tarefas = [asyncio.create_task(voo.executar_async("cep", buscar)) for _ in range(5)]
+            await asyncio.to_thread(self._aguardar, lambda: voo.estatisticas()["agrupadas"] == 4)
+            em_thread = asyncio.create_task(asyncio.to_thread(voo.executar, "cep", buscar))
+            await asyncio.to_thread(self._aguardar, lambda: voo.estatisticas()["agrupadas"] == 5)
+            liberar.set()
+            return await asyncio.gather(*tarefas, em_thread)
+
+        self.assertEqual(asyncio.run(principal()), ["resultado"] * 6)
+        self.assertEqual(len(chamadas), 1)
+
+
+class TestAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.cache = CacheCEP(os.path.join(self.diretorio, "cache_cep.db"))
+        self.http = ClienteHTTP(tentativas=0)
+        self.patchers = [patch.object(API, '_cache', self.cache), patch.object(API, '_http', self.http)]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_buscar_endereco_usa_cache(self):
+        """
+        /************************ Teste 1 ****************************
+        Verifica que apenas a primeira consulta de um CEP chega à API ViaCEP.
+        *****************************************************************/
+        """
+        resposta = MagicMock(status_code=200, json=MagicMock(return_value=RESPOSTA_VIACEP))
+        with patch.object(self.http._sessao, 'get', return_value=resposta) as mock_get:
+            primeiro = API.buscar_endereco_por_cep("30130-130", "1120")
+            segundo = API.buscar_endereco_por_cep("30130130", "15")
+
+        self.assertEqual(primeiro, "Rua Rio Grande do Norte, 1120 - Santa Efigênia, Belo Horizonte - MG, 30130130")
+        self.assertTrue(segundo.startswith("Rua Rio Grande do Norte, 15 -"))
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_api_indisponivel_usa_alternativas(self):
+        """
+        /************************ Teste 2 ****************************
+        Com a API fora do ar, usa a resposta expirada do cache; sem cache, a Pessoa
+        mantém o endereço atual (mesmo CEP) com o novo número.
+        *****************************************************************/
+        """
+        from model.pessoa_fisica import PessoaFisica
+
+        with patch('utils.cache_cep.time.time', return_value=0.0):
+            self.cache.guardar("30130130", RESPOSTA_VIACEP)
+
+        with patch.object(self.http._sessao, 'get', side_effect=requests.ConnectionError("fora do ar")):
+            self.assertTrue(API.buscar_endereco_por_cep("30130130", "7").startswith("Rua Rio Grande do Norte, 7 -"))
+
+            with self.assertRaises(ServicoIndisponivelError):
+                API.buscar_endereco_por_cep("01001000", "1")
+
+            pessoa = PessoaFisica(
+                "Ana Souza", "ana@email.com", "52998224725", "01001000", "10",
+                "Praça da Sé, 10 - Sé, São Paulo - SP, 01001000", "31999998888", "01/01/1990",
+                consultar_endereco=False
+            )
+            pessoa.set_numero_endereco("20")
+            self.assertEqual(pessoa.get_endereco(), "Praça da Sé, 20 - Sé, São Paulo - SP, 01001000")
+
+
+class TestResolvedorCEP(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Resolução em Lote ****************************
+        Sobe um servidor local no lugar da ViaCEP e aponta a classe API para ele,
+        com cache e cliente HTTP próprios do teste.
+        ***************************************************************************************
+        """
+        _ServidorViaCEP.consultados = []
+        _ServidorViaCEP.maximo_simultaneas = 0
+        _ServidorViaCEP.atraso = 0.05
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _ServidorViaCEP)
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+        self.diretorio = tempfile.mkdtemp()
+        self.cache = CacheCEP(os.path.join(self.diretorio, "cache_cep.db"))
+        self.http = ClienteHTTP(tentativas=0)
+        url = f"http://127.0.0.1:{self.servidor.server_address[1]}/ws/{{cep}}/json/"
+        self.patchers = [
+            patch.object(API, '_cache', self.cache),
+            patch.object(API, '_http', self.http),
+            patch('utils.api.URL_VIACEP', url)
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.http.fechar()
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_resolve_lote_sem_repetir_ceps(self):
+        """
+        /************************ Teste 1 ****************************
+        Verifica que CEPs repetidos (com e sem máscara) geram uma única consulta,
+        que erros ficam associados ao CEP e que o lote preenche o cache.
+        *****************************************************************/
+        """
+        resultados = ResolvedorCEP().resolver_em_lote(["30130-130", "30130130", "01001000", "00000000", "01001-000"])
+
+        self.assertEqual(list(resultados), ["30130130", "01001000", "00000000"])
+        self.assertEqual(sorted(_ServidorViaCEP.consultados), ["00000000", "01001000", "30130130"])
+        self.assertEqual(resultados["01001000"]["cep"], "01001000")
+        self.assertIn("CEP não encontrado", resultados["00000000"])
+
+        self.assertEqual(self.cache.obter("30130130")["cep"], "30130130")
+        self.assertTrue(API.buscar_endereco_por_cep("01001000", "5").startswith("Rua Rio Grande do Norte, 5 -"))
+        self.assertEqual(len(_ServidorViaCEP.consultados), 3)
+
+    def test_limita_consultas_simultaneas(self):
+        """
+        /************************ Teste 2 ****************************
+        Verifica que o lote é consultado em paralelo, sem ultrapassar a concorrência configurada.
+        *****************************************************************/
+        """
+        ceps = [f"3013{i:04d}" for i in range(8)]
+        resultados = ResolvedorCEP(concorrencia=3).resolver_em_lote(ceps)
+
+        self.assertEqual(len(resultados), 8)
+        self.assertEqual(len(_ServidorViaCEP.consultados), 8)
+        self.assertGreater(_ServidorViaCEP.maximo_simultaneas, 1)
+        self.assertLessEqual(_ServidorViaCEP.maximo_simultaneas, 3)
+
+    def test_consultas_simultaneas_do_mesmo_cep(self):
+        """
+        /************************ Teste 3 ****************************
+        Várias telas cadastrando clientes do mesmo CEP ao mesmo tempo (threads, como
+        no asyncio.to_thread da TelaCadastro) geram uma única requisição à API.
+        *****************************************************************/
+        """
+        _ServidorViaCEP.atraso = 0.2
+        enderecos = []
+
+        threads = [
+            threading.Thread(target=lambda n=n: enderecos.append(API.buscar_endereco_por_cep("30130130", str(n))))
+            for n in range(1, 9)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(enderecos), 8)
+        self.assertEqual(_ServidorViaCEP.consultados, ["30130130"])
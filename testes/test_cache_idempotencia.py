@@ -0,0 +1,42 @@
+import unittest
+from unittest.mock import patch
+
+from utils.cache_idempotencia import CacheIdempotencia, ChaveIdempotenciaReutilizadaError
+
+
+class TestCacheIdempotencia(unittest.TestCase):
+
+    def test_validade_limite_e_impressao(self):
+        """
+        /************************ Teste 1 ****************************
+        Verifica que uma chave repetida devolve o resultado guardado sem executar de novo,
+        que a chave com outros dados é recusada e que as chaves expiram pelo TTL e são
+        descartadas, das mais antigas para as mais novas, ao exceder o limite.
+        *****************************************************************/
+        """
+        cache = CacheIdempotencia(ttl=60, limite=2)
+        execucoes = []
+
+        def operacao(valor):
+            execucoes.append(valor)
+            return {"sucesso": True, "valor": valor}
+
+        with patch('utils.cache_idempotencia.time.time', return_value=1000.0):
+            self.assertEqual(cache.executar("a", 1, lambda: operacao(1))["valor"], 1)
+            self.assertEqual(cache.executar("a", 1, lambda: operacao(99))["valor"], 1)
+            with self.assertRaises(ChaveIdempotenciaReutilizadaError):
+                cache.executar("a", 2, lambda: operacao(2))
+            cache.executar("b", 1, lambda: operacao(3), guardar_se=lambda r: False)
+            cache.executar("b", 1, lambda: operacao(4))     # Resultado anterior não guardado: executa
+        self.assertEqual(execucoes, [1, 3, 4])
+
+        with patch('utils.cache_idempotencia.time.time', return_value=1030.0):
+            cache.executar("c", 1, lambda: operacao(5))     # Excede o limite: descarta "a"
+            self.assertIsNone(cache.obter("a"))
+        with patch('utils.cache_idempotencia.time.time', return_value=1061.0):
+            self.assertIsNone(cache.obter("b"))             # Expirada
+            self.assertIsNotNone(cache.obter("c"))
+
+        estatisticas = cache.estatisticas()
+        self.assertEqual((estatisticas["executadas"], estatisticas["repetidas"]), (4, 1))
+        self.assertEqual((estatisticas["descartadas"], estatisticas["expiradas"], estatisticas["guardadas"]), (1, 1, 1))
@@ -0,0 +1,223 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from dao.livro_razao import LivroRazao
+from dao.repositorio import Repositorio
+from controller.pagamento_controller import PagamentoController
+from utils import cnab240
+from utils.constantes import ARQUIVO_CONTAS, ARQUIVO_CLIENTES, ARQUIVO_PESSOAS
+
+
+def _montar_remessa(lotes: list) -> list:
+    """
+    Monta os registros de uma remessa com um lote por item de `lotes`:
+    (cnpj, conta, [(favorecido, centavos, movimento)]).
+    """
+    registros = [cnab240.gerar_header_arquivo("001", lotes[0][0], lotes[0][1], "EMPRESA MOCK", 1)]
+    for numero_lote, (cnpj, conta, pagamentos) in enumerate(lotes, 1):
+        registros.append(cnab240.gerar_header_lote("001", numero_lote, cnpj, conta, "EMPRESA MOCK"))
+        for sequencial, (favorecido, centavos, movimento) in enumerate(pagamentos, 1):
+            registros.append(cnab240.gerar_pagamento("001", numero_lote, sequencial, favorecido, "FAVORECIDO",
+                                                     centavos, f"PAG{sequencial}", movimento=movimento))
+        registros.append(cnab240.gerar_trailer_lote("001", numero_lote, len(pagamentos) + 2,
+                                                    sum(p[1] for p in pagamentos)))
+    registros.append(cnab240.gerar_trailer_arquivo("001", len(lotes), len(registros) + 1))
+    return registros
+
+
+class TestLeituraCNAB240(unittest.TestCase):
+
+    def test_registros_gerados_e_lidos(self):
+        """
+        /************************ Teste 1 ****************************
+        Gera uma remessa e a lê de volta: header de lote e segmento A trazem os campos
+        gravados, a estrutura confere e o retorno marca só as posições de ocorrência.
+        *****************************************************************/
+        """
+        registros = _montar_remessa([("11222333000181", "3001", [("1001", 12345, "0"), ("2002", 1, "9")])])
+        self.assertTrue(all(len(r) == cnab240.TAMANHO_REGISTRO for r in registros))
+        self.assertEqual([cnab240.tipo_registro(r) for r in registros], ["0", "1", "3", "3", "5", "9"])
+        self.assertEqual(cnab240.validar_estrutura(io.StringIO("\r\n".join(registros))), 6)
+
+        self.assertEqual(cnab240.ler_lote(registros[1]),
+                         cnab240.LoteCNAB(lote=1, cnpj="11222333000181", conta="3001", nome_empresa="EMPRESA MOCK"))
+        pagamento = cnab240.ler_pagamento(registros[3])
+        self.assertEqual((pagamento.sequencial, pagamento.movimento, pagamento.conta_favorecido,
+                          pagamento.seu_numero, pagamento.valor_centavos), (2, "9", "2002", "PAG2", 1))
+
+        retorno = cnab240.marcar_retorno(registros[2], cnab240.OCORRENCIA_SALDO_INSUFICIENTE)
+        self.assertEqual((retorno[:230], retorno[230:].rstrip()), (registros[2][:230], "01"))
+        self.assertEqual(cnab240.marcar_retorno(registros[0])[142], cnab240.CODIGO_RETORNO)
+        self.assertEqual(cnab240.marcar_retorno(registros[5], "00"), registros[5])
+
+    def test_estruturas_invalidas(self):
+        """
+        /************************ Teste 2 ****************************
+        validar_estrutura recusa registros com tamanho errado, detalhes fora de lote,
+        valores não numéricos e quantidades de trailer que não conferem.
+        *****************************************************************/
+        """
+        registros = _montar_remessa([("11222333000181", "3001", [("1001", 100, "0")])])
+        casos = {
+            "tamanho": registros[:2] + [registros[2][:-1]] + registros[3:],
+            "fora_de_lote": [registros[0], registros[2]] + registros[3:],
+            "valor": registros[:2] + [registros[2][:119] + "X" * 15 + registros[2][134:]] + registros[3:],
+            "trailer_lote": registros[:3] + [registros[3][:17] + "000009" + registros[3][23:]] + registros[4:],
+            "sem_trailer_arquivo": registros[:-1],
+        }
+        for caso, linhas in casos.items():
+            with self.subTest(caso=caso):
+                with self.assertRaises(cnab240.ArquivoCNABInvalidoError):
+                    cnab240.validar_estrutura(io.StringIO("\n".join(linhas)))
+
+
+class TestRemessaCNAB240(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Remessa CNAB 240 ****************************
+        Monta uma base com uma empresa (CNPJ com máscara) e uma pessoa física em diretório temporário.
+        *******************************************************************************************
+        """
+        self.diretorio_original = os.getcwd()
+        self.diretorio_temp = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.diretorio_temp, "database"))
+        os.chdir(self.diretorio_temp)
+
+        self.patcher = patch('utils.api.API.buscar_endereco_por_cep', return_value="Rua Mock, 10")
+        self.patcher.start()
+
+        base = {
+            ARQUIVO_PESSOAS: [
+                {"nome": "Empresa Mock LTDA", "email": "empresa@email.com", "numero_documento": "11.222.333/0001-81",
+                 "cep": "30130130", "numero_endereco": "10", "endereco": "Rua Mock, 10",
+                 "telefone": "3133334444", "tipo": "juridica", "nome_fantasia": "Mock"},
+                {"nome": "Ana Souza", "email": "ana@email.com", "numero_documento": "12345678900",
+                 "cep": "30130130", "numero_endereco": "10", "endereco": "Rua Mock, 10",
+                 "telefone": "31999998888", "tipo": "fisica", "data_nascimento": "01/01/1990"}
+            ],
+            ARQUIVO_CLIENTES: [
+                {"numero_documento": "11.222.333/0001-81", "senha": "123", "contas": ["3001"]},
+                {"numero_documento": "12345678900", "senha": "456", "contas": ["1001", "1002"]}
+            ],
+            ARQUIVO_CONTAS: [
+                {"numero": "3001", "saldo": 1000.0, "ativa": True, "tipo": "corrente"},
+                {"numero": "1001", "saldo": 0.0, "ativa": True, "tipo": "corrente"},
+                {"numero": "1002", "saldo": 0.0, "ativa": False, "tipo": "corrente"}
+            ]
+        }
+        for arquivo, dados in base.items():
+            with open(os.path.join("database", arquivo), "w", encoding="utf-8") as f:
+                json.dump(dados, f)
+
+        Repositorio.limpar()
+
+    def tearDown(self):
+        Repositorio.limpar()
+        self.patcher.stop()
+        os.chdir(self.diretorio_original)
+        shutil.rmtree(self.diretorio_temp, ignore_errors=True)
+
+    def _gravar_remessa(self, caminho: str, lotes: list) -> None:
+        with open(caminho, "w", encoding="latin-1", newline="") as f:
+            f.writelines(r + "\r\n" for r in _montar_remessa(lotes))
+
+    def test_remessa_gera_retorno_com_ocorrencias(self):
+        """
+        /************************ Teste 1 ****************************
+        Processa uma remessa com dois lotes: no primeiro, cada segmento A vira uma
+        transferência (ou recebe o código de rejeição FEBRABAN); o segundo informa um CNPJ
+        que não é o dono da conta e é rejeitado por inteiro. O retorno repete cada registro
+        com a ocorrência nas posições 231-240.
+        *****************************************************************/
+        """
+        self._gravar_remessa("remessa.rem", [
+            ("11222333000181", "3001", [
+                ("1001", 40000, "0"),       # efetivado
+                ("1001", 50000, "0"),       # efetivado
+                ("1001", 20000, "0"),       # saldo insuficiente (restam 100,00)
+                ("9999", 100, "0"),         # favorecido inexistente
+                ("1002", 100, "0"),         # favorecido inativo
+                ("1001", 0, "0"),           # valor inválido
+                ("1001", 100, "9"),         # movimento não suportado
+            ]),
+            ("99888777000166", "3001", [("1001", 100, "0")])
+        ])
+
+        conta_dao = Repositorio.contas()
+        with patch.object(conta_dao._armazenamento, 'aplicar',
+                          wraps=conta_dao._armazenamento.aplicar) as gravacoes:
+            resultado = PagamentoController.processar_cnab240("remessa.rem", tamanho_bloco=4)
+
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual((resultado["processados"], resultado["efetivados"], resultado["rejeitados"]), (8, 2, 6))
+        self.assertEqual(gravacoes.call_count, 1)    # Um bloco com alterações; o segundo não alterou nada
+        self.assertEqual(resultado["arquivo_retorno"], "remessa_retorno.rem")
+
+        with open("remessa_retorno.rem", encoding="latin-1", newline="") as f:
+            retorno = [linha.rstrip("\r\n") for linha in f]
+        with open("remessa.rem", encoding="latin-1", newline="") as f:
+            remessa = [linha.rstrip("\r\n") for linha in f]
+        self.assertEqual(len(retorno), len(remessa))
+        self.assertEqual(retorno[0][142], cnab240.CODIGO_RETORNO)
+        self.assertEqual([linha[230:232] for linha in retorno if linha[7] == "3"],
+                         ["00", "00", "01", "AN", "AN", "AR", "AJ", "AE"])
+        self.assertEqual([linha[230:232] for linha in retorno if linha[7] == "1"], ["00", "AE"])
+        self.assertEqual([r[:230] for r in retorno[1:]], [r[:230] for r in remessa[1:]])
+
+        with open(os.path.join("database", ARQUIVO_CONTAS), encoding="utf-8") as f:
+            saldos = {r["numero"]: r["saldo"] for r in json.load(f)}
+        self.assertEqual(saldos, {"3001": 100.0, "1001": 900.0, "1002": 0.0})
+        self.assertEqual([t.tipo for t in LivroRazao(os.path.join("database", "historico")).ler("1001")],
+                         ["recebimento", "recebimento"])
+
+    def test_remessa_com_estrutura_invalida_nao_transfere(self):
+        """
+        /************************ Teste 2 ****************************
+        Uma remessa com trailer de lote inconsistente é recusada inteira na conferência de
+        estrutura, antes de qualquer transferência, e nenhum retorno é gerado.
+        *****************************************************************/
+        """
+        self._gravar_remessa("remessa.rem", [("11222333000181", "3001", [("1001", 100, "0")])])
+        with open("remessa.rem", encoding="latin-1", newline="") as f:
+            registros = f.readlines()
+        registros[3] = registros[3][:17] + "000009" + registros[3][23:]    # Quantidade do trailer de lote
+        with open("remessa.rem", "w", encoding="latin-1", newline="") as f:
+            f.writelines(registros)
+
+        resultado = PagamentoController.processar_cnab240("remessa.rem")
+        self.assertFalse(resultado["sucesso"])
+        self.assertIn("lote", resultado["erros"][0])
+        self.assertFalse(os.path.exists("remessa_retorno.rem"))
+        self.assertEqual(Repositorio.contas().buscar_por_id("3001").get_saldo(), 1000.0)
+
+    def test_erro_no_processamento_nao_e_encoberto_pela_gravacao(self):
+        """
+        /************************ Teste 3 ****************************
+        Interrompe o processamento com um erro depois de um pagamento efetivado e faz falhar
+        também a gravação desse pagamento: o erro original é o propagado, e nenhum retorno
+        (nem arquivo temporário) fica no disco.
+        *****************************************************************/
+        """
+        self._gravar_remessa("remessa.rem", [("11222333000181", "3001", [("1001", 100, "0"), ("1001", 100, "0")])])
+        marcar_retorno = cnab240.marcar_retorno
+        chamadas = []
+
+        def falhar_no_segundo_pagamento(linha, ocorrencia):
+            if cnab240.tipo_registro(linha) == cnab240.REGISTRO_DETALHE:
+                chamadas.append(linha)
+                if len(chamadas) == 2:
+                    raise RuntimeError("falha inesperada")
+            return marcar_retorno(linha, ocorrencia)
+
+        with patch('utils.cnab240.marcar_retorno', side_effect=falhar_no_segundo_pagamento), \
+             patch('dao.unidade_de_trabalho._gravar_json_atomico', side_effect=OSError("disco cheio")):
+            with self.assertRaisesRegex(RuntimeError, "falha inesperada"):
+                PagamentoController.processar_cnab240("remessa.rem")
+
+        self.assertEqual(sorted(os.listdir(".")), ["database", "remessa.rem"])
@@ -0,0 +1,1473 @@
+import csv
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from dao.armazenamento import ArmazenamentoJournal
+from dao.livro_razao import LivroRazao
+from dao.conta_dao import ContaDAO
+from dao import fechamento_mensal
+from dao.fechamento_mensal import FechamentoMensal, np
+from dao.repositorio import Repositorio
+from dao.gravador_contas import GravadorContas
+from dao.unidade_de_trabalho import UnidadeDeTrabalho
+from dao import sequencia
+from dao import unidade_de_trabalho
+from dao.sequencia import SequenciaNumeros
+from controller.conta_controller import ContaController
+from controller.cadastro_controller import CadastroController
+from controller.auth_controller import AuthController
+from controller.perfil_controller import PerfilController
+from controller.pagamento_controller import PagamentoController
+from model.transacao import Transacao, para_centavos
+from model.exceptions import ContaInativaError
+from mapper.conta_mapper import ContaMapper
+from model.conta_corrente import ContaCorrente
+from model.conta_poupanca import ContaPoupanca
+
+from utils.constantes import (
+    BACKEND_JSON,
+    BACKEND_JOURNAL,
+    BACKEND_SQLITE,
+    ARQUIVO_CONTAS,
+    ARQUIVO_CLIENTES,
+    ARQUIVO_PESSOAS,
+    ARQUIVO_SQLITE,
+    DIRETORIO_UNIDADES_TRABALHO,
+    TIPO_CPOUPANCA,
+    TAXA_MANUTENCAO_CCORRENTE,
+    DURABILIDADE_SINCRONA,
+    DURABILIDADE_ASSINCRONA
+)
+
+
+class TestBackendsDAO(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de DAO ****************************
+        Cria um diretório temporário com uma pasta "database" contendo um contas.json
+        e muda o diretório de trabalho para ele, já que os DAOs usam caminhos relativos.
+        ***************************************************************************
+        """
+        self.diretorio_original = os.getcwd()
+        self.diretorio_temp = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.diretorio_temp, "database"))
+        os.chdir(self.diretorio_temp)
+
+        with open(os.path.join("database", ARQUIVO_CONTAS), "w", encoding="utf-8") as f:
+            json.dump([
+                {"numero": "1001", "saldo": 100.0, "historico": [], "ativa": True, "tipo": "corrente"},
+                {"numero": "1002", "saldo": 50.0, "historico": [], "ativa": True, "tipo": "poupanca"}
+            ], f)
+
+    def tearDown(self):
+        os.chdir(self.diretorio_original)
+        shutil.rmtree(self.diretorio_temp, ignore_errors=True)
+
+    def _criar_dao(self, backend: str) -> ContaDAO:
+        with patch('dao.armazenamento.BACKEND_ARMAZENAMENTO', backend):
+            return ContaDAO()
+
+    def test_operacoes_basicas_em_todos_backends(self):
+        """
+        /************************ Teste 1 ****************************
+        Executa o mesmo roteiro de salvar, buscar, atualizar e deletar em cada backend.
+
+        Garante que o ContaDAO funcione sem alterações em JSON, journal e SQLite.
+        *****************************************************************/
+        """
+        for numero, backend in (("3001", BACKEND_JSON), ("4001", BACKEND_SQLITE), ("5001", BACKEND_JOURNAL)):
+            with self.subTest(backend=backend):
+                dao = self._criar_dao(backend)
+
+                dao.salvar_objeto(ContaCorrente(numero, saldo=10.0))
+                self.assertEqual(dao.buscar_por_id(numero).get_saldo(), 10.0)
+
+                with self.assertRaises(ValueError):
+                    dao.salvar_objeto(ContaCorrente(numero))
+
+                self.assertTrue(dao.atualizar_objeto(ContaPoupanca(numero, saldo=25.0)))
+                self.assertIsInstance(dao.buscar_por_id(numero), ContaPoupanca)
+                self.assertEqual(dao.buscar_por_id(numero).get_saldo(), 25.0)
+
+                atualizadas = dao.atualizar_objetos([ContaCorrente(numero, saldo=30.0), ContaCorrente("9998")])
+                self.assertEqual([c.get_numero_conta() for c in atualizadas], [numero])
+                self.assertEqual(dao.buscar_por_id(numero).get_saldo(), 30.0)
+
+                self.assertTrue(dao.deletar_objeto(numero))
+                self.assertIsNone(dao.buscar_por_id(numero))
+                self.assertFalse(dao.deletar_objeto(numero))
+                self.assertFalse(dao.atualizar_objeto(ContaCorrente("9999")))
+
+    def test_sqlite_importa_json_e_grava_linha_a_linha(self):
+        """
+        /************************ Teste 2 ****************************
+        Verifica que o backend SQLite importa o JSON legado e atualiza apenas a linha alterada.
+
+        O arquivo JSON original não deve ser reescrito pelas operações no SQLite.
+        *****************************************************************/
+        """
+        dao = self._criar_dao(BACKEND_SQLITE)
+        self.assertEqual(len(dao.listar_todos_objetos()), 2)
+
+        mtime_json = os.path.getmtime(os.path.join("database", ARQUIVO_CONTAS))
+        dao.atualizar_objeto(ContaCorrente("1001", saldo=7.0))
+
+        self.assertEqual(dao.buscar_por_id("1001").get_saldo(), 7.0)
+        self.assertEqual(os.path.getmtime(os.path.join("database", ARQUIVO_CONTAS)), mtime_json)
+
+        conexao = sqlite3.connect(os.path.join("database", ARQUIVO_SQLITE))
+        plano = conexao.execute("EXPLAIN QUERY PLAN SELECT dados FROM contas WHERE id = '1001'").fetchall()
+        conexao.close()
+        self.assertTrue(any("USING INDEX" in linha[-1] or "PRIMARY KEY" in linha[-1] for linha in plano))
+
+    def test_journal_anexa_sem_reescrever_snapshot(self):
+        """
+        /************************ Teste 3 ****************************
+        Verifica que no modo journal cada alteração vira uma linha no log e que
+        uma nova instância reconstrói o estado a partir do snapshot + log.
+        *****************************************************************/
+        """
+        caminho = os.path.join("database", ARQUIVO_CONTAS)
+        mtime_snapshot = os.path.getmtime(caminho)
+
+        journal = ArmazenamentoJournal(caminho, "numero")
+        journal.atualizar({"numero": "1001", "saldo": 1.0, "historico": [], "ativa": True, "tipo": "corrente"})
+        journal.remover("1002")
+
+        self.assertEqual(os.path.getmtime(caminho), mtime_snapshot)
+        with open(caminho + ".journal", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        outra = ArmazenamentoJournal(caminho, "numero")
+        self.assertEqual([r["numero"] for r in outra.ler_todos()], ["1001"])
+        self.assertEqual(outra.buscar("1001")["saldo"], 1.0)
+
+    def test_journal_descarta_linha_incompleta_e_compacta(self):
+        """
+        /************************ Teste 4 ****************************
+        Simula uma escrita interrompida no final do log e verifica que ela é descartada
+        sem perder as operações anteriores; em seguida compacta o log em um novo snapshot.
+        *****************************************************************/
+        """
+        caminho = os.path.join("database", ARQUIVO_CONTAS)
+        journal = ArmazenamentoJournal(caminho, "numero")
+        journal.inserir({"numero": "1003", "saldo": 3.0, "historico": [], "ativa": True, "tipo": "corrente"})
+
+        with open(caminho + ".journal", "a", encoding="utf-8") as f:
+            f.write('{"op": "remover", "id": "10')
+
+        recuperado = ArmazenamentoJournal(caminho, "numero")
+        self.assertEqual(len(recuperado.ler_todos()), 3)
+
+        recuperado.compactar()
+        self.assertFalse(os.path.exists(caminho + ".journal"))
+        with open(caminho, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 3)
+        self.assertEqual(len(ArmazenamentoJournal(caminho, "numero").ler_todos()), 3)
+
+    def test_journal_corrompido_no_meio_nao_e_truncado(self):
+        """
+        /************************ Teste 5 ****************************
+        Uma linha inválida antes da última não é tratada como escrita interrompida: a leitura
+        falha e o log fica intacto, com as operações posteriores à linha inválida.
+        *****************************************************************/
+        """
+        caminho = os.path.join("database", ARQUIVO_CONTAS)
+        journal = ArmazenamentoJournal(caminho, "numero")
+        journal.inserir({"numero": "1003", "saldo": 3.0, "historico": [], "ativa": True, "tipo": "corrente"})
+        with open(caminho + ".journal", "a", encoding="utf-8") as f:
+            f.write('{"op": "remover", "id": "10\n{"op": "remover", "id": "1001"}\n')
+        with open(caminho + ".journal", "rb") as f:
+            conteudo = f.read()
+
+        with self.assertRaises(ValueError):
+            ArmazenamentoJournal(caminho, "numero").ler_todos()
+        with open(caminho + ".journal", "rb") as f:
+            self.assertEqual(f.read(), conteudo)
+
+
+class TestRepositorio(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Repositório ****************************
+        Monta uma base mínima (uma pessoa, um cliente e duas contas) em diretório temporário
+        e garante que o Repositorio comece vazio em cada teste.
+        ********************************************************************************
+        """
+        self.diretorio_original = os.getcwd()
+        self.diretorio_temp = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.diretorio_temp, "database"))
+        os.chdir(self.diretorio_temp)
+
+        self.patcher = patch('utils.api.API.buscar_endereco_por_cep', return_value="Rua Mock, 10")
+        self.patcher.start()
+
+        base = {
+            ARQUIVO_PESSOAS: [{
+                "nome": "Ana Souza", "email": "ana@email.com", "numero_documento": "12345678900",
+                "cep": "30130130", "numero_endereco": "10", "endereco": "Rua Mock, 10",
+                "telefone": "31999998888", "tipo": "fisica", "data_nascimento": "01/01/1990"
+            }],
+            ARQUIVO_CLIENTES: [{"numero_documento": "12345678900", "senha": "123", "contas": ["1001", "1002"]}],
+            ARQUIVO_CONTAS: [
+                {"numero": "1001", "saldo": 100.0, "historico": [], "ativa": True, "tipo": "corrente"},
+                {"numero": "1002", "saldo": 50.0, "historico": [], "ativa": True, "tipo": "poupanca"}
+            ]
+        }
+        for arquivo, dados in base.items():
+            with open(os.path.join("database", arquivo), "w", encoding="utf-8") as f:
+                json.dump(dados, f)
+
+        Repositorio.limpar()
+
+    def tearDown(self):
+        Repositorio.limpar()
+        self.patcher.stop()
+        os.chdir(self.diretorio_original)
+        shutil.rmtree(self.diretorio_temp, ignore_errors=True)
+
+    def test_mapa_de_identidade_compartilhado(self):
+        """
+        /************************ Teste 1 ****************************
+        Verifica que buscas repetidas retornam o mesmo objeto e que o Cliente
+        referencia as mesmas instâncias de Conta e Pessoa servidas pelos outros DAOs.
+        *****************************************************************/
+        """
+        cliente = Repositorio.clientes().buscar_por_id("12345678900")
+
+        self.assertIs(Repositorio.clientes().buscar_por_id("12345678900"), cliente)
+        self.assertIs(Repositorio.pessoas().buscar_por_id("12345678900"), cliente.pessoa)
+        self.assertIs(Repositorio.contas().buscar_por_id("1001"), cliente.contas[0])
+
+    def test_buscas_aquecidas_nao_leem_o_armazenamento(self):
+        """
+        /************************ Teste 2 ****************************
+        Depois do primeiro carregamento, buscas e listagens não devem ler o armazenamento,
+        e escritas devem atualizar apenas a entrada alterada do mapa de identidade.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        conta_dao.listar_todos_objetos()
+
+        with patch.object(conta_dao._armazenamento, 'ler_todos', side_effect=AssertionError("leitura")), \
+             patch.object(conta_dao._armazenamento, 'buscar', side_effect=AssertionError("leitura")):
+            conta = conta_dao.buscar_por_id("1001")
+            self.assertIsNone(conta_dao.buscar_por_id("7777"))
+            self.assertEqual(len(conta_dao.listar_todos_objetos()), 2)
+
+        conta_nova = ContaCorrente("1003", saldo=5.0)
+        conta_dao.salvar_objeto(conta_nova)
+        self.assertIs(conta_dao.buscar_por_id("1003"), conta_nova)
+        self.assertIs(conta_dao.buscar_por_id("1001"), conta)
+
+        conta_dao.deletar_objeto("1003")
+        self.assertIsNone(conta_dao.buscar_por_id("1003"))
+
+    def test_indice_reverso_conta_cliente(self):
+        """
+        /************************ Teste 3 ****************************
+        Verifica o índice numero_conta -> cliente: busca simples, busca em lote e
+        manutenção do índice ao atualizar e deletar o cliente.
+        *****************************************************************/
+        """
+        cliente_dao = Repositorio.clientes()
+        cliente = cliente_dao.buscar_por_id("12345678900")
+
+        self.assertIs(cliente_dao.buscar_cliente_por_numero_conta(1001), cliente)
+        self.assertEqual(
+            cliente_dao.buscar_clientes_por_numeros_conta(["1002", 9999]),
+            {"1002": cliente, "9999": None}
+        )
+
+        conta_nova = ContaCorrente("1003")
+        Repositorio.contas().salvar_objeto(conta_nova)
+        cliente.contas = [cliente.contas[0], conta_nova]
+        cliente_dao.atualizar_objeto(cliente)
+
+        self.assertIs(cliente_dao.buscar_cliente_por_numero_conta("1003"), cliente)
+        self.assertIsNone(cliente_dao.buscar_cliente_por_numero_conta("1002"))
+
+        cliente_dao.deletar_objeto("12345678900")
+        self.assertIsNone(cliente_dao.buscar_cliente_por_numero_conta("1001"))
+
+    def test_indices_unicos_de_pessoa(self):
+        """
+        /************************ Teste 4 ****************************
+        Verifica os índices únicos de e-mail e documento do PessoaDAO: consultas sem
+        diferenciar maiúsculas nem formatação, sem ler o armazenamento após o primeiro
+        carregamento; cadastros simultâneos com o mesmo e-mail aceitam apenas um; trocar
+        o e-mail libera o anterior.
+        *****************************************************************/
+        """
+        pessoa_dao = Repositorio.pessoas()
+        self.assertEqual(pessoa_dao.id_por_email(" ANA@Email.com "), "12345678900")
+        with patch.object(pessoa_dao._armazenamento, 'ler_todos', side_effect=AssertionError("leitura")):
+            self.assertEqual(pessoa_dao.id_por_documento("123.456.789-00"), "12345678900")
+            self.assertIsNone(pessoa_dao.id_por_email("outra@email.com"))
+
+        def dados(documento: str, email: str) -> dict:
+            return {
+                "nome": "Bruno Lima", "email": email, "numero_documento": documento, "cep": "30130130",
+                "numero_endereco": "20", "telefone": "31988887777", "tipo": "fisica",
+                "data_nascimento": "02/02/1992", "senha": "456"
+            }
+
+        self.assertEqual(CadastroController.cadastrar_cliente(dados("98765432100", "Ana@email.com"))["status"], "erro")
+
+        resultados = []
+        threads = [
+            threading.Thread(target=lambda d=d: resultados.append(CadastroController.cadastrar_cliente(d)))
+            for d in (dados(f"{i}" * 11, "bruno@email.com") for i in range(1, 7))
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sum(r["status"] == "sucesso" for r in resultados), 1)
+        self.assertEqual(sum(p["email"] == "bruno@email.com" for p in pessoa_dao._ler_dados_do_json()), 1)
+
+        pessoa = pessoa_dao.buscar_por_id("12345678900")
+        pessoa.set_email("ana.souza@email.com")
+        pessoa_dao.atualizar_objeto(pessoa)
+        self.assertIsNone(pessoa_dao.id_por_email("ana@email.com"))
+        self.assertEqual(pessoa_dao.id_por_email("Ana.Souza@email.com"), "12345678900")
+
+    def test_documento_canonico(self):
+        """
+        /************************ Teste 5 ****************************
+        Documentos gravados com formatação são migrados para a forma canônica (só dígitos)
+        ao abrir o repositório, e buscas e login aceitam o documento com ou sem formatação,
+        chegando ao mesmo objeto.
+        *****************************************************************/
+        """
+        for arquivo in (ARQUIVO_PESSOAS, ARQUIVO_CLIENTES):
+            caminho = os.path.join("database", arquivo)
+            with open(caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+            dados[0]["numero_documento"] = "123.456.789-00"
+            with open(caminho, "w", encoding="utf-8") as f:
+                json.dump(dados, f)
+        Repositorio.limpar()
+
+        cliente = Repositorio.clientes().buscar_por_id("123.456.789-00")
+        self.assertIs(Repositorio.clientes().buscar_por_id("12345678900"), cliente)
+        self.assertIs(Repositorio.pessoas().buscar_por_id(" 123 456 789 00"), cliente.pessoa)
+        for arquivo in (ARQUIVO_PESSOAS, ARQUIVO_CLIENTES):
+            with open(os.path.join("database", arquivo), encoding="utf-8") as f:
+                self.assertEqual(json.load(f)[0]["numero_documento"], "12345678900")
+
+        resultado = AuthController.login("123.456.789-00", "123")
+        self.assertEqual((resultado["status"], resultado["usuario_id"]), ("sucesso", "12345678900"))
+        self.assertIs(AuthController.sessao_ativa.pop("12345678900"), cliente)
+
+
+class TestLivroRazao(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Histórico ****************************
+        Cria um contas.json no formato antigo (histórico embutido) em diretório temporário.
+        ******************************************************************************
+        """
+        self.diretorio_original = os.getcwd()
+        self.diretorio_temp = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.diretorio_temp, "database"))
+        os.chdir(self.diretorio_temp)
+
+        with open(os.path.join("database", ARQUIVO_CONTAS), "w", encoding="utf-8") as f:
+            json.dump([
+                {"numero": "1001", "saldo": 12.0, "ativa": True, "tipo": "corrente",
+                 "historico": ["[2025-06-24 17:54:39] Transferência de R$ 88.00 para conta 1002"]},
+                {"numero": "1002", "saldo": 88.0, "ativa": True, "tipo": "poupanca",
+                 "historico": ["[2025-06-24 17:54:39] Recebido R$ 88.00 da conta 1001"]}
+            ], f)
+
+        Repositorio.limpar()
+
+    def tearDown(self):
+        Repositorio.limpar()
+        os.chdir(self.diretorio_original)
+        shutil.rmtree(self.diretorio_temp, ignore_errors=True)
+
+    def test_migracao_e_acrescimo_no_historico(self):
+        """
+        /************************ Teste 1 ****************************
+        Migra os históricos embutidos para o livro-razão e verifica que uma transferência
+        apenas acrescenta linhas aos arquivos de histórico, sem gravá-lo no contas.json.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        self.assertEqual(conta_dao.migrar_historicos(), 2)
+        with open(os.path.join("database", ARQUIVO_CONTAS), encoding="utf-8") as f:
+            self.assertTrue(all("historico" not in registro for registro in json.load(f)))
+
+        origem, destino = conta_dao.buscar_por_id("1001"), conta_dao.buscar_por_id("1002")
+        origem.transferir(destino, 2.0)
+        conta_dao.atualizar_objeto(origem)
+        conta_dao.atualizar_objeto(destino)
+
+        caminho = os.path.join("database", "historico", "1001.jsonl")
+        with open(caminho, encoding="utf-8") as f:
+            linhas = f.read().splitlines()
+        self.assertEqual(len(linhas), 2)
+        self.assertEqual(json.loads(linhas[-1])[1:5], ["envio", 200, "1002", 1000])
+
+        Repositorio.limpar()
+        recarregada = Repositorio.contas().buscar_por_id("1002")
+        self.assertEqual([t.tipo for t in recarregada.get_transacoes()], ["recebimento", "recebimento"])
+
+    def test_saldo_e_transferencia_nao_leem_historico(self):
+        """
+        /************************ Teste 2 ****************************
+        Consultas de saldo e transferências não devem carregar o histórico;
+        ele só é lido quando o extrato é pedido.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        conta_dao.migrar_historicos()
+
+        origem, destino = conta_dao.buscar_por_id("1001"), conta_dao.buscar_por_id("1002")
+
+        with patch.object(origem, '_carregador_historico', side_effect=AssertionError("histórico lido")), \
+             patch.object(destino, '_carregador_historico', side_effect=AssertionError("histórico lido")):
+            self.assertEqual(origem.get_saldo(), 12.0)
+            origem.transferir(destino, 1.0)
+            conta_dao.atualizar_objeto(origem)
+            conta_dao.atualizar_objeto(destino)
+
+        self.assertEqual(len(origem.get_transacoes()), 2)
+
+    def test_linha_incompleta_no_historico(self):
+        """
+        /************************ Teste 3 ****************************
+        Uma escrita interrompida no final do arquivo de histórico é ignorada na leitura
+        e descartada antes do próximo acréscimo.
+        *****************************************************************/
+        """
+        livro = LivroRazao(os.path.join("database", "historico"))
+        conta = ContaCorrente("1001", saldo=10.0)
+        conta.encerrar_conta()
+        livro.anexar("1001", conta._transacoes_pendentes())
+
+        with open(livro.caminho("1001"), "a", encoding="utf-8") as f:
+            f.write('[1750787679,"env')
+
+        self.assertEqual(len(livro.ler("1001")), 1)
+        livro.anexar("1001", conta._transacoes_pendentes())
+        self.assertEqual([t.tipo for t in livro.ler("1001")], ["encerramento", "encerramento"])
+
+    def test_extrato_paginado_de_tras_para_frente(self):
+        """
+        /************************ Teste 4 ****************************
+        Percorre um histórico longo em páginas (lido em blocos pequenos, a partir do final)
+        e verifica que as páginas, unidas, formam o histórico completo em ordem inversa.
+        Verifica também os filtros por tipo e data e as operações ainda não gravadas.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        conta_dao.migrar_historicos()
+        historico = [
+            Transacao(1_700_000_000 + i, "recebimento" if i % 3 else "envio", 100 + i, "1002", 10_000 + i)
+            for i in range(500)
+        ]
+        conta_dao._livro_razao.substituir("1001", historico)
+
+        conta = conta_dao.buscar_por_id("1001")
+        conta.encerrar_conta()      # Pendente (não gravada)
+        conta._ativa = True
+        pendente = conta._transacoes_pendentes()[0]
+
+        lidas, cursor, paginas = [], None, 0
+        with patch('dao.livro_razao.BLOCO_LEITURA_HISTORICO', 256), \
+             patch.object(conta, '_carregador_historico', side_effect=AssertionError("histórico completo lido")):
+            while True:
+                extrato, erro = ContaController.obter_extrato("1001", limite=7, cursor=cursor)
+                self.assertIsNone(erro)
+                lidas.extend(extrato["transacoes"])
+                paginas += 1
+                cursor = extrato["cursor"]
+                if cursor is None:
+                    break
+
+            self.assertEqual(lidas, [pendente] + historico[::-1])
+            self.assertEqual(paginas, 72)
+
+            extrato, _ = ContaController.obter_extrato(
+                "1001", limite=50, tipo="envio", desde=datetime.fromtimestamp(1_700_000_000 + 450)
+            )
+            self.assertEqual([t.timestamp - 1_700_000_000 for t in extrato["transacoes"]],
+                             list(range(498, 449, -3)))
+            self.assertIsNone(extrato["cursor"])
+
+    def test_saldo_em_com_pontos_de_controle(self):
+        """
+        /************************ Teste 5 ****************************
+        Grava um histórico de três meses em lotes e verifica os pontos de controle
+        (a cada N transações e na virada do mês) e que saldo_em, partindo do ponto de
+        controle mais próximo, coincide com a reaplicação completa do histórico.
+        *****************************************************************/
+        """
+        inicio = int(datetime(2025, 1, 1).timestamp())
+        transacoes, saldo = [], 0
+        for i in range(900):
+            efeito = 500 if i % 4 else -300
+            saldo += efeito
+            transacoes.append(Transacao(inicio + i * 3 * 3600, "recebimento" if efeito > 0 else "envio",
+                                        abs(efeito), "1002", saldo))
+
+        with patch('dao.livro_razao.CHECKPOINT_INTERVALO', 100):
+            livro = LivroRazao(os.path.join("database", "historico"))
+            for i in range(0, 600, 50):
+                livro.anexar("1001", transacoes[i:i + 50])
+            # Nova instância (novo processo): retoma a contagem a partir do último ponto de controle
+            livro = LivroRazao(os.path.join("database", "historico"))
+            for i in range(600, 900, 50):
+                livro.anexar("1001", transacoes[i:i + 50])
+
+        with open(livro.caminho_checkpoints("1001"), "rb") as f:
+            quantidade = len(f.read()) // 32
+        # Viradas de mês nas transações 248, 472 e 720; a contagem recomeça a cada ponto de controle
+        self.assertEqual(quantidade, 10)
+
+        def saldo_reaplicando(momento):
+            anteriores = [t for t in transacoes if t.timestamp <= momento]
+            return anteriores[-1].saldo_apos_centavos if anteriores else 0
+
+        lidas = []
+        ler_adiante = livro._ler_adiante
+
+        def contar_lidas(f, posicao):
+            for item in ler_adiante(f, posicao):
+                lidas.append(item)
+                yield item
+
+        with patch.object(livro, '_ler_adiante', side_effect=contar_lidas):
+            for momento in [inicio - 1, inicio, int(datetime(2025, 2, 1).timestamp()) - 1] + \
+                           list(range(inicio + 1800, inicio + 900 * 3 * 3600, 7919 * 3)):
+                lidas.clear()
+                self.assertEqual(livro.saldo_em("1001", momento), saldo_reaplicando(momento))
+                self.assertLessEqual(len(lidas), 101)
+
+        self.assertIsNone(livro.saldo_em("9999", inicio))
+
+        extrato_fim_janeiro, _ = ContaController.saldo_em("1001", datetime(2025, 1, 31, 23, 59, 59))
+        self.assertIsNotNone(extrato_fim_janeiro)
+
+    def test_extrato_com_mais_pendentes_que_o_limite(self):
+        """
+        /************************ Teste 6 ****************************
+        Com gravação adiada, deixa mais transações não gravadas do que cabem numa página:
+        as páginas, unidas, trazem cada transação uma única vez, da mais recente para a
+        mais antiga, e as pendentes são gravadas no histórico antes da primeira página.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        conta_dao.migrar_historicos()
+        origem, destino = conta_dao.buscar_por_id("1001"), conta_dao.buscar_por_id("1002")
+        gravador = GravadorContas(conta_dao, DURABILIDADE_ASSINCRONA, intervalo=60, limite_sujas=10_000)
+        try:
+            for _ in range(10):
+                gravador.transferir(origem, destino, 1.0)
+            esperadas = (conta_dao._livro_razao.ler("1001") + origem._transacoes_pendentes())[::-1]
+
+            lidas, cursor, paginas = [], None, 0
+            while True:
+                extrato, erro = ContaController.obter_extrato("1001", limite=4, cursor=cursor)
+                self.assertIsNone(erro)
+                lidas.extend(extrato["transacoes"])
+                paginas += 1
+                cursor = extrato["cursor"]
+                if cursor is None:
+                    break
+        finally:
+            gravador.fechar()
+
+        self.assertEqual(lidas, esperadas)
+        self.assertEqual(paginas, 3)
+        self.assertEqual(origem._transacoes_pendentes(), [])
+        self.assertEqual(len(conta_dao._livro_razao.ler("1001")), 11)
+
+
+
+class _BasePagamentos(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Pagamentos ****************************
+        Monta uma base com dois clientes e quatro contas (uma delas inativa) em diretório temporário.
+        *******************************************************************************************
+        """
+        self.diretorio_original = os.getcwd()
+        self.diretorio_temp = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.diretorio_temp, "database"))
+        os.chdir(self.diretorio_temp)
+
+        self.patcher = patch('utils.api.API.buscar_endereco_por_cep', return_value="Rua Mock, 10")
+        self.patcher.start()
+
+        pessoa = {
+            "nome": "Ana Souza", "email": "ana@email.com", "numero_documento": "12345678900",
+            "cep": "30130130", "numero_endereco": "10", "endereco": "Rua Mock, 10",
+            "telefone": "31999998888", "tipo": "fisica", "data_nascimento": "01/01/1990"
+        }
+        base = {
+            ARQUIVO_PESSOAS: [pessoa, dict(pessoa, nome="Bruno Lima", email="bruno@email.com",
+                                           numero_documento="98765432100")],
+            ARQUIVO_CLIENTES: [
+                {"numero_documento": "12345678900", "senha": "123", "contas": ["1001", "1002"]},
+                {"numero_documento": "98765432100", "senha": "456", "contas": ["2001", "2002"]}
+            ],
+            ARQUIVO_CONTAS: [
+                {"numero": "1001", "saldo": 1000.0, "ativa": True, "tipo": "corrente"},
+                {"numero": "1002", "saldo": 2000.0, "ativa": True, "tipo": "poupanca"},
+                {"numero": "2001", "saldo": 0.0, "ativa": True, "tipo": "corrente"},
+                {"numero": "2002", "saldo": 0.0, "ativa": False, "tipo": "corrente"}
+            ]
+        }
+        for arquivo, dados in base.items():
+            with open(os.path.join("database", arquivo), "w", encoding="utf-8") as f:
+                json.dump(dados, f)
+
+        Repositorio.limpar()
+
+    def tearDown(self):
+        Repositorio.limpar()
+        self.patcher.stop()
+        os.chdir(self.diretorio_original)
+        shutil.rmtree(self.diretorio_temp, ignore_errors=True)
+
+
+class TestLoteTransferencias(_BasePagamentos):
+
+    def test_lote_csv_valida_aplica_em_ordem_e_grava_por_bloco(self):
+        """
+        /************************ Teste 1 ****************************
+        Processa um CSV com linhas válidas e inválidas: as inválidas são recusadas antes
+        de qualquer transferência, as válidas seguem as regras de processar_pagamento na
+        ordem do arquivo (o saldo vai se esgotando) e as contas são gravadas por bloco.
+        *****************************************************************/
+        """
+        with open("folha.csv", "w", encoding="utf-8") as f:
+            f.write(
+                "conta_origem;conta_destino;valor;documento_destino\n"
+                "1001;2001;400,00;987.654.321-00\n"  # 1: aceita (documento formatado)
+                "1001;2001;400.00;\n"                # 2: aceita
+                "1001;2001;300;\n"                   # 3: saldo insuficiente (restam 200)
+                "1001;2001;0;\n"                     # 4: valor inválido
+                "1001;2001;10.005;\n"                # 5: mais de duas casas decimais
+                "1001;2001;50;12345678900\n"         # 6: documento não confere
+                "1001;1001;50;\n"                    # 7: mesma conta
+                "1001;9999;50;\n"                    # 8: destino inexistente
+                "1002;2001;1500;\n"                  # 9: acima do limite da poupança
+                "1001;2002;50;\n"                    # 10: destino inativo
+                "1002;1001;100;\n"                   # 11: aceita
+                "abc;2001;1;\n"                      # 12: número inválido
+            )
+
+        conta_dao = Repositorio.contas()
+        with patch.object(conta_dao._armazenamento, 'aplicar',
+                          wraps=conta_dao._armazenamento.aplicar) as gravacoes, \
+             patch.object(conta_dao._armazenamento, 'atualizar', side_effect=AssertionError("gravação por conta")):
+            resultado = PagamentoController.processar_lote("folha.csv", tamanho_bloco=2)
+
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual((resultado["processadas"], resultado["aceitas"], resultado["recusadas"]), (12, 3, 9))
+        self.assertEqual(gravacoes.call_count, 2)    # Blocos de 2 transferências válidas aplicadas
+
+        with open("folha_resultado.csv", encoding="utf-8") as f:
+            linhas = list(csv.DictReader(f, delimiter=";"))
+        self.assertEqual([l["status"] == "aceita" for l in linhas],
+                         [True, True] + [False] * 8 + [True, False])
+        self.assertIn("Saldo insuficiente", linhas[2]["mensagem"])
+        self.assertIn("não pertence", linhas[5]["mensagem"])
+        self.assertIn("limite", linhas[8]["mensagem"])
+
+        with open(os.path.join("database", ARQUIVO_CONTAS), encoding="utf-8") as f:
+            saldos = {r["numero"]: r["saldo"] for r in json.load(f)}
+        self.assertEqual(saldos, {"1001": 300.0, "1002": 1900.0, "2001": 800.0, "2002": 0.0})
+        self.assertEqual([t.tipo for t in LivroRazao(os.path.join("database", "historico")).ler("1001")],
+                         ["envio", "envio", "recebimento"])
+
+    def test_lote_jsonl(self):
+        """
+        /************************ Teste 2 ****************************
+        Processa o mesmo tipo de lote em JSONL e grava o resultado em JSONL.
+        *****************************************************************/
+        """
+        with open("folha.jsonl", "w", encoding="utf-8") as f:
+            f.write(json.dumps({"conta_origem": "1001", "conta_destino": "2001", "valor": 150.5}) + "\n")
+            f.write(json.dumps({"conta_origem": 1002, "conta_destino": 2001, "valor": "49.5"}) + "\n")
+
+        resultado = PagamentoController.processar_lote("folha.jsonl", "saida.jsonl")
+        self.assertEqual(resultado["aceitas"], 2)
+        with open("saida.jsonl", encoding="utf-8") as f:
+            self.assertEqual([json.loads(l)["status"] for l in f], ["aceita", "aceita"])
+        self.assertEqual(Repositorio.contas().buscar_por_id("2001").get_saldo(), 200.0)
+
+    def test_pagamentos_simultaneos_conservam_o_total_gravado(self):
+        """
+        /************************ Teste 3 ****************************
+        Dispara pagamentos simultâneos, em várias threads, entre contas de dois clientes,
+        nos dois sentidos. Com as contas travadas durante a transferência e a gravação,
+        o total gravado no arquivo de contas não muda e cada transferência realizada
+        aparece exatamente duas vezes no livro-razão.
+        *****************************************************************/
+        """
+        rotas = [
+            dict(conta_origem_num=1001, doc_destino="98765432100", conta_destino_numero=2001, senha="123"),
+            dict(conta_origem_num=1002, doc_destino="98765432100", conta_destino_numero=2001, senha="123"),
+            dict(conta_origem_num=2001, doc_destino="12345678900", conta_destino_numero=1001, senha="456"),
+            dict(conta_origem_num=2001, doc_destino="12345678900", conta_destino_numero=1002, senha="456"),
+        ]
+        realizadas = []
+
+        def pagar(semente):
+            sorteio = random.Random(semente)
+            for _ in range(25):
+                resultado = PagamentoController.processar_pagamento(
+                    **sorteio.choice(rotas), valor=float(sorteio.randint(1, 200)), descricao=""
+                )
+                realizadas.append(resultado["sucesso"])
+
+        threads = [threading.Thread(target=pagar, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+        self.assertFalse(any(t.is_alive() for t in threads))
+        self.assertEqual(len(realizadas), 100)
+
+        with open(os.path.join("database", ARQUIVO_CONTAS), encoding="utf-8") as f:
+            self.assertEqual(sum(r["saldo"] for r in json.load(f)), 3000.0)
+        livro = LivroRazao(os.path.join("database", "historico"))
+        self.assertEqual(sum(len(livro.ler(n)) for n in ("1001", "1002", "2001")), 2 * sum(realizadas))
+
+    def test_falha_na_gravacao_recusa_o_pagamento(self):
+        """
+        /************************ Teste 4 ****************************
+        Se a gravação de um pagamento falhar, processar_pagamento devolve a recusa de
+        sempre, sem lançar a exceção, e os saldos em memória continuam iguais aos do disco.
+        *****************************************************************/
+        """
+        with patch('dao.unidade_de_trabalho._gravar_json_atomico', side_effect=OSError("disco cheio")):
+            resultado = PagamentoController.processar_pagamento(
+                conta_origem_num=1001, doc_destino="98765432100", valor=100.0,
+                descricao="", senha="123", conta_destino_numero=2001
+            )
+        self.assertFalse(resultado["sucesso"])
+        self.assertIn("gravar", resultado["erros"][0])
+        self.assertEqual(Repositorio.contas().buscar_por_id("1001").get_saldo(), 1000.0)
+        self.assertEqual(Repositorio.contas().buscar_por_id("2001").get_saldo(), 0.0)
+
+    def test_falha_na_gravacao_de_um_bloco_do_lote(self):
+        """
+        /************************ Teste 5 ****************************
+        Faz falhar a gravação do segundo bloco de um lote: as transferências do bloco são
+        desfeitas e informadas como recusadas no arquivo de resultado, e os demais blocos
+        são gravados normalmente.
+        *****************************************************************/
+        """
+        with open("folha.csv", "w", encoding="utf-8") as f:
+            f.write(
+                "conta_origem;conta_destino;valor\n"
+                "1001;2001;100\n"
+                "1001;2001;100\n"
+                "1002;2001;50\n"     # Bloco 2: falha na gravação
+                "1002;1001;50\n"     # Bloco 2: falha na gravação
+                "1001;2001;10\n"
+            )
+        gravar_json = unidade_de_trabalho._gravar_json_atomico
+        chamadas = []
+
+        def falhar_no_segundo_bloco(caminho, dados):
+            chamadas.append(caminho)
+            if len(chamadas) == 2:
+                raise OSError("disco cheio")
+            gravar_json(caminho, dados)
+
+        with patch('dao.unidade_de_trabalho._gravar_json_atomico', side_effect=falhar_no_segundo_bloco):
+            resultado = PagamentoController.processar_lote("folha.csv", tamanho_bloco=2)
+
+        self.assertEqual((resultado["aceitas"], resultado["recusadas"]), (3, 2))
+        with open("folha_resultado.csv", encoding="utf-8") as f:
+            linhas = list(csv.DictReader(f, delimiter=";"))
+        self.assertEqual([l["status"] for l in linhas], ["aceita", "aceita", "recusada", "recusada", "aceita"])
+        self.assertIn("gravar", linhas[2]["mensagem"])
+
+        conta_dao = Repositorio.contas()
+        esperados = {"1001": 790.0, "1002": 2000.0, "2001": 210.0}
+        self.assertEqual({n: conta_dao.buscar_por_id(n).get_saldo() for n in esperados}, esperados)
+        with open(os.path.join("database", ARQUIVO_CONTAS), encoding="utf-8") as f:
+            saldos = {r["numero"]: r["saldo"] for r in json.load(f)}
+        self.assertEqual({n: saldos[n] for n in esperados}, esperados)
+        self.assertEqual([t.valor for t in conta_dao._livro_razao.ler("1001")], [100.0, 100.0, 10.0])
+
+
+class TestPagamentoIdempotente(_BasePagamentos):
+
+    def setUp(self):
+        super().setUp()
+        PagamentoController._idempotencia.limpar()
+        self.argumentos = dict(conta_origem_num=1001, doc_destino="98765432100", valor=100.0,
+                               descricao="", senha="123", conta_destino_numero=2001)
+
+    def test_repeticao_devolve_o_resultado_original(self):
+        """
+        /************************ Teste 1 ****************************
+        Repete processar_pagamento com a mesma chave de idempotência: a repetição devolve o
+        resultado original sem executar de novo, a mesma chave com outro valor é recusada e
+        uma recusa não ocupa a chave.
+        *****************************************************************/
+        """
+        argumentos = self.argumentos
+        original = PagamentoController.processar_pagamento(**argumentos, chave_idempotencia="k1")
+        self.assertTrue(original["sucesso"])
+        with patch.object(PagamentoController, '_executar_pagamento', side_effect=AssertionError("executou")):
+            self.assertEqual(PagamentoController.processar_pagamento(**argumentos, chave_idempotencia="k1"), original)
+        outro_valor = PagamentoController.processar_pagamento(**dict(argumentos, valor=5.0), chave_idempotencia="k1")
+        self.assertFalse(outro_valor["sucesso"])
+        self.assertIn("idempotência", outro_valor["erros"][0])
+
+        recusa = dict(argumentos, valor=5000.0)
+        self.assertFalse(PagamentoController.processar_pagamento(**recusa, chave_idempotencia="k2")["sucesso"])
+        self.assertTrue(PagamentoController.processar_pagamento(**argumentos, chave_idempotencia="k2")["sucesso"])
+        self.assertEqual(Repositorio.contas().buscar_por_id("1001").get_saldo(), 800.0)
+
+    def test_repeticoes_simultaneas_executam_uma_vez(self):
+        """
+        /************************ Teste 2 ****************************
+        Repete o mesmo pagamento, com a mesma chave, em várias threads ao mesmo tempo:
+        todas recebem o resultado do pagamento, que é executado uma única vez.
+        *****************************************************************/
+        """
+        barreira = threading.Barrier(8)
+        resultados = []
+
+        def pagar():
+            barreira.wait()
+            resultados.append(PagamentoController.processar_pagamento(**self.argumentos, chave_idempotencia="k3"))
+
+        threads = [threading.Thread(target=pagar) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(all(r["sucesso"] for r in resultados))
+        self.assertEqual(len(resultados), 8)
+        self.assertEqual(Repositorio.contas().buscar_por_id("1001").get_saldo(), 900.0)
+        self.assertEqual(Repositorio.contas().buscar_por_id("2001").get_saldo(), 100.0)
+
+
+class TestGravadorContas(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes do Gravador de Contas ****************************
+        Cria 20 contas correntes com R$ 1000,00 cada em diretório temporário.
+        *******************************************************************************************
+        """
+        self.diretorio_original = os.getcwd()
+        self.diretorio_temp = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.diretorio_temp, "database"))
+        os.chdir(self.diretorio_temp)
+
+        self.numeros = [str(3000 + i) for i in range(20)]
+        with open(os.path.join("database", ARQUIVO_CONTAS), "w", encoding="utf-8") as f:
+            json.dump([{"numero": n, "saldo": 1000.0, "ativa": True, "tipo": "corrente"} for n in self.numeros], f)
+        Repositorio.limpar()
+
+    def tearDown(self):
+        Repositorio.limpar()
+        os.chdir(self.diretorio_original)
+        shutil.rmtree(self.diretorio_temp, ignore_errors=True)
+
+    def _saldos_gravados(self) -> dict:
+        with open(os.path.join("database", ARQUIVO_CONTAS), encoding="utf-8") as f:
+            return {r["numero"]: r["saldo"] for r in json.load(f)}
+
+    def test_modo_assincrono_grava_por_particao(self):
+        """
+        /************************ Teste 1 ****************************
+        No modo assíncrono, transferências só alteram a memória (nenhuma escrita no
+        armazenamento) e os saldos lidos já as refletem. `persistir` grava as contas sujas
+        com uma escrita por partição, e o histórico de cada transferência vai ao livro-razão.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        gravador = GravadorContas(conta_dao, DURABILIDADE_ASSINCRONA, particoes=4, intervalo=60, limite_sujas=10_000)
+        contas = [conta_dao.buscar_por_id(n) for n in self.numeros]
+        sorteio = random.Random(7)
+
+        with patch.object(conta_dao._armazenamento, 'aplicar',
+                          wraps=conta_dao._armazenamento.aplicar) as gravacoes:
+            for _ in range(500):
+                origem, destino = sorteio.sample(contas, 2)
+                gravador.transferir(origem, destino, float(sorteio.randint(1, 50)))
+            self.assertEqual(gravacoes.call_count, 0)
+            self.assertEqual(gravador.pendentes(), 20)
+            self.assertEqual(sum(gravador.saldo(n) for n in self.numeros), 20_000.0)
+            self.assertTrue(all(v == 1000.0 for v in self._saldos_gravados().values()))
+
+            self.assertEqual(gravador.persistir(), 20)
+            self.assertEqual(gravacoes.call_count, 4)
+        gravador.fechar()
+
+        self.assertEqual(self._saldos_gravados(), {n: gravador.saldo(n) for n in self.numeros})
+        livro = LivroRazao(os.path.join("database", "historico"))
+        self.assertEqual(sum(len(livro.ler(n)) for n in self.numeros), 1000)
+
+    def test_gravacao_em_segundo_plano_e_modo_sincrono(self):
+        """
+        /************************ Teste 2 ****************************
+        Com o limite de contas sujas atingido, a thread de fundo grava sem esperar o
+        intervalo; o Repositorio grava o que restar ao ser limpo. No modo síncrono, cada
+        transferência já está gravada quando retorna.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        gravador = GravadorContas(conta_dao, DURABILIDADE_ASSINCRONA, intervalo=60, limite_sujas=2)
+        origem, destino = conta_dao.buscar_por_id("3000"), conta_dao.buscar_por_id("3001")
+        gravador.transferir(origem, destino, 100.0)
+        for _ in range(200):
+            if gravador.pendentes() == 0 and self._saldos_gravados()["3000"] == 900.0:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self._saldos_gravados()["3001"], 1100.0)
+        gravador.fechar()
+        self.assertFalse(gravador._thread.is_alive())
+
+        compartilhado = Repositorio.gravador_contas()
+        compartilhado.durabilidade = DURABILIDADE_ASSINCRONA
+        compartilhado.intervalo = 60
+        compartilhado.transferir(origem, destino, 50.0)
+        Repositorio.limpar()
+        self.assertEqual(self._saldos_gravados()["3001"], 1150.0)
+
+        conta_dao = Repositorio.contas()
+        sincrono = GravadorContas(conta_dao, DURABILIDADE_SINCRONA)
+        sincrono.transferir(conta_dao.buscar_por_id("3002"), conta_dao.buscar_por_id("3003"), 10.0)
+        self.assertEqual((self._saldos_gravados()["3002"], sincrono.pendentes()), (990.0, 0))
+
+    def test_falha_na_gravacao_sincrona_desfaz_a_transferencia(self):
+        """
+        /************************ Teste 3 ****************************
+        No modo síncrono, se a gravação falhar, as duas contas voltam ao estado anterior
+        (saldo e transações pendentes), iguais ao disco, e a próxima gravação de uma delas
+        não leva a transferência recusada.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        origem, destino = conta_dao.buscar_por_id("3000"), conta_dao.buscar_por_id("3001")
+        gravador = GravadorContas(conta_dao, DURABILIDADE_SINCRONA)
+        with patch('dao.unidade_de_trabalho._gravar_json_atomico', side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                gravador.transferir(origem, destino, 30.0)
+
+        self.assertEqual((origem.get_saldo(), destino.get_saldo()), (1000.0, 1000.0))
+        self.assertEqual((origem._transacoes_pendentes(), destino._transacoes_pendentes()), ([], []))
+        gravador.transferir(origem, conta_dao.buscar_por_id("3002"), 10.0)
+        self.assertEqual(self._saldos_gravados()["3000"], 990.0)
+        self.assertEqual(self._saldos_gravados()["3001"], 1000.0)
+        self.assertEqual(len(conta_dao._livro_razao.ler("3000")), 1)
+
+
+class TestUnidadeDeTrabalho(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes da Unidade de Trabalho ****************************
+        Monta uma base mínima (uma pessoa, um cliente e duas contas) em diretório temporário.
+        *******************************************************************************************
+        """
+        self.diretorio_original = os.getcwd()
+        self.diretorio_temp = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.diretorio_temp, "database"))
+        os.chdir(self.diretorio_temp)
+
+        self.patcher = patch('utils.api.API.buscar_endereco_por_cep', return_value="Rua Mock, 10")
+        self.patcher.start()
+
+        base = {
+            ARQUIVO_PESSOAS: [{
+                "nome": "Ana Souza", "email": "ana@email.com", "numero_documento": "12345678900",
+                "cep": "30130130", "numero_endereco": "10", "endereco": "Rua Mock, 10",
+                "telefone": "31999998888", "tipo": "fisica", "data_nascimento": "01/01/1990"
+            }],
+            ARQUIVO_CLIENTES: [{"numero_documento": "12345678900", "senha": "123", "contas": ["1001"]}],
+            ARQUIVO_CONTAS: [
+                {"numero": "1001", "saldo": 100.0, "ativa": True, "tipo": "corrente"},
+                {"numero": "1002", "saldo": 50.0, "ativa": True, "tipo": "corrente"}
+            ]
+        }
+        for arquivo, dados in base.items():
+            with open(os.path.join("database", arquivo), "w", encoding="utf-8") as f:
+                json.dump(dados, f)
+        self.registros = os.path.join("database", DIRETORIO_UNIDADES_TRABALHO)
+        Repositorio.limpar()
+
+    def tearDown(self):
+        Repositorio.limpar()
+        self.patcher.stop()
+        os.chdir(self.diretorio_original)
+        shutil.rmtree(self.diretorio_temp, ignore_errors=True)
+
+    def _gravados(self, arquivo: str, chave: str) -> dict:
+        with open(os.path.join("database", arquivo), encoding="utf-8") as f:
+            return {r[chave]: r for r in json.load(f)}
+
+    def _registros_pendentes(self) -> list:
+        return os.listdir(self.registros) if os.path.isdir(self.registros) else []
+
+    def test_criar_conta_concluida_pela_recuperacao(self):
+        """
+        /************************ Teste 1 ****************************
+        Simula uma queda depois de gravado o arquivo de clientes e antes do de contas:
+        o registro da unidade fica no disco e, na inicialização seguinte, a recuperação
+        grava a conta nova, de modo que o cliente nunca aponta para uma conta inexistente.
+        *****************************************************************/
+        """
+        Repositorio.clientes().listar_todos_objetos()
+        with patch.object(Repositorio.contas()._armazenamento, 'aplicar', side_effect=OSError("disco cheio")):
+            resultado = ContaController.criar_conta("12345678900", TIPO_CPOUPANCA)
+        self.assertTrue(resultado["sucesso"])
+        self.assertEqual(len(self._registros_pendentes()), 1)
+        self.assertEqual(self._gravados(ARQUIVO_CLIENTES, "numero_documento")["12345678900"]["contas"], ["1001", "1003"])
+        self.assertNotIn("1003", self._gravados(ARQUIVO_CONTAS, "numero"))
+
+        Repositorio.limpar()
+        cliente = Repositorio.clientes().buscar_por_id("12345678900")
+        self.assertEqual(self._registros_pendentes(), [])
+        self.assertIn("1003", self._gravados(ARQUIVO_CONTAS, "numero"))
+        self.assertEqual([str(c.get_numero_conta()) for c in cliente.contas], ["1001", "1003"])
+
+    def test_recuperacao_nao_duplica_historico(self):
+        """
+        /************************ Teste 2 ****************************
+        Simula uma queda depois de acrescentado o histórico de uma transferência (com uma
+        linha incompleta no final) e antes de apagado o registro: a recuperação refaz a
+        unidade sem duplicar transações, e os saldos batem com o histórico.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        origem, destino = conta_dao.buscar_por_id("1001"), conta_dao.buscar_por_id("1002")
+        with patch('dao.unidade_de_trabalho.os.remove'):
+            GravadorContas(conta_dao, DURABILIDADE_SINCRONA).transferir(origem, destino, 30.0)
+        self.assertEqual(len(self._registros_pendentes()), 1)
+        with open(conta_dao._livro_razao.caminho("1001"), "ab") as f:
+            f.write(b'[17000')
+
+        Repositorio.limpar()
+        conta_dao = Repositorio.contas()
+        self.assertEqual(self._registros_pendentes(), [])
+        historico_origem = conta_dao.buscar_por_id("1001").get_transacoes()
+        historico_destino = conta_dao.buscar_por_id("1002").get_transacoes()
+        self.assertEqual([t.valor for t in historico_origem], [30.0])
+        self.assertEqual([t.valor for t in historico_destino], [30.0])
+        self.assertEqual(historico_origem[-1].saldo_apos, conta_dao.buscar_por_id("1001").get_saldo())
+        self.assertEqual(self._gravados(ARQUIVO_CONTAS, "numero")["1002"]["saldo"], 80.0)
+
+    def test_duplicacao_nao_grava_nada(self):
+        """
+        /************************ Teste 3 ****************************
+        Verifica que uma unidade com uma inclusão duplicada é recusada por inteiro:
+        nenhuma das alterações, nem o registro, chega ao disco.
+        *****************************************************************/
+        """
+        conta_dao, cliente_dao = Repositorio.contas(), Repositorio.clientes()
+        cliente = cliente_dao.buscar_por_id("12345678900")
+        cliente._senha = "nova"
+        with self.assertRaises(ValueError):
+            with UnidadeDeTrabalho() as unidade:
+                unidade.atualizar(cliente_dao, cliente)
+                unidade.salvar(conta_dao, ContaCorrente("1002"))
+        self.assertEqual(self._registros_pendentes(), [])
+        self.assertEqual(self._gravados(ARQUIVO_CLIENTES, "numero_documento")["12345678900"]["senha"], "123")
+        self.assertIsNot(conta_dao.buscar_por_id("1002"), None)
+
+    def test_pendente_aplicado_antes_da_proxima_unidade(self):
+        """
+        /************************ Teste 4 ****************************
+        Uma unidade confirmada cuja aplicação falhou fica pendente: a próxima unidade com
+        as mesmas chaves a aplica antes de gravar a sua, enquanto uma unidade de outras
+        chaves é confirmada sem depender dela.
+        *****************************************************************/
+        """
+        conta_dao, cliente_dao = Repositorio.contas(), Repositorio.clientes()
+        conta = conta_dao.buscar_por_id("1001")
+        conta._set_saldo(70.0)
+        with patch('dao.unidade_de_trabalho._aplicar', side_effect=OSError("disco cheio")):
+            with UnidadeDeTrabalho() as unidade:
+                unidade.atualizar(conta_dao, conta)
+        self.assertEqual(len(self._registros_pendentes()), 1)
+
+        cliente = cliente_dao.buscar_por_id("12345678900")
+        cliente._senha = "nova"
+        with UnidadeDeTrabalho() as unidade:
+            unidade.atualizar(cliente_dao, cliente)
+        self.assertEqual(len(self._registros_pendentes()), 1)
+        self.assertEqual(self._gravados(ARQUIVO_CONTAS, "numero")["1001"]["saldo"], 100.0)
+
+        outra = conta_dao.buscar_por_id("1002")
+        outra._set_saldo(20.0)
+        with UnidadeDeTrabalho() as unidade:
+            unidade.atualizar(conta_dao, conta)
+            unidade.atualizar(conta_dao, outra)
+        self.assertEqual(self._registros_pendentes(), [])
+        contas = self._gravados(ARQUIVO_CONTAS, "numero")
+        self.assertEqual((contas["1001"]["saldo"], contas["1002"]["saldo"]), (70.0, 20.0))
+
+    def test_recuperacao_preserva_acrescimos_posteriores(self):
+        """
+        /************************ Teste 5 ****************************
+        Simula um registro deixado no disco seguido de um acréscimo ao histórico feito por
+        outro caminho (ex.: pagamento em lote): a recuperação não apaga esse acréscimo nem
+        duplica as transações do registro.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        origem, destino = conta_dao.buscar_por_id("1001"), conta_dao.buscar_por_id("1002")
+        with patch('dao.unidade_de_trabalho.os.remove'):
+            GravadorContas(conta_dao, DURABILIDADE_SINCRONA).transferir(origem, destino, 30.0)
+        conta_dao._livro_razao.anexar("1001", [Transacao(1_900_000_000, "envio", 500, "1002", 6_500)])
+
+        Repositorio.limpar()
+        conta_dao = Repositorio.contas()
+        self.assertEqual(self._registros_pendentes(), [])
+        historico = conta_dao.buscar_por_id("1001").get_transacoes()
+        self.assertEqual([t.valor for t in historico], [30.0, 5.0])
+
+    def test_falha_na_gravacao_desfaz_alteracoes_em_memoria(self):
+        """
+        /************************ Teste 6 ****************************
+        Faz falhar a gravação do registro ao encerrar uma conta e ao editar o contato do
+        cliente: os objetos compartilhados voltam ao estado anterior, iguais ao disco.
+        *****************************************************************/
+        """
+        conta = Repositorio.contas().buscar_por_id("1001")
+        cliente = Repositorio.clientes().buscar_por_id("12345678900")
+        pendentes = conta._transacoes_pendentes()
+
+        with patch('dao.unidade_de_trabalho._gravar_json_atomico', side_effect=OSError("disco cheio")):
+            with self.assertRaises(OSError):
+                ContaController.excluir_conta("12345678900", "1001", "123")
+            with self.assertRaises(OSError):
+                PerfilController.atualizar_contato(cliente, "nova@email.com", "31911112222", "123", "Nova@Senha1")
+
+        self.assertTrue(conta.get_estado_da_conta())
+        self.assertEqual(conta._transacoes_pendentes(), pendentes)
+        self.assertEqual((cliente.pessoa.get_email(), cliente.pessoa.get_telefone()), ("ana@email.com", "31999998888"))
+        self.assertTrue(cliente.verificar_senha("123"))
+
+        PerfilController.atualizar_contato(cliente, "nova@email.com", "31911112222", "123")
+        self.assertEqual(self._gravados(ARQUIVO_PESSOAS, "numero_documento")["12345678900"]["email"], "nova@email.com")
+
+    def test_transacoes_pendentes_ate_a_aplicacao(self):
+        """
+        /************************ Teste 7 ****************************
+        Uma unidade confirmada cuja aplicação falhou não marca as transações como gravadas:
+        elas só deixam de ser pendentes quando a próxima unidade das mesmas contas a aplica,
+        e o histórico fica sem transações duplicadas.
+        *****************************************************************/
+        """
+        conta_dao = Repositorio.contas()
+        origem, destino = conta_dao.buscar_por_id("1001"), conta_dao.buscar_por_id("1002")
+        gravador = GravadorContas(conta_dao, DURABILIDADE_SINCRONA)
+        with patch('dao.unidade_de_trabalho._aplicar', side_effect=OSError("disco cheio")):
+            gravador.transferir(origem, destino, 30.0)
+        self.assertEqual(len(self._registros_pendentes()), 1)
+        self.assertEqual([t.valor for t in origem._transacoes_pendentes()], [30.0])
+
+        gravador.transferir(origem, destino, 10.0)
+        self.assertEqual(self._registros_pendentes(), [])
+        self.assertEqual(origem._transacoes_pendentes(), [])
+        self.assertEqual([t.valor for t in conta_dao._livro_razao.ler("1001")], [30.0, 10.0])
+        self.assertEqual([t.valor for t in conta_dao._livro_razao.ler("1002")], [30.0, 10.0])
+        self.assertEqual(self._gravados(ARQUIVO_CONTAS, "numero")["1002"]["saldo"], 90.0)
+
+
+def _alocar_numeros(caminho: str, quantidade: int) -> list:
+    """
+    Aloca números de uma SequenciaNumeros em outro processo (teste de alocação entre processos).
+    """
+    sequencia = SequenciaNumeros(caminho, lambda: 1001, bloco=7)
+    return [sequencia.proximo() for _ in range(quantidade)]
+
+
+class TestSequenciaNumeros(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes da Sequência de Números ****************************
+        Cria um diretório temporário para o arquivo da sequência.
+        *******************************************************************************************
+        """
+        self.diretorio_temp = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.diretorio_temp, "sequencia.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio_temp, ignore_errors=True)
+
+    def test_blocos_sem_repeticao_entre_instancias(self):
+        """
+        /************************ Teste 1 ****************************
+        Duas instâncias sobre o mesmo arquivo (como dois processos), usadas por várias threads,
+        nunca entregam o mesmo número. O valor inicial só é calculado na primeira reserva e o
+        arquivo é lido e gravado uma vez por bloco, não por número.
+        *****************************************************************/
+        """
+        inicial = Mock(return_value=5000)
+        sequencias = [SequenciaNumeros(self.caminho, inicial, bloco=10) for _ in range(2)]
+        numeros = []
+        trava = threading.Lock()
+
+        def alocar(sequencia):
+            for _ in range(50):
+                numero = sequencia.proximo()
+                with trava:
+                    numeros.append(numero)
+
+        with patch('dao.sequencia._gravar_json_atomico', wraps=sequencia._gravar_json_atomico) as gravacoes:
+            threads = [threading.Thread(target=alocar, args=(sequencias[i % 2],)) for i in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(set(numeros)), 200)
+        self.assertTrue(all(n >= 5000 for n in numeros))
+        inicial.assert_called_once()
+        self.assertEqual(gravacoes.call_count, 20)
+
+        # Após reiniciar, a numeração continua depois de tudo o que foi reservado
+        self.assertEqual(SequenciaNumeros(self.caminho, inicial, bloco=10).proximo(), 5200)
+
+    def test_processos_concorrentes(self):
+        """
+        /************************ Teste 2 ****************************
+        Processos diferentes alocando ao mesmo tempo recebem números disjuntos.
+        *****************************************************************/
+        """
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            resultados = list(executor.map(_alocar_numeros, [self.caminho] * 3, [40] * 3))
+        todos = [n for numeros in resultados for n in numeros]
+        self.assertEqual(len(set(todos)), 120)
+
+
+@unittest.skipIf(np is None, "NumPy não instalado")
+class TestFechamentoMensal(unittest.TestCase):
+
+    def setUp(self):
+        """
+        /************************ Setup Testes de Fechamento Mensal ****************************
+        Cria um contas.json com contas correntes e poupanças, ativas e inativas, com saldos
+        variados (inclusive negativos e com frações de centavo), em diretório temporário.
+        ***************************************************************************************
+        """
+        self.diretorio_original = os.getcwd()
+        self.diretorio_temp = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.diretorio_temp, "database"))
+        os.chdir(self.diretorio_temp)
+
+        aleatorio = random.Random(15)
+        saldos_especiais = [0.0, 0.01, 0.99, 890.01, 100.1, 12345.678, 1000.0, 0.005, -50.0, 199.9]
+        self.registros = []
+        for i in range(300):
+            saldo = saldos_especiais[i] if i < len(saldos_especiais) else round(aleatorio.uniform(-200, 50_000), 2)
+            self.registros.append({
+                "numero": str(2000 + i),
+                "saldo": saldo,
+                "ativa": i % 7 != 3,
+                "tipo": "corrente" if i % 2 else "poupanca"
+            })
+        with open(os.path.join("database", ARQUIVO_CONTAS), "w", encoding="utf-8") as f:
+            json.dump(self.registros, f)
+
+        Repositorio.limpar()
+
+    def tearDown(self):
+        Repositorio.limpar()
+        os.chdir(self.diretorio_original)
+        shutil.rmtree(self.diretorio_temp, ignore_errors=True)
+
+    def _calcular_conta_a_conta(self) -> dict:
+        """
+        Aplica atualizacao_mensal em cópias dos registros. Por conta: (saldo, tipo, valor em
+        centavos, saldo após em centavos) da transação gerada, ou None se recusada/inativa.
+        """
+        esperados = {}
+        for registro in self.registros:
+            conta = ContaMapper.from_dict(dict(registro))
+            try:
+                conta.atualizacao_mensal()
+            except (ContaInativaError, ValueError):
+                esperados[registro["numero"]] = None
+                continue
+            transacao = conta._transacoes_pendentes()[-1]
+            esperados[registro["numero"]] = (conta.get_saldo(), transacao.tipo,
+                                             transacao.valor_centavos, transacao.saldo_apos_centavos)
+        return esperados
+
+    def _verificar_gravados(self, esperados: dict) -> None:
+        """
+        Confere os saldos gravados e que cada conta atualizada recebeu exatamente uma transação.
+        """
+        with open(os.path.join("database", ARQUIVO_CONTAS), encoding="utf-8") as f:
+            gravados = {r["numero"]: r for r in json.load(f)}
+        livro = LivroRazao(os.path.join("database", "historico"))
+        for registro in self.registros:
+            numero = registro["numero"]
+            historico = livro.ler(numero)
+            if esperados[numero] is None:
+                self.assertEqual(gravados[numero]["saldo"], registro["saldo"])
+                self.assertEqual(historico, [])
+                continue
+            saldo, tipo, valor, saldo_apos = esperados[numero]
+            self.assertEqual(gravados[numero]["saldo"], saldo, numero)
+            self.assertEqual(len(historico), 1, numero)
+            self.assertEqual((historico[0].tipo, historico[0].valor_centavos, historico[0].saldo_apos_centavos),
+                             (tipo, valor, saldo_apos))
+
+    def test_lote_igual_ao_calculo_conta_a_conta(self):
+        """
+        /************************ Teste 1 ****************************
+        Aplica atualizacao_mensal conta a conta em cópias dos registros e compara com o
+        fechamento em lote: saldos gravados, transação acrescentada ao histórico de cada
+        conta, contas inativas e recusadas ignoradas e objeto já carregado atualizado.
+        *****************************************************************/
+        """
+        esperados = self._calcular_conta_a_conta()
+        carregada = Repositorio.contas().buscar_por_id("2005")
+
+        resumo, erro = ContaController.executar_fechamento_mensal()
+        self.assertIsNone(erro)
+        self.assertEqual(resumo["atualizadas"], sum(1 for e in esperados.values() if e is not None))
+        self.assertEqual(resumo["inativas"], sum(1 for r in self.registros if not r["ativa"]))
+        self.assertIn("2008", resumo["recusadas"])    # Poupança ativa com saldo negativo
+
+        self._verificar_gravados(esperados)
+        self.assertIs(Repositorio.contas().buscar_por_id("2005"), carregada)
+        self.assertEqual(carregada.get_saldo(), esperados["2005"][0])
+
+    def test_execucao_interrompida_e_retomada(self):
+        """
+        /************************ Teste 2 ****************************
+        Interrompe o fechamento ao registrar a partição 2 como concluída. A próxima execução
+        retoma apenas as partições que faltam, sem repetir transações, e uma nova execução no
+        mesmo período não altera nada.
+        *****************************************************************/
+        """
+        esperados = self._calcular_conta_a_conta()
+        gravar_json = fechamento_mensal._gravar_json_atomico
+
+        def falhar_na_particao_2(caminho, dados):
+            if caminho.endswith("particao_2.json"):
+                raise OSError("Interrupção simulada")
+            gravar_json(caminho, dados)
+
+        with patch('dao.fechamento_mensal._gravar_json_atomico', side_effect=falhar_na_particao_2):
+            with self.assertRaises(OSError):
+                FechamentoMensal(Repositorio.contas()).executar(momento=1_750_000_000, processos=1, particoes=4)
+
+        Repositorio.limpar()    # Como em um novo processo
+        resumo = FechamentoMensal(Repositorio.contas()).executar(processos=1)
+        self.assertEqual((resumo["periodo"], resumo["particoes"], resumo["retomadas"]), ("2025-06", 4, 2))
+        self._verificar_gravados(esperados)
+        self.assertFalse(os.path.exists(os.path.join("database", "fechamentos", "2025-06")))
+
+        repetido = FechamentoMensal(Repositorio.contas()).executar(periodo="2025-06", processos=1)
+        self.assertEqual(repetido["atualizadas"], 0)
+        self.assertEqual(repetido["ja_fechadas"], resumo["atualizadas"])
+        self._verificar_gravados(esperados)
+        self.assertEqual(Repositorio.contas().buscar_por_id("2001").get_ultimo_fechamento(), "2025-06")
+
+    def test_particoes_em_processos_de_trabalho(self):
+        """
+        /************************ Teste 3 ****************************
+        Executa as partições em um pool de processos e confere o mesmo resultado do
+        cálculo conta a conta.
+        *****************************************************************/
+        """
+        esperados = self._calcular_conta_a_conta()
+        resumo = FechamentoMensal(Repositorio.contas()).executar(processos=2, particoes=3)
+        self.assertEqual((resumo["particoes"], resumo["retomadas"]), (3, 0))
+        self._verificar_gravados(esperados)
+
+    def test_transferencia_durante_o_fechamento(self):
+        """
+        /************************ Teste 4 ****************************
+        Faz uma transferência enquanto o fechamento processa as partições: ela não espera o
+        fechamento, e a taxa é aplicada depois dela, sem sobrescrevê-la, na memória, no
+        arquivo de contas e no histórico.
+        *****************************************************************/
+        """
+        esperados = self._calcular_conta_a_conta()
+        origem_n, destino_n = [r["numero"] for r in self.registros
+                               if r["tipo"] == "corrente" and r["ativa"] and r["saldo"] > 100][:2]
+        conta_dao = Repositorio.contas()
+        origem, destino = conta_dao.buscar_por_id(origem_n), conta_dao.buscar_por_id(destino_n)
+
+        processar = fechamento_mensal._processar_particao
+        iniciado, liberar = threading.Event(), threading.Event()
+
+        def processar_devagar(tarefa):
+            iniciado.set()
+            liberar.wait(5)
+            return processar(tarefa)
+
+        with patch('dao.fechamento_mensal._processar_particao', side_effect=processar_devagar):
+            fechamento = threading.Thread(target=ContaController.executar_fechamento_mensal, kwargs={"processos": 1})
+            fechamento.start()
+            self.assertTrue(iniciado.wait(5))
+            transferencia = threading.Thread(
+                target=Repositorio.gravador_contas().transferir, args=(origem, destino, 10.0))
+            transferencia.start()
+            transferencia.join(5)
+            self.assertFalse(transferencia.is_alive())
+            liberar.set()
+            fechamento.join()
+
+        iniciais = {r["numero"]: r["saldo"] for r in self.registros}
+        saldo_origem = iniciais[origem_n] - 10.0 - TAXA_MANUTENCAO_CCORRENTE
+        saldo_destino = iniciais[destino_n] + 10.0 - TAXA_MANUTENCAO_CCORRENTE
+        self.assertEqual((origem.get_saldo(), destino.get_saldo()), (saldo_origem, saldo_destino))
+        with open(os.path.join("database", ARQUIVO_CONTAS), encoding="utf-8") as f:
+            gravados = {r["numero"]: r["saldo"] for r in json.load(f)}
+        self.assertEqual((gravados[origem_n], gravados[destino_n]), (saldo_origem, saldo_destino))
+        historico = LivroRazao(os.path.join("database", "historico")).ler(origem_n)
+        self.assertEqual([t.valor for t in historico], [10.0, esperados[origem_n][2] / 100])
+        self.assertEqual(historico[-1].saldo_apos_centavos, para_centavos(saldo_origem))
+
+    def test_meio_centavo_igual_ao_calculo_conta_a_conta(self):
+        """
+        /************************ Teste 5 ****************************
+        Compara o fechamento em lote com `atualizacao_mensal` conta a conta em saldos cujo
+        rendimento ou saldo final cai em meio centavo (ou em frações de centavo): saldos
+        gravados, valores e saldos após das transações devem ser idênticos.
+        *****************************************************************/
+        """
+        saldos = [1.0, 3.0, 101.0, 0.005, 0.015, 2.5, 0.1, 0.3, 100.1, 0.999, 12345.678, 900.9, 5.005, 10.005]
+        self.registros = [
+            {"numero": str(5000 + i), "saldo": saldo, "ativa": True, "tipo": tipo}
+            for i, (saldo, tipo) in enumerate((s, t) for s in saldos for t in ("poupanca", "corrente"))
+        ]
+        with open(os.path.join("database", ARQUIVO_CONTAS), "w", encoding="utf-8") as f:
+            json.dump(self.registros, f)
+        esperados = self._calcular_conta_a_conta()
+        carregada = Repositorio.contas().buscar_por_id("5002")
+
+        resumo = FechamentoMensal(Repositorio.contas()).executar(processos=1, particoes=2)
+        self.assertEqual(resumo["atualizadas"], len(self.registros))
+        self._verificar_gravados(esperados)
+        self.assertEqual(carregada.get_saldo(), esperados["5002"][0])
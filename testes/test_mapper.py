@@ -220,6 +220,32 @@ class TestPessoaMapper(unittest.TestCase):
         self.assertEqual(dict_pessoa["tipo"], TIPO_PJURIDICA)
         self.assertNotIn("nome_fantasia", dict_pessoa)
 
+    @patch('utils.api.API.buscar_endereco_por_cep')
+    def test_from_dict_reidratacao_nao_consulta_api(self, mock_api_cep):
+        """
+        /************************ Teste 9 ****************************
+        Testa a reidratação de um registro persistido com endereço já resolvido.
+
+        Teste para garantir que carregar pessoas do armazenamento não faça acesso à rede.
+        *****************************************************************/
+        """
+        dados_pf = {
+            "tipo": TIPO_PFISICA,
+            "nome": "Victor",
+            "email": "victor@email.com",
+            "numero_documento": "12345678900",
+            "cep": "12345000",
+            "numero_endereco": "10",
+            "endereco": "Rua dos Testes, 10 - Centro, Cidade - UF, 12345000",
+            "telefone": "31999998888",
+            "data_nascimento": "01/01/1990"
+        }
+
+        pessoa = PessoaMapper.from_dict(dados_pf, reidratar=True)
+
+        self.assertEqual(pessoa.get_endereco(), dados_pf["endereco"])
+        mock_api_cep.assert_not_called()
+
 #Testes ContaMapper
 class TestContaMapper(unittest.TestCase):
 
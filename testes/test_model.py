@@ -1,3 +1,6 @@
+import random
+import sys
+import threading
 import unittest
 from unittest.mock import patch, MagicMock 
 from datetime import datetime
@@ -8,7 +11,9 @@ from model.pessoa_juridica import PessoaJuridica
 from model.cliente import Cliente
 from model.conta_corrente import ContaCorrente
 from model.conta_poupanca import ContaPoupanca
+from model.transacao import Transacao
 from model.exceptions import ContaInativaError # não diretamente testado em Cliente, mas é uma dependência de Conta
+from utils.gerenciador_travas import GerenciadorTravas
 
 # Constantes que podem ser usadas nos testes
 from utils.constantes import TAXA_MANUTENCAO_CCORRENTE, RENDIMENTO_MENSAL_CPOUPANCA,LIMITE_TRANSFERENCIA_CCORRENTE,LIMITE_TRANSFERENCIA_CPOUPANCA
@@ -191,6 +196,25 @@ class TestPessoa(unittest.TestCase):
                 data_nascimento="01/01/2000"
             )
 
+    def test_pessoa_set_cep_consulta_api_somente_quando_muda(self):
+        """
+        /************************ Teste 8 ****************************
+        Verifica que o endereço é recalculado apenas quando CEP ou número mudam.
+
+        Evita chamadas desnecessárias à API de CEP ao salvar o perfil sem alterações.
+        ****************************************************************/
+        """
+        self.mock_buscar_endereco.reset_mock()
+
+        self.pessoa_fisica.set_cep(self.cep)
+        self.pessoa_fisica.set_numero_endereco(self.num_endereco)
+        self.mock_buscar_endereco.assert_not_called()
+
+        self.mock_buscar_endereco.return_value = "Rua Nova, 200"
+        self.pessoa_fisica.set_numero_endereco("200")
+        self.mock_buscar_endereco.assert_called_once_with(self.cep, "200")
+        self.assertEqual(self.pessoa_fisica.get_endereco(), "Rua Nova, 200")
+
 # --- Testes para Cliente
 class TestCliente(unittest.TestCase):
 
@@ -539,10 +563,103 @@ class TestContasBancarias(unittest.TestCase):
         self.assertIn("Número da conta muito curto", str(cm.exception))
        
 
+    def test_transacoes_estruturadas(self):
+        """
+        /************************ Teste 16 ***************************
+        Verifica que as operações são registradas como Transacao, com tipo, valor em
+        centavos, conta contraparte e saldo após a operação, e que a forma compacta
+        (lista) reconstrói o mesmo registro.
+        ****************************************************************/
+        """
+        remetente = ContaCorrente("3001", saldo=100.0)
+        destinatario = ContaPoupanca("4001", saldo=50.0)
+        remetente.transferir(destinatario, 30.25)
 
+        envio = remetente.get_transacoes()[-1]
+        recebimento = destinatario.get_transacoes()[-1]
 
+        self.assertEqual((envio.tipo, envio.valor_centavos, envio.contraparte, envio.saldo_apos_centavos),
+                         ("envio", 3025, "4001", 6975))
+        self.assertEqual((recebimento.tipo, recebimento.contraparte, recebimento.saldo_apos_centavos),
+                         ("recebimento", "3001", 8025))
+        self.assertTrue(envio.e_transferencia())
+        self.assertEqual(Transacao.from_lista(envio.to_lista()), envio)
 
+    def test_migracao_historico_legado(self):
+        """
+        /************************ Teste 17 ***************************
+        Verifica a conversão do histórico legado em texto: tipo, valor e contraparte
+        extraídos do texto, saldo após reconstruído a partir do saldo atual e
+        textos não reconhecidos preservados.
+        ****************************************************************/
+        """
+        historico = [
+            "[2025-06-24 17:50:00] Depósito inicial de R$ 200.0",
+            "[2025-06-24 17:54:39] Transferência de R$ 88.00 para conta 1002",
+            "[2025-06-24 17:55:00] Recebido R$ 10.50 da conta 1003",
+            "Ajuste manual",
+        ]
+        conta = ContaCorrente("1001", saldo=122.5, historico=historico)
+        transacoes = conta.get_transacoes()
 
+        self.assertEqual([t.tipo for t in transacoes], ["deposito", "envio", "recebimento", "outra"])
+        self.assertEqual([t.saldo_apos_centavos for t in transacoes], [20000, 11200, 12250, 12250])
+        self.assertEqual(transacoes[1].contraparte, "1002")
+        self.assertEqual(transacoes[1].timestamp, int(datetime(2025, 6, 24, 17, 54, 39).timestamp()))
+        self.assertEqual(conta.get_historico()[1:], historico[1:])
 
 
+class TestTransferenciasConcorrentes(unittest.TestCase):
 
+    def test_conservacao_do_dinheiro_com_travas_por_conta(self):
+        """
+        /************************ Teste 1 ****************************
+        Executa 100 mil transferências aleatórias entre 50 contas, em 8 threads, cada uma
+        com as duas contas travadas pelo GerenciadorTravas (em qualquer ordem de origem e
+        destino). Nenhuma thread pode ficar em impasse e o total de dinheiro do banco, assim
+        como a quantidade de registros no histórico, deve bater com as transferências feitas.
+        *****************************************************************/
+        """
+        contas = [ContaCorrente(numero=str(5000 + i), saldo=1000.0) for i in range(50)]
+        total_inicial = sum(c.get_saldo() for c in contas)
+        travas = GerenciadorTravas()
+        realizadas = []
+        threads_qtd, por_thread = 8, 12_500
+
+        def transferir(semente):
+            sorteio = random.Random(semente)
+            feitas = 0
+            for _ in range(por_thread):
+                origem, destino = sorteio.sample(contas, 2)
+                with travas.travar(origem.get_numero_conta(), destino.get_numero_conta()):
+                    try:
+                        origem.transferir(destino, float(sorteio.randint(1, 300)))
+                        feitas += 1
+                    except ValueError:
+                        pass    # Saldo insuficiente: nada muda
+            realizadas.append(feitas)
+
+        intervalo = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)    # Trocas de thread frequentes: sem as travas, há atualizações perdidas
+        try:
+            threads = [threading.Thread(target=transferir, args=(i,)) for i in range(threads_qtd)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(timeout=120)
+        finally:
+            sys.setswitchinterval(intervalo)
+        self.assertFalse(any(t.is_alive() for t in threads), "Impasse entre as threads")
+
+        self.assertEqual(len(realizadas), threads_qtd)
+        self.assertEqual(sum(c.get_saldo() for c in contas), total_inicial)
+        self.assertTrue(all(c.get_saldo() >= 0 for c in contas))
+        self.assertEqual(sum(len(c._transacoes_pendentes()) for c in contas), 2 * sum(realizadas))
+        for conta in contas:
+            transacoes = conta._transacoes_pendentes()
+            if transacoes:
+                self.assertEqual(transacoes[-1].saldo_apos_centavos, round(conta.get_saldo() * 100))
+
+        estatisticas = travas.estatisticas()
+        self.assertEqual(estatisticas["aquisicoes"], threads_qtd * por_thread)
+        self.assertEqual(estatisticas["em_uso"], 0)
@@ -1,39 +1,36 @@
-import requests
 from utils.validadores.validar_pessoa import ValidarPessoa as Validar
+from utils.cache_cep import CacheCEP
+from utils.cliente_http import ClienteHTTP, ServicoIndisponivelError
+from utils.voo_unico import VooUnico
+from utils.logger import logger
+from utils.constantes import URL_VIACEP
 
 class API():
     """
     Classe utilitária responsável por consultar e compor endereços a partir de CEPs,
-    utilizando a API pública ViaCEP, com cache local para evitar múltiplas requisições.
+    utilizando a API pública ViaCEP, com cache persistente para evitar múltiplas requisições.
     """
 
-    _cache_cep = {}  # Cache em memória por execução
+    _cache = CacheCEP()     # Cache em disco (database/cache_cep.db) com frente em memória
+    _http = ClienteHTTP()   # Pool de conexões com timeouts, novas tentativas e disjuntor
+    _voo_unico = VooUnico() # Agrupa consultas simultâneas do mesmo CEP em uma única requisição
 
     @staticmethod
     def buscar_endereco_por_cep(cep: str, numero: str) -> str:
         """
         Consulta o endereço completo a partir de um CEP e número do imóvel,
-        utilizando a API pública ViaCEP. Usa cache local para evitar múltiplas chamadas repetidas.
+        utilizando a API pública ViaCEP. Usa o cache persistente para evitar chamadas repetidas,
+        inclusive entre execuções diferentes do sistema.
+
+        Raises:
+            ServicoIndisponivelError: Se a API estiver indisponível e o CEP não estiver em cache.
+            ValueError: Se o CEP for inválido, não existir ou a consulta for recusada.
         """
         Validar.cep(cep)
         Validar.numero_endereco(numero)
 
         cep_numerico = ''.join(filter(str.isdigit, cep))  # Apenas os dígitos
-
-        if cep_numerico in API._cache_cep:
-            data = API._cache_cep[cep_numerico]
-        else:
-            url = f"https://viacep.com.br/ws/{cep_numerico}/json/"
-            response = requests.get(url)
-
-            if response.status_code != 200:
-                raise ValueError("Erro ao buscar o endereço. Tente novamente mais tarde.")
-
-            data = response.json()
-            if "erro" in data:
-                raise ValueError("CEP não encontrado. Verifique se está digitado corretamente.")
-
-            API._cache_cep[cep_numerico] = data  # Armazena no cache
+        data = API.consultar_cep(cep_numerico)
 
         logradouro = data["logradouro"]
         bairro     = data["bairro"]
@@ -41,3 +38,85 @@ class API():
         uf         = data["uf"]
 
         return f"{logradouro}, {numero} - {bairro}, {localidade} - {uf}, {cep_numerico}"
+
+    @staticmethod
+    def consultar_cep(cep_numerico: str) -> dict:
+        """
+        Retorna a resposta da ViaCEP para um CEP (apenas dígitos), consultando primeiro o cache.
+
+        Consultas simultâneas do mesmo CEP que não estejam no cache geram uma única
+        requisição: as demais esperam e recebem o mesmo resultado ou o mesmo erro.
+
+        Raises:
+            ServicoIndisponivelError: Se a API estiver indisponível e o CEP não estiver em cache.
+            ValueError: Se o CEP não existir ou a consulta for recusada.
+        """
+        data = API._cache.obter(cep_numerico)
+        if data is not None:
+            return data
+        return API._voo_unico.executar(cep_numerico, lambda: API._consultar_na_api(cep_numerico))
+
+    @staticmethod
+    async def consultar_cep_async(cep_numerico: str) -> dict:
+        """
+        Versão assíncrona de `consultar_cep`, para uso em corrotinas.
+        A requisição roda em uma thread de trabalho, sem bloquear o loop de eventos.
+        """
+        data = API._cache.obter(cep_numerico)
+        if data is not None:
+            return data
+        return await API._voo_unico.executar_async(cep_numerico, lambda: API._consultar_na_api(cep_numerico))
+
+    @staticmethod
+    def _consultar_na_api(cep_numerico: str) -> dict:
+        """
+        Consulta a ViaCEP e guarda a resposta no cache.
+
+        Se a API estiver indisponível (timeout, falha de rede ou disjuntor aberto), usa uma
+        resposta expirada do cache, quando houver.
+        """
+        try:
+            data = API._http.get_json(URL_VIACEP.format(cep=cep_numerico))
+        except ServicoIndisponivelError:
+            data = API._cache.obter(cep_numerico, permitir_expirado=True)
+            if data is None:
+                raise
+            logger.warning(f"API de CEP indisponível; usando o endereço em cache do CEP {cep_numerico}.")
+            return data
+        except ValueError:
+            raise ValueError("Erro ao buscar o endereço. Tente novamente mais tarde.")
+
+        if "erro" in data:
+            raise ValueError("CEP não encontrado. Verifique se está digitado corretamente.")
+        API._cache.guardar(cep_numerico, data)  # Armazena no cache
+        return data
+
+    @staticmethod
+    def recompor_endereco(endereco_atual: str, cep: str, numero: str) -> str:
+        """
+        Recompõe um endereço já conhecido com um novo número, se ele for do mesmo CEP.
+        Usado como alternativa quando a API está indisponível. Retorna None se não for possível.
+        """
+        cep_numerico = ''.join(filter(str.isdigit, cep or ""))
+        if not endereco_atual or not endereco_atual.endswith(f", {cep_numerico}") or " - " not in endereco_atual:
+            return None
+        logradouro_numero, _, restante = endereco_atual.partition(" - ")
+        logradouro = logradouro_numero.rsplit(", ", 1)[0]
+        return f"{logradouro}, {numero} - {restante}"
+
+    @staticmethod
+    def estatisticas_cache() -> dict:
+        """
+        Retorna os contadores de acertos e falhas do cache de CEP.
+        """
+        return API._cache.estatisticas()
+
+    @staticmethod
+    def estatisticas_http() -> dict:
+        """
+        Retorna as métricas do cliente HTTP: reaproveitamento de conexões,
+        novas tentativas, falhas, estado do disjuntor e consultas agrupadas.
+        """
+        estatisticas = API._http.estatisticas()
+        estatisticas["agrupamento"] = API._voo_unico.estatisticas()
+        return estatisticas
@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from utils.logger import logger
+from utils.constantes import (
+    DIRETORIO_DATABASE,
+    ARQUIVO_CACHE_CEP,
+    TTL_CACHE_CEP,
+    LIMITE_CACHE_CEP,
+    LIMITE_CACHE_CEP_MEMORIA
+)
+
+
+class CacheCEP:
+    """
+    Cache persistente das respostas da API ViaCEP.
+
+    As respostas ficam em uma tabela SQLite (sobrevivem a reinícios), com validade
+    de `ttl` segundos e no máximo `limite` CEPs; ao exceder o limite, os CEPs usados
+    há mais tempo são descartados (LRU). Na frente do disco há um cache em memória,
+    também LRU, com até `limite_memoria` CEPs.
+    """
+
+    def __init__(
+        self,
+        caminho: str = None,
+        ttl: float = TTL_CACHE_CEP,
+        limite: int = LIMITE_CACHE_CEP,
+        limite_memoria: int = LIMITE_CACHE_CEP_MEMORIA
+    ):
+        """
+        Prepara o cache. O arquivo SQLite só é aberto no primeiro acesso.
+
+        Args:
+            caminho (str, opcional): Caminho do banco SQLite. Padrão: database/cache_cep.db.
+            ttl (float, opcional): Validade de cada resposta, em segundos.
+            limite (int, opcional): Quantidade máxima de CEPs guardados em disco.
+            limite_memoria (int, opcional): Quantidade máxima de CEPs guardados em memória.
+        """
+        self.caminho = caminho or os.path.join(DIRETORIO_DATABASE, ARQUIVO_CACHE_CEP)
+        self.ttl = ttl
+        self.limite = limite
+        self.limite_memoria = limite_memoria
+
+        self._memoria = OrderedDict()   # cep -> (dados, criado_em)
+        self._conexao = None
+        self._disco_indisponivel = False
+        self._trava = threading.RLock()
+        self._contadores = {
+            "acertos_memoria": 0,
+            "acertos_disco": 0,
+            "falhas": 0,
+            "expirados": 0,
+            "descartados": 0,
+        }
+
+    # === Acesso ao disco ===
+
+    def _banco(self) -> Optional[sqlite3.Connection]:
+        """
+        Abre (uma única vez) a conexão com o banco do cache.
+        Se não for possível, o cache passa a funcionar apenas em memória.
+        """
+        if self._conexao is None and not self._disco_indisponivel:
+            try:
+                self._conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+                with self._conexao:
+                    self._conexao.execute(
+                        "CREATE TABLE IF NOT EXISTS cep ("
+                        "cep TEXT PRIMARY KEY, dados TEXT NOT NULL, "
+                        "criado_em REAL NOT NULL, acessado_em REAL NOT NULL)"
+                    )
+                    self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_cep_acesso ON cep (acessado_em)")
+            except sqlite3.Error as e:
+                logger.warning(f"Cache de CEP em disco indisponível ({e}); usando apenas memória.")
+                self._conexao = None
+                self._disco_indisponivel = True
+        return self._conexao
+
+    def _expirado(self, criado_em: float, agora: float) -> bool:
+        return agora - criado_em > self.ttl
+
+    def _guardar_em_memoria(self, cep: str, dados: dict, criado_em: float) -> None:
+        self._memoria[cep] = (dados, criado_em)
+        self._memoria.move_to_end(cep)
+        while len(self._memoria) > self.limite_memoria:
+            self._memoria.popitem(last=False)
+
+    # === Interface pública ===
+
+    def obter(self, cep: str, permitir_expirado: bool = False) -> Optional[dict]:
+        """
+        Retorna a resposta guardada para o CEP (apenas dígitos), ou None se não houver.
+
+        Args:
+            permitir_expirado (bool, opcional): Se True, devolve a resposta mesmo fora da validade.
+                Útil como alternativa quando a API estiver indisponível.
+        """
+        agora = time.time()
+        with self._trava:
+            if cep in self._memoria:
+                dados, criado_em = self._memoria[cep]
+                if permitir_expirado or not self._expirado(criado_em, agora):
+                    self._memoria.move_to_end(cep)
+                    self._contadores["acertos_memoria"] += 1
+                    return dados
+
+            banco = self._banco()
+            linha = None
+            if banco is not None:
+                linha = banco.execute("SELECT dados, criado_em FROM cep WHERE cep = ?", (cep,)).fetchone()
+
+            if linha is None:
+                self._contadores["falhas"] += 1
+                return None
+
+            dados, criado_em = json.loads(linha[0]), linha[1]
+            if self._expirado(criado_em, agora) and not permitir_expirado:
+                self._contadores["expirados"] += 1
+                return None
+
+            with banco:
+                banco.execute("UPDATE cep SET acessado_em = ? WHERE cep = ?", (agora, cep))
+            self._guardar_em_memoria(cep, dados, criado_em)
+            self._contadores["acertos_disco"] += 1
+            return dados
+
+    def guardar(self, cep: str, dados: dict) -> None:
+        """
+        Guarda a resposta da API para o CEP, descartando os CEPs menos usados se necessário.
+        """
+        agora = time.time()
+        with self._trava:
+            self._guardar_em_memoria(cep, dados, agora)
+
+            banco = self._banco()
+            if banco is None:
+                return
+            with banco:
+                banco.execute(
+                    "INSERT INTO cep (cep, dados, criado_em, acessado_em) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(cep) DO UPDATE SET dados = excluded.dados, "
+                    "criado_em = excluded.criado_em, acessado_em = excluded.acessado_em",
+                    (cep, json.dumps(dados), agora, agora)
+                )
+                excesso = banco.execute("SELECT COUNT(*) FROM cep").fetchone()[0] - self.limite
+                if excesso > 0:
+                    banco.execute(
+                        "DELETE FROM cep WHERE cep IN (SELECT cep FROM cep ORDER BY acessado_em LIMIT ?)",
+                        (excesso,)
+                    )
+                    self._contadores["descartados"] += excesso
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os contadores de acertos e falhas do cache.
+        """
+        with self._trava:
+            estatisticas = dict(self._contadores)
+            estatisticas["em_memoria"] = len(self._memoria)
+        return estatisticas
+
+    def limpar_memoria(self) -> None:
+        """
+        Esvazia apenas o cache em memória (o conteúdo em disco é mantido).
+        """
+        with self._trava:
+            self._memoria.clear()
@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from utils.voo_unico import VooUnico
+from utils.constantes import TTL_IDEMPOTENCIA, LIMITE_IDEMPOTENCIA
+
+
+class ChaveIdempotenciaReutilizadaError(ValueError):
+    """
+    Lançada quando uma chave de idempotência já usada chega com outros dados.
+    """
+
+    def __init__(self, chave: str):
+        super().__init__(f"A chave de idempotência '{chave}' já foi usada em outra operação.")
+
+
+class CacheIdempotencia:
+    """
+    Guarda o resultado de operações identificadas por uma chave de idempotência, para que
+    repetições (por exemplo, novas tentativas após um tempo esgotado) devolvam o resultado
+    original em vez de executar a operação de novo.
+
+    Cada resultado vale por `ttl` segundos e no máximo `limite` chaves ficam guardadas; ao
+    exceder o limite, as mais antigas são descartadas. Chamadas simultâneas com a mesma
+    chave são agrupadas (VooUnico): só a primeira executa, as demais recebem seu resultado.
+    """
+
+    def __init__(self, ttl: float = TTL_IDEMPOTENCIA, limite: int = LIMITE_IDEMPOTENCIA):
+        """
+        Args:
+            ttl (float, opcional): Validade de cada resultado, em segundos.
+            limite (int, opcional): Quantidade máxima de chaves guardadas.
+        """
+        self.ttl = ttl
+        self.limite = limite
+
+        self._resultados = OrderedDict()   # chave -> (impressao, resultado, criado_em), da mais antiga à mais nova
+        self._voo_unico = VooUnico()
+        self._trava = threading.Lock()
+        self._contadores = {"executadas": 0, "repetidas": 0, "expiradas": 0, "descartadas": 0}
+
+    def _descartar_antigas(self, agora: float) -> None:
+        """
+        Remove do início da fila as chaves expiradas e as que excedem o limite.
+        """
+        while self._resultados:
+            _, _, criado_em = next(iter(self._resultados.values()))
+            if agora - criado_em > self.ttl:
+                self._contadores["expiradas"] += 1
+            elif len(self._resultados) > self.limite:
+                self._contadores["descartadas"] += 1
+            else:
+                break
+            self._resultados.popitem(last=False)
+
+    def obter(self, chave: Hashable) -> Optional[tuple]:
+        """
+        Retorna (impressão, resultado) guardados para a chave, ou None se não houver ou se expirou.
+        """
+        with self._trava:
+            self._descartar_antigas(time.time())
+            registro = self._resultados.get(chave)
+            return registro[:2] if registro else None
+
+    def guardar(self, chave: Hashable, impressao: Hashable, resultado) -> None:
+        """
+        Guarda o resultado da operação feita com a chave.
+        """
+        agora = time.time()
+        with self._trava:
+            self._resultados.pop(chave, None)
+            self._resultados[chave] = (impressao, resultado, agora)
+            self._descartar_antigas(agora)
+
+    def executar(
+        self,
+        chave: Hashable,
+        impressao: Hashable,
+        funcao: Callable[[], dict],
+        guardar_se: Callable[[dict], bool] = lambda resultado: True
+    ):
+        """
+        Executa `funcao` uma única vez por chave e devolve o resultado guardado nas repetições.
+
+        Args:
+            chave: Chave de idempotência informada pelo chamador.
+            impressao: Resumo dos dados da operação; uma repetição deve trazer a mesma impressão.
+            funcao: Operação a executar.
+            guardar_se: Decide, pelo resultado, se ele deve ser guardado (resultados não guardados
+                deixam a chave livre para uma nova tentativa).
+
+        Raises:
+            ChaveIdempotenciaReutilizadaError: Se a chave já foi usada com outra impressão.
+        """
+        executou = False
+
+        def executar_ou_repetir() -> tuple:
+            nonlocal executou
+            registro = self.obter(chave)
+            if registro is not None:
+                return registro
+            resultado = funcao()
+            executou = True
+            if guardar_se(resultado):
+                self.guardar(chave, impressao, resultado)
+            return impressao, resultado
+
+        # Quem chega enquanto a mesma chave executa recebe o resultado de quem executou
+        impressao_original, resultado = self._voo_unico.executar(chave, executar_ou_repetir)
+        if impressao_original != impressao:
+            raise ChaveIdempotenciaReutilizadaError(chave)
+        with self._trava:
+            self._contadores["executadas" if executou else "repetidas"] += 1
+        return resultado
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os contadores de execuções, repetições e descartes.
+        """
+        with self._trava:
+            estatisticas = dict(self._contadores)
+            estatisticas["guardadas"] = len(self._resultados)
+        return estatisticas
+
+    def limpar(self) -> None:
+        """
+        Esquece todas as chaves guardadas.
+        """
+        with self._trava:
+            self._resultados.clear()
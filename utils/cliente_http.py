@@ -0,0 +1,249 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.logger import logger
+from utils.constantes import (
+    HTTP_TIMEOUT_CONEXAO,
+    HTTP_TIMEOUT_LEITURA,
+    HTTP_TENTATIVAS,
+    HTTP_ESPERA_BASE,
+    HTTP_ESPERA_MAXIMA,
+    HTTP_TAMANHO_POOL,
+    DISJUNTOR_LIMITE_FALHAS,
+    DISJUNTOR_TEMPO_RECUPERACAO
+)
+
+
+class ServicoIndisponivelError(ValueError):
+    """
+    Lançada quando o serviço externo não responde (timeout, falha de conexão,
+    erro 5xx) ou quando o disjuntor está aberto.
+
+    Herda de ValueError para que os controladores continuem tratando a falha
+    como um erro de validação comum, exibindo a mensagem ao usuário.
+    """
+    pass
+
+
+class DisjuntorCircuito:
+    """
+    Disjuntor (circuit breaker) para chamadas a um serviço externo.
+
+    - FECHADO: as chamadas passam normalmente; falhas consecutivas são contadas.
+    - ABERTO: após `limite_falhas` falhas seguidas, as chamadas são recusadas de imediato
+      durante `tempo_recuperacao` segundos.
+    - MEIO_ABERTO: passado esse tempo, uma única chamada de teste é liberada; se der certo
+      o disjuntor fecha, se falhar ele abre novamente.
+    """
+
+    FECHADO     = "fechado"
+    ABERTO      = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(self, limite_falhas: int = DISJUNTOR_LIMITE_FALHAS, tempo_recuperacao: float = DISJUNTOR_TEMPO_RECUPERACAO):
+        self.limite_falhas = limite_falhas
+        self.tempo_recuperacao = tempo_recuperacao
+
+        self._estado = self.FECHADO
+        self._falhas_seguidas = 0
+        self._aberto_em = 0.0
+        self._teste_em_andamento = False
+        self._aberturas = 0
+        self._recusadas = 0
+        self._trava = threading.Lock()
+
+    def permitir(self) -> bool:
+        """
+        Indica se uma chamada pode ser feita agora.
+        """
+        with self._trava:
+            if self._estado == self.ABERTO and time.monotonic() - self._aberto_em >= self.tempo_recuperacao:
+                self._estado = self.MEIO_ABERTO
+                self._teste_em_andamento = False
+
+            if self._estado == self.FECHADO:
+                return True
+            if self._estado == self.MEIO_ABERTO and not self._teste_em_andamento:
+                self._teste_em_andamento = True
+                return True
+
+            self._recusadas += 1
+            return False
+
+    def registrar_sucesso(self) -> None:
+        with self._trava:
+            self._estado = self.FECHADO
+            self._falhas_seguidas = 0
+            self._teste_em_andamento = False
+
+    def registrar_falha(self) -> None:
+        with self._trava:
+            self._falhas_seguidas += 1
+            self._teste_em_andamento = False
+            if self._estado == self.MEIO_ABERTO or self._falhas_seguidas >= self.limite_falhas:
+                if self._estado != self.ABERTO:
+                    self._aberturas += 1
+                    logger.warning(f"Disjuntor aberto após {self._falhas_seguidas} falha(s) seguida(s).")
+                self._estado = self.ABERTO
+                self._aberto_em = time.monotonic()
+
+    def get_estado(self) -> str:
+        with self._trava:
+            return self._estado
+
+    def estatisticas(self) -> dict:
+        with self._trava:
+            return {
+                "estado": self._estado,
+                "falhas_seguidas": self._falhas_seguidas,
+                "aberturas": self._aberturas,
+                "recusadas": self._recusadas,
+            }
+
+
+class ClienteHTTP:
+    """
+    Cliente HTTP compartilhado para serviços externos.
+
+    Mantém um pool de conexões keep-alive (uma única requests.Session), aplica
+    timeouts de conexão e de leitura em toda requisição, repete falhas transitórias
+    um número limitado de vezes com espera exponencial e jitter, e protege o serviço
+    com um DisjuntorCircuito.
+    """
+
+    def __init__(
+        self,
+        timeout_conexao: float = HTTP_TIMEOUT_CONEXAO,
+        timeout_leitura: float = HTTP_TIMEOUT_LEITURA,
+        tentativas: int = HTTP_TENTATIVAS,
+        espera_base: float = HTTP_ESPERA_BASE,
+        espera_maxima: float = HTTP_ESPERA_MAXIMA,
+        tamanho_pool: int = HTTP_TAMANHO_POOL,
+        disjuntor: DisjuntorCircuito = None
+    ):
+        """
+        Args:
+            timeout_conexao (float, opcional): Tempo máximo para abrir a conexão, em segundos.
+            timeout_leitura (float, opcional): Tempo máximo de espera pela resposta, em segundos.
+            tentativas (int, opcional): Novas tentativas após a primeira falha transitória.
+            espera_base (float, opcional): Espera inicial entre tentativas, dobrada a cada nova tentativa.
+            espera_maxima (float, opcional): Limite da espera entre tentativas.
+            tamanho_pool (int, opcional): Conexões mantidas abertas por host.
+            disjuntor (DisjuntorCircuito, opcional): Disjuntor a usar. Padrão: um novo disjuntor.
+        """
+        self.timeout = (timeout_conexao, timeout_leitura)
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.disjuntor = disjuntor or DisjuntorCircuito()
+
+        self._sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool, max_retries=0)
+        self._sessao.mount("https://", adaptador)
+        self._sessao.mount("http://", adaptador)
+
+        self._trava = threading.Lock()
+        self._contadores = {
+            "requisicoes": 0,
+            "repeticoes": 0,
+            "falhas": 0,
+        }
+
+    def _contar(self, chave: str) -> None:
+        with self._trava:
+            self._contadores[chave] += 1
+
+    def _espera(self, tentativa: int) -> float:
+        """
+        Espera exponencial com jitter: entre metade e o valor cheio de base * 2^tentativa.
+        """
+        espera = min(self.espera_maxima, self.espera_base * (2 ** tentativa))
+        return random.uniform(espera / 2, espera)
+
+    def get_json(self, url: str) -> dict:
+        """
+        Faz um GET e retorna o corpo JSON da resposta.
+
+        Falhas da requisição (conexão, timeout e demais erros do requests) e respostas 5xx/429
+        são repetidas até `tentativas` vezes. Respostas 4xx são devolvidas ao chamador como
+        ValueError, sem nova tentativa e sem contar como falha do serviço.
+
+        Raises:
+            ServicoIndisponivelError: Se o disjuntor estiver aberto ou todas as tentativas falharem.
+            ValueError: Se o serviço responder com erro do cliente (4xx).
+        """
+        if not self.disjuntor.permitir():
+            raise ServicoIndisponivelError("Serviço temporariamente indisponível. Tente novamente mais tarde.")
+
+        resposta = None
+        try:
+            resposta = self._get_com_repeticoes(url)
+        finally:
+            # Toda chamada liberada pelo disjuntor é registrada, inclusive a que termina com uma
+            # exceção inesperada; senão, a chamada de teste do meio-aberto nunca seria concluída
+            if resposta is None:
+                self._contar("falhas")
+                self.disjuntor.registrar_falha()
+        if resposta is None:
+            raise ServicoIndisponivelError("Serviço temporariamente indisponível. Tente novamente mais tarde.")
+
+        self.disjuntor.registrar_sucesso()
+        if resposta.status_code != 200:
+            raise ValueError(f"Requisição recusada pelo serviço (HTTP {resposta.status_code}).")
+        return resposta.json()
+
+    def _get_com_repeticoes(self, url: str):
+        """
+        Faz o GET repetindo as falhas transitórias.
+
+        Returns:
+            requests.Response | None: A primeira resposta que não seja 5xx/429, ou None se
+            todas as tentativas falharem.
+        """
+        for tentativa in range(self.tentativas + 1):
+            if tentativa > 0:
+                self._contar("repeticoes")
+                time.sleep(self._espera(tentativa - 1))
+
+            self._contar("requisicoes")
+            try:
+                resposta = self._sessao.get(url, timeout=self.timeout)
+            except requests.RequestException as e:
+                logger.warning(f"Falha ao acessar {url} (tentativa {tentativa + 1}): {e}")
+                continue
+
+            if resposta.status_code >= 500 or resposta.status_code == 429:
+                logger.warning(f"Resposta {resposta.status_code} de {url} (tentativa {tentativa + 1}).")
+                continue
+            return resposta
+        return None
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna as métricas do cliente: requisições, repetições, falhas, conexões abertas
+        pelo pool (a diferença para as requisições indica o reaproveitamento) e o estado do disjuntor.
+        """
+        conexoes_abertas = 0
+        for adaptador in set(self._sessao.adapters.values()):
+            pools = adaptador.poolmanager.pools
+            for chave in pools.keys():
+                pool = pools.get(chave)
+                if pool is not None:
+                    conexoes_abertas += pool.num_connections
+
+        with self._trava:
+            estatisticas = dict(self._contadores)
+        estatisticas["conexoes_abertas"] = conexoes_abertas
+        estatisticas["conexoes_reaproveitadas"] = max(0, estatisticas["requisicoes"] - conexoes_abertas)
+        estatisticas["disjuntor"] = self.disjuntor.estatisticas()
+        return estatisticas
+
+    def fechar(self) -> None:
+        """
+        Fecha as conexões mantidas pelo pool.
+        """
+        self._sessao.close()
@@ -0,0 +1,280 @@
+from datetime import datetime
+from typing import IO, Iterator, NamedTuple
+
+# Arquivos CNAB 240 (padrão FEBRABAN) de pagamentos: remessa enviada pela empresa e
+# retorno devolvido pelo banco. Cada registro é uma linha de 240 posições; as posições
+# usadas abaixo seguem o manual FEBRABAN (a partir de 1, intervalos inclusivos). Apenas
+# os campos usados pelo sistema são interpretados; os demais são devolvidos como vieram.
+
+TAMANHO_REGISTRO = 240
+
+REGISTRO_HEADER_ARQUIVO = "0"
+REGISTRO_HEADER_LOTE = "1"
+REGISTRO_DETALHE = "3"
+REGISTRO_TRAILER_LOTE = "5"
+REGISTRO_TRAILER_ARQUIVO = "9"
+
+SEGMENTO_PAGAMENTO = "A"
+MOVIMENTO_INCLUSAO = "0"
+CODIGO_REMESSA = "1"
+CODIGO_RETORNO = "2"
+
+# Códigos de ocorrência do retorno (posições 231-240, até cinco códigos de 2 caracteres)
+OCORRENCIA_EFETIVADO = "00"
+OCORRENCIA_SALDO_INSUFICIENTE = "01"
+OCORRENCIA_INSCRICAO_INVALIDA = "AE"
+OCORRENCIA_CONTA_PAGADOR_INVALIDA = "AG"
+OCORRENCIA_MOVIMENTO_INVALIDO = "AJ"
+OCORRENCIA_CONTA_FAVORECIDO_INVALIDA = "AN"
+OCORRENCIA_VALOR_INVALIDO = "AR"
+
+OCORRENCIAS = {
+    OCORRENCIA_EFETIVADO: "Crédito ou débito efetivado",
+    OCORRENCIA_SALDO_INSUFICIENTE: "Insuficiência de fundos - débito não efetuado",
+    OCORRENCIA_INSCRICAO_INVALIDA: "Tipo/número de inscrição inválido",
+    OCORRENCIA_CONTA_PAGADOR_INVALIDA: "Agência/conta corrente/DV inválido",
+    OCORRENCIA_MOVIMENTO_INVALIDO: "Tipo de movimento inválido",
+    OCORRENCIA_CONTA_FAVORECIDO_INVALIDA: "Conta corrente/DV do favorecido inválido",
+    OCORRENCIA_VALOR_INVALIDO: "Valor do lançamento inválido",
+}
+
+
+class ArquivoCNABInvalidoError(ValueError):
+    """
+    Lançada quando o arquivo não segue a estrutura CNAB 240 (tamanho ou ordem dos registros).
+    """
+
+
+class PagamentoCNAB(NamedTuple):
+    """
+    Campos de um registro detalhe, segmento A (pagamento a um favorecido).
+    """
+
+    lote: int
+    sequencial: int
+    movimento: str
+    conta_favorecido: str
+    nome_favorecido: str
+    seu_numero: str
+    valor_centavos: int
+
+
+class LoteCNAB(NamedTuple):
+    """
+    Campos do header de lote: a empresa pagadora e a conta a debitar.
+    """
+
+    lote: int
+    cnpj: str
+    conta: str
+    nome_empresa: str
+
+
+# === Leitura ===
+
+def _campo(linha: str, inicio: int, fim: int) -> str:
+    return linha[inicio - 1:fim]
+
+
+def _numero(texto: str) -> str:
+    """
+    Remove os zeros à esquerda de um campo numérico ("000000001001" -> "1001").
+    """
+    return texto.strip().lstrip("0") or "0"
+
+
+def ler_registros(arquivo: IO[str]) -> Iterator[str]:
+    """
+    Percorre os registros do arquivo, um por vez (memória constante em relação ao tamanho).
+
+    Raises:
+        ArquivoCNABInvalidoError: Se algum registro não tiver 240 posições.
+    """
+    for numero, linha in enumerate(arquivo, 1):
+        linha = linha.rstrip("\r\n")
+        if not linha:
+            continue
+        if len(linha) != TAMANHO_REGISTRO:
+            raise ArquivoCNABInvalidoError(
+                f"Registro {numero} com {len(linha)} posições (esperadas {TAMANHO_REGISTRO})."
+            )
+        yield linha
+
+
+def tipo_registro(linha: str) -> str:
+    return linha[7]
+
+
+def segmento(linha: str) -> str:
+    return linha[13]
+
+
+def ler_lote(linha: str) -> LoteCNAB:
+    """
+    Interpreta um header de lote.
+    """
+    return LoteCNAB(
+        lote=int(_campo(linha, 4, 7)),
+        cnpj=_campo(linha, 19, 32),
+        conta=_numero(_campo(linha, 59, 70)),
+        nome_empresa=_campo(linha, 73, 102).rstrip()
+    )
+
+
+def ler_pagamento(linha: str) -> PagamentoCNAB:
+    """
+    Interpreta um registro detalhe do segmento A.
+
+    Raises:
+        ArquivoCNABInvalidoError: Se o valor não for numérico.
+    """
+    valor = _campo(linha, 120, 134)
+    if not valor.isdigit():
+        raise ArquivoCNABInvalidoError(f"Valor não numérico no registro {_campo(linha, 9, 13)} do lote.")
+    return PagamentoCNAB(
+        lote=int(_campo(linha, 4, 7)),
+        sequencial=int(_campo(linha, 9, 13)),
+        movimento=_campo(linha, 15, 15),
+        conta_favorecido=_numero(_campo(linha, 30, 41)),
+        nome_favorecido=_campo(linha, 44, 73).rstrip(),
+        seu_numero=_campo(linha, 74, 93).rstrip(),
+        valor_centavos=int(valor)
+    )
+
+
+def validar_estrutura(arquivo: IO[str]) -> int:
+    """
+    Confere a estrutura do arquivo inteiro sem guardar os registros: header de arquivo no
+    início, detalhes sempre dentro de um lote, quantidades dos trailers de lote e de arquivo
+    e valores numéricos no segmento A.
+
+    Returns:
+        int: Quantidade de registros do arquivo.
+
+    Raises:
+        ArquivoCNABInvalidoError: Na primeira inconsistência encontrada.
+    """
+    total = 0
+    lotes = 0
+    lote_aberto = None
+    registros_lote = 0
+    fim = False
+    for linha in ler_registros(arquivo):
+        total += 1
+        tipo = tipo_registro(linha)
+        if fim:
+            raise ArquivoCNABInvalidoError(f"Registro {total} após o trailer de arquivo.")
+        if total == 1 and tipo != REGISTRO_HEADER_ARQUIVO:
+            raise ArquivoCNABInvalidoError("O arquivo deve começar pelo header de arquivo.")
+
+        if tipo == REGISTRO_HEADER_ARQUIVO:
+            if total != 1:
+                raise ArquivoCNABInvalidoError(f"Header de arquivo repetido no registro {total}.")
+        elif tipo == REGISTRO_HEADER_LOTE:
+            if lote_aberto is not None:
+                raise ArquivoCNABInvalidoError(f"Lote {lote_aberto} sem trailer (registro {total}).")
+            lote_aberto = _campo(linha, 4, 7)
+            registros_lote = 1
+        elif tipo == REGISTRO_DETALHE:
+            if lote_aberto is None or _campo(linha, 4, 7) != lote_aberto:
+                raise ArquivoCNABInvalidoError(f"Registro detalhe {total} fora de um lote.")
+            if segmento(linha) == SEGMENTO_PAGAMENTO and not _campo(linha, 120, 134).isdigit():
+                raise ArquivoCNABInvalidoError(f"Valor não numérico no registro {total}.")
+            registros_lote += 1
+        elif tipo == REGISTRO_TRAILER_LOTE:
+            if lote_aberto is None or _campo(linha, 4, 7) != lote_aberto:
+                raise ArquivoCNABInvalidoError(f"Trailer de lote {total} sem header correspondente.")
+            registros_lote += 1
+            if _campo(linha, 18, 23) != _num(registros_lote, 6):
+                raise ArquivoCNABInvalidoError(f"Quantidade de registros do lote {lote_aberto} não confere.")
+            lote_aberto = None
+            lotes += 1
+        elif tipo == REGISTRO_TRAILER_ARQUIVO:
+            if lote_aberto is not None:
+                raise ArquivoCNABInvalidoError(f"Lote {lote_aberto} sem trailer.")
+            # Os campos de quantidade têm 6 posições: acima de 999.999 registros valem os últimos dígitos
+            if _campo(linha, 18, 23) != _num(lotes, 6) or _campo(linha, 24, 29) != _num(total, 6):
+                raise ArquivoCNABInvalidoError("Quantidades do trailer de arquivo não conferem.")
+            fim = True
+        else:
+            raise ArquivoCNABInvalidoError(f"Tipo de registro '{tipo}' desconhecido no registro {total}.")
+
+    if not fim:
+        raise ArquivoCNABInvalidoError("Arquivo sem trailer de arquivo.")
+    return total
+
+
+# === Geração ===
+
+def _alfa(texto: str, tamanho: int) -> str:
+    return str(texto)[:tamanho].ljust(tamanho)
+
+
+def _num(valor, tamanho: int) -> str:
+    return str(valor).rjust(tamanho, "0")[-tamanho:]
+
+
+def _montar(*partes: str) -> str:
+    linha = "".join(partes)
+    if len(linha) != TAMANHO_REGISTRO:
+        raise ArquivoCNABInvalidoError(f"Registro gerado com {len(linha)} posições.")
+    return linha
+
+
+def gerar_header_arquivo(banco: str, cnpj: str, conta: str, nome_empresa: str, nsa: int,
+                         codigo: str = CODIGO_REMESSA, data: datetime = None) -> str:
+    data = data or datetime.now()
+    return _montar(
+        _num(banco, 3), "0000", REGISTRO_HEADER_ARQUIVO, " " * 9, "2", _num(cnpj, 14), " " * 20,
+        "00000", " ", _num(conta, 12), " ", " ", _alfa(nome_empresa, 30), _alfa("SISTEMA BANCARIO", 30),
+        " " * 10, codigo, data.strftime("%d%m%Y"), data.strftime("%H%M%S"), _num(nsa, 6), "089",
+        "00000", " " * 20, " " * 20, " " * 29
+    )
+
+
+def gerar_header_lote(banco: str, lote: int, cnpj: str, conta: str, nome_empresa: str) -> str:
+    return _montar(
+        _num(banco, 3), _num(lote, 4), REGISTRO_HEADER_LOTE, "C", "20", "01", "045", " ", "2",
+        _num(cnpj, 14), " " * 20, "00000", " ", _num(conta, 12), " ", " ", _alfa(nome_empresa, 30),
+        " " * 40, " " * 30, "00000", " " * 15, " " * 20, "00000", "   ", "  ", "  ", " " * 6, " " * 10
+    )
+
+
+def gerar_pagamento(banco: str, lote: int, sequencial: int, conta_favorecido: str, nome_favorecido: str,
+                    valor_centavos: int, seu_numero: str = "", data: datetime = None,
+                    movimento: str = MOVIMENTO_INCLUSAO) -> str:
+    data = data or datetime.now()
+    return _montar(
+        _num(banco, 3), _num(lote, 4), REGISTRO_DETALHE, _num(sequencial, 5), SEGMENTO_PAGAMENTO,
+        movimento, "00", "000", _num(banco, 3), "00000", " ", _num(conta_favorecido, 12), " ", " ",
+        _alfa(nome_favorecido, 30), _alfa(seu_numero, 20), data.strftime("%d%m%Y"), "BRL",
+        "0" * 15, _num(valor_centavos, 15), " " * 20, "0" * 8, "0" * 15, " " * 40, "  ", " " * 5,
+        "  ", " " * 3, "0", " " * 10
+    )
+
+
+def gerar_trailer_lote(banco: str, lote: int, quantidade_registros: int, soma_centavos: int) -> str:
+    return _montar(
+        _num(banco, 3), _num(lote, 4), REGISTRO_TRAILER_LOTE, " " * 9, _num(quantidade_registros, 6),
+        _num(soma_centavos, 18), "0" * 18, "0" * 6, " " * 165, " " * 10
+    )
+
+
+def gerar_trailer_arquivo(banco: str, quantidade_lotes: int, quantidade_registros: int) -> str:
+    return _montar(
+        _num(banco, 3), "9999", REGISTRO_TRAILER_ARQUIVO, " " * 9, _num(quantidade_lotes, 6),
+        _num(quantidade_registros, 6), "0" * 6, " " * 205
+    )
+
+
+def marcar_retorno(linha: str, ocorrencia: str = None) -> str:
+    """
+    Converte um registro da remessa no registro correspondente do retorno: o header de
+    arquivo recebe o código de retorno e os registros de lote e detalhe, a ocorrência.
+    """
+    tipo = tipo_registro(linha)
+    if tipo == REGISTRO_HEADER_ARQUIVO:
+        return linha[:142] + CODIGO_RETORNO + linha[143:]
+    if ocorrencia is not None and tipo in (REGISTRO_HEADER_LOTE, REGISTRO_DETALHE, REGISTRO_TRAILER_LOTE):
+        return linha[:230] + _alfa(ocorrencia, 10)
+    return linha
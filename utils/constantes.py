@@ -13,8 +13,69 @@ ARQUIVO_CONTAS   = "contas.json"
 ARQUIVO_CLIENTES = "clientes.json"
 ARQUIVO_PESSOAS  = "pessoas.json"
 
+# Backend de armazenamento da classe DAO
+BACKEND_JSON          = "json"
+BACKEND_JOURNAL       = "journal"       # JSON + log de alterações com compactação em segundo plano
+BACKEND_SQLITE        = "sqlite"
+BACKEND_ARMAZENAMENTO = BACKEND_JSON    # Troque para BACKEND_JOURNAL ou BACKEND_SQLITE
+DIRETORIO_DATABASE    = "database"
+ARQUIVO_SQLITE        = "banco.db"      # Uma tabela por entidade (contas, clientes, pessoas)
+LIMITE_JOURNAL_COMPACTACAO = 1000       # Linhas no log que disparam a compactação
+JOURNAL_FSYNC              = True       # Força a gravação em disco a cada operação do log
+DIRETORIO_HISTORICO        = "historico"  # Histórico das contas: um arquivo .jsonl por conta
+LIVRO_RAZAO_FSYNC          = True       # Força a gravação em disco a cada acréscimo no histórico
+BLOCO_LEITURA_HISTORICO    = 64 * 1024  # Bytes lidos por vez ao percorrer o histórico de trás para frente
+EXTRATO_LIMITE_PADRAO      = 10         # Transações por página do extrato
+CHECKPOINT_INTERVALO       = 1000       # Transações entre pontos de controle de saldo (além de um por mês)
+DIRETORIO_FECHAMENTOS      = "fechamentos"  # Progresso das execuções do fechamento mensal, por período
+FECHAMENTO_CONTAS_POR_PARTICAO = 20000   # Contas processadas por tarefa no fechamento mensal
+TRANSFERENCIAS_POR_BLOCO   = 1000       # Transferências aplicadas entre gravações no processamento em lote
+DIRETORIO_UNIDADES_TRABALHO = "unidades_de_trabalho"    # Um registro por unidade confirmada ainda não aplicada (refeitos na recuperação)
+ARQUIVO_SEQUENCIA_CONTAS   = "sequencia_contas.json"     # Próximo número de conta ainda não reservado
+SEQUENCIA_BLOCO_CONTAS     = 100        # Números de conta reservados por processo a cada acesso ao arquivo
+NUMERO_CONTA_INICIAL       = 1001       # Primeiro número de conta de uma base vazia
+
+# Gravação adiada das contas alteradas por transferências (classe GravadorContas)
+DURABILIDADE_SINCRONA      = "sincrona"     # Cada transferência é gravada antes de retornar
+DURABILIDADE_ASSINCRONA    = "assincrona"   # Gravação em segundo plano; perda limitada a um intervalo
+DURABILIDADE_CONTAS        = DURABILIDADE_SINCRONA
+GRAVACAO_PARTICOES         = 16         # Partições do conjunto de contas sujas, cada uma com sua trava
+PERSISTENCIA_INTERVALO     = 1.0        # Segundos entre gravações no modo assíncrono
+PERSISTENCIA_LIMITE_SUJAS  = 1000       # Contas sujas que antecipam a gravação no modo assíncrono
+
+# Cache persistente de consultas de CEP (classe API)
+ARQUIVO_CACHE_CEP        = "cache_cep.db"
+TTL_CACHE_CEP            = 30 * 24 * 60 * 60    # Validade de cada CEP em cache (segundos)
+LIMITE_CACHE_CEP         = 100000               # Máximo de CEPs guardados em disco
+LIMITE_CACHE_CEP_MEMORIA = 5000                 # Máximo de CEPs guardados em memória
+
+# Chaves de idempotência de pagamentos (classe PagamentoController)
+TTL_IDEMPOTENCIA         = 24 * 60 * 60         # Validade do resultado guardado para cada chave (segundos)
+LIMITE_IDEMPOTENCIA      = 100000               # Máximo de chaves guardadas em memória
+
+# Cliente HTTP para serviços externos (classe API)
+URL_VIACEP                  = "https://viacep.com.br/ws/{cep}/json/"
+HTTP_TIMEOUT_CONEXAO        = 3.05      # Segundos para abrir a conexão
+HTTP_TIMEOUT_LEITURA        = 5.0       # Segundos de espera pela resposta
+HTTP_TENTATIVAS             = 2         # Novas tentativas após uma falha transitória
+HTTP_ESPERA_BASE            = 0.2       # Espera inicial entre tentativas (segundos, dobra a cada vez)
+HTTP_ESPERA_MAXIMA          = 2.0       # Espera máxima entre tentativas (segundos)
+HTTP_TAMANHO_POOL           = 10        # Conexões keep-alive mantidas por host
+DISJUNTOR_LIMITE_FALHAS     = 5         # Falhas seguidas que abrem o disjuntor
+DISJUNTOR_TEMPO_RECUPERACAO = 30.0      # Segundos com o disjuntor aberto antes de testar de novo
+CONCORRENCIA_CEP            = 8         # Consultas de CEP simultâneas na resolução em lote
+
 # Nome de tipos 
 TIPO_CCORRENTE = "corrente"
 TIPO_CPOUPANCA = "poupanca"
 TIPO_PFISICA   = "fisica"
 TIPO_PJURIDICA = "juridica"
+
+# Tipos de transação (histórico da conta)
+TRANSACAO_DEPOSITO     = "deposito"
+TRANSACAO_ENVIO        = "envio"          # Transferência enviada
+TRANSACAO_RECEBIMENTO  = "recebimento"    # Transferência recebida
+TRANSACAO_TAXA         = "taxa"           # Taxa de manutenção mensal
+TRANSACAO_RENDIMENTO   = "rendimento"     # Rendimento mensal
+TRANSACAO_ENCERRAMENTO = "encerramento"
+TRANSACAO_OUTRA        = "outra"          # Texto livre (histórico legado não reconhecido)
@@ -0,0 +1,130 @@
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterator
+
+
+class GerenciadorTravas:
+    """
+    Travas de exclusão mútua por chave (por exemplo, por número de conta).
+
+    `travar` adquire as travas de várias chaves sempre na mesma ordem (chaves ordenadas),
+    de modo que duas threads que precisem das mesmas contas nunca esperem uma pela outra
+    em ciclo (sem impasse), enquanto operações sobre chaves disjuntas seguem em paralelo.
+
+    Cada trava só existe enquanto alguma thread a usa ou espera por ela; a memória ocupada
+    depende das operações em andamento, não da quantidade de chaves já vistas. As travas
+    não são reentrantes: quem já detém uma chave não deve chamar `travar` de novo com ela.
+
+    `travar_tudo` dá a uma thread acesso exclusivo a todas as chaves (por exemplo, para um
+    processamento sobre todas as contas): espera as operações em andamento terminarem e
+    segura as novas até o fim do bloco. A própria thread pode usar `travar` nesse meio tempo.
+    """
+
+    def __init__(self):
+        self._travas: dict[str, list] = {}   # chave -> [Lock, threads usando ou esperando]
+        self._trava = threading.Lock()
+        self._liberado = threading.Condition(self._trava)
+        self._em_andamento = 0          # Blocos `travar` de outras threads já iniciados
+        self._exclusivo = None          # Thread com acesso exclusivo (travar_tudo), se houver
+        self._profundidade_exclusivo = 0
+        self._contadores = {"aquisicoes": 0, "esperas": 0}
+
+    def _entrar(self) -> bool:
+        """
+        Espera um acesso exclusivo de outra thread terminar. Retorna True se o bloco conta
+        como operação em andamento (False para a própria thread com acesso exclusivo).
+        """
+        atual = threading.get_ident()
+        with self._trava:
+            if self._exclusivo == atual:
+                return False
+            if self._exclusivo is not None:
+                self._contadores["esperas"] += 1
+                while self._exclusivo is not None:
+                    self._liberado.wait()
+            self._em_andamento += 1
+            return True
+
+    def _sair(self) -> None:
+        with self._trava:
+            self._em_andamento -= 1
+            if self._em_andamento == 0:
+                self._liberado.notify_all()
+
+    def _reservar(self, chave: str) -> threading.Lock:
+        with self._trava:
+            entrada = self._travas.get(chave)
+            if entrada is None:
+                entrada = self._travas[chave] = [threading.Lock(), 0]
+            entrada[1] += 1
+            return entrada[0]
+
+    def _devolver(self, chave: str) -> None:
+        with self._trava:
+            entrada = self._travas[chave]
+            entrada[1] -= 1
+            if entrada[1] == 0:
+                del self._travas[chave]
+
+    @contextmanager
+    def travar(self, *chaves: Hashable) -> Iterator[None]:
+        """
+        Detém as travas de todas as chaves (repetições são ignoradas) durante o bloco `with`.
+        """
+        em_andamento = self._entrar()
+        reservadas = []
+        adquiridas = []
+        try:
+            for chave in sorted({str(c) for c in chaves}):
+                trava = self._reservar(chave)
+                reservadas.append(chave)
+                if not trava.acquire(blocking=False):
+                    with self._trava:
+                        self._contadores["esperas"] += 1
+                    trava.acquire()
+                adquiridas.append(trava)
+            with self._trava:
+                self._contadores["aquisicoes"] += 1
+            yield
+        finally:
+            for trava in reversed(adquiridas):
+                trava.release()
+            for chave in reversed(reservadas):
+                self._devolver(chave)
+            if em_andamento:
+                self._sair()
+
+    @contextmanager
+    def travar_tudo(self) -> Iterator[None]:
+        """
+        Detém acesso exclusivo a todas as chaves durante o bloco `with` (reentrante para a
+        mesma thread). Não deve ser chamado por quem já está dentro de um bloco `travar`.
+        """
+        atual = threading.get_ident()
+        with self._trava:
+            if self._exclusivo != atual:
+                while self._exclusivo is not None:
+                    self._liberado.wait()
+                # Marcado antes de esperar: novas operações já ficam seguras
+                self._exclusivo = atual
+                while self._em_andamento:
+                    self._liberado.wait()
+            self._profundidade_exclusivo += 1
+        try:
+            yield
+        finally:
+            with self._trava:
+                self._profundidade_exclusivo -= 1
+                if self._profundidade_exclusivo == 0:
+                    self._exclusivo = None
+                    self._liberado.notify_all()
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna quantas vezes as travas foram adquiridas, quantas aquisições precisaram esperar
+        e quantas chaves estão em uso no momento.
+        """
+        with self._trava:
+            estatisticas = dict(self._contadores)
+            estatisticas["em_uso"] = len(self._travas)
+        return estatisticas
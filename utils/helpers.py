@@ -1,3 +1,4 @@
+import re
 from datetime import datetime
 
 def data_hora_atual_str() -> str:
@@ -28,3 +29,28 @@ def converter_str_para_datetime(data_str: str, formato: str = "%d/%m/%Y") -> dat
     except ValueError as e:
         # Repassa o erro com mensagem mais amigável
         raise ValueError(f"Data '{data_str}' não está no formato esperado '{formato}'.") from e
+
+def normalizar_documento(documento) -> str:
+    """
+    Retorna o CPF/CNPJ apenas com dígitos, para comparar documentos independentemente da formatação.
+
+    Args:
+        documento (str): Documento, formatado ou não (ex.: "157.112.896-40").
+
+    Returns:
+        str: Apenas os dígitos do documento (ex.: "15711289640").
+    """
+    return re.sub(r'\D', '', str(documento or ""))
+
+def normalizar_email(email) -> str:
+    """
+    Retorna o e-mail sem espaços nas pontas e em minúsculas, para comparar e-mails sem
+    diferenciar maiúsculas.
+
+    Args:
+        email (str): E-mail informado.
+
+    Returns:
+        str: E-mail normalizado.
+    """
+    return str(email or "").strip().lower()
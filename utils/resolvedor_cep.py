@@ -0,0 +1,78 @@
+import asyncio
+from typing import Iterable
+
+from utils.api import API
+from utils.logger import logger
+from utils.constantes import CONCORRENCIA_CEP
+
+
+class ResolvedorCEP:
+    """
+    Resolve muitos CEPs de uma vez, de forma assíncrona, antes da criação das Pessoas.
+
+    Os CEPs do lote são normalizados (apenas dígitos) e deduplicados; os que já estão
+    no cache não geram requisição. Os demais são consultados em paralelo, com no máximo
+    `concorrencia` requisições simultâneas, pelo mesmo cliente HTTP (pool de conexões,
+    timeouts e disjuntor) usado pela classe API; um CEP que já esteja sendo consultado
+    por outra tela ou lote é aguardado em vez de consultado de novo. Cada resposta obtida
+    vai para o cache, de modo que as Pessoas criadas em seguida resolvem o endereço sem
+    acessar a rede.
+    """
+
+    def __init__(self, concorrencia: int = CONCORRENCIA_CEP):
+        """
+        Args:
+            concorrencia (int, opcional): Máximo de consultas simultâneas à API.
+        """
+        self.concorrencia = concorrencia
+
+    @staticmethod
+    def _normalizar(ceps: Iterable[str]) -> list[str]:
+        """
+        Retorna os CEPs do lote apenas com dígitos, sem repetições e na ordem original.
+        """
+        return list(dict.fromkeys(''.join(filter(str.isdigit, str(cep))) for cep in ceps if cep))
+
+    async def resolver(self, ceps: Iterable[str]) -> dict:
+        """
+        Resolve os CEPs informados e preenche o cache.
+
+        Args:
+            ceps (Iterable[str]): CEPs do lote, com ou sem máscara, podendo haver repetições.
+
+        Returns:
+            dict: Mapeia cada CEP (apenas dígitos) para a resposta da ViaCEP ou,
+                  se a consulta falhar, para a mensagem de erro (str).
+        """
+        unicos = self._normalizar(ceps)
+        resultados = {}
+        pendentes = []
+        for cep in unicos:
+            dados = API._cache.obter(cep)
+            if dados is not None:
+                resultados[cep] = dados
+            else:
+                pendentes.append(cep)
+
+        semaforo = asyncio.Semaphore(self.concorrencia)
+
+        async def consultar(cep: str) -> None:
+            async with semaforo:
+                try:
+                    resultados[cep] = await API.consultar_cep_async(cep)
+                except ValueError as e:
+                    resultados[cep] = str(e)
+
+        await asyncio.gather(*(consultar(cep) for cep in pendentes))
+
+        logger.info(
+            f"Lote de CEPs resolvido: {len(unicos)} únicos, {len(unicos) - len(pendentes)} em cache, "
+            f"{len(pendentes)} consultados."
+        )
+        return {cep: resultados[cep] for cep in unicos}
+
+    def resolver_em_lote(self, ceps: Iterable[str]) -> dict:
+        """
+        Versão síncrona de `resolver`, para chamadores fora de um loop asyncio.
+        """
+        return asyncio.run(self.resolver(ceps))
@@ -131,20 +131,23 @@ class ValidarConta:
     @staticmethod
     def _historico(historico: list) -> None:
         """
-        Valida se o histórico da conta é uma lista de strings.
+        Valida se o histórico da conta é uma lista de transações.
+
+        Cada item pode ser uma Transacao (tupla), sua forma compacta (lista)
+        ou uma string do histórico legado.
 
         Args:
             historico (list): Lista que representa o histórico a ser validado.
 
         Raises:
             TypeError: Se o histórico não for uma lista.
-            TypeError: Se algum item da lista não for uma string.
+            TypeError: Se algum item da lista não for uma transação ou string.
         """
         if not isinstance(historico, list):
             raise TypeError("Histórico da conta deve ser uma lista.")
         for item in historico:
-            if not isinstance(item, str):
-                raise TypeError("Cada item do histórico da conta deve ser uma string.")
+            if not isinstance(item, (str, list, tuple)):
+                raise TypeError("Cada item do histórico da conta deve ser uma transação ou string.")
 
     @staticmethod
     def estado_da_conta(estado: bool) -> None:
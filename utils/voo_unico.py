@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class VooUnico:
+    """
+    Agrupa chamadas concorrentes idênticas (single-flight).
+
+    Enquanto uma chamada para uma chave estiver em andamento, novas chamadas com a
+    mesma chave não repetem o trabalho: esperam o mesmo Future e recebem o mesmo
+    resultado ou a mesma exceção. Terminada a chamada, a chave é liberada e a próxima
+    chamada volta a executar a função.
+
+    Funciona para chamadores em threads (`executar`) e em corrotinas (`executar_async`),
+    inclusive misturados, pois ambos compartilham os mesmos Futures.
+    """
+
+    def __init__(self):
+        self._em_andamento: dict[Hashable, Future] = {}
+        self._trava = threading.Lock()
+        self._contadores = {"executadas": 0, "agrupadas": 0}
+
+    def _entrar(self, chave: Hashable) -> tuple[Future, bool]:
+        """
+        Retorna o Future da chave e se o chamador é o responsável por executá-la.
+        """
+        with self._trava:
+            futuro = self._em_andamento.get(chave)
+            if futuro is not None:
+                self._contadores["agrupadas"] += 1
+                return futuro, False
+            futuro = Future()
+            self._em_andamento[chave] = futuro
+            self._contadores["executadas"] += 1
+            return futuro, True
+
+    def _concluir(self, chave: Hashable, futuro: Future, funcao: Callable[[], T]) -> None:
+        """
+        Executa a função, publica o resultado (ou a exceção) no Future e libera a chave.
+        """
+        try:
+            resultado = funcao()
+        except BaseException as e:
+            with self._trava:
+                del self._em_andamento[chave]
+            futuro.set_exception(e)
+        else:
+            with self._trava:
+                del self._em_andamento[chave]
+            futuro.set_result(resultado)
+
+    def executar(self, chave: Hashable, funcao: Callable[[], T]) -> T:
+        """
+        Executa `funcao` na thread atual, ou espera a execução já em andamento para a mesma chave.
+        """
+        futuro, responsavel = self._entrar(chave)
+        if responsavel:
+            self._concluir(chave, futuro, funcao)
+        return futuro.result()
+
+    async def executar_async(self, chave: Hashable, funcao: Callable[[], T]) -> T:
+        """
+        Versão assíncrona de `executar`: a função (bloqueante) roda em uma thread de trabalho
+        e a espera não bloqueia o loop de eventos.
+        """
+        futuro, responsavel = self._entrar(chave)
+        if responsavel:
+            await asyncio.to_thread(self._concluir, chave, futuro, funcao)
+        return await asyncio.wrap_future(futuro)
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna quantas chamadas foram executadas e quantas foram agrupadas a uma já em andamento.
+        """
+        with self._trava:
+            estatisticas = dict(self._contadores)
+            estatisticas["em_andamento"] = len(self._em_andamento)
+        return estatisticas
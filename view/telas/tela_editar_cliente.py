@@ -1,7 +1,6 @@
 import flet as ft
 from view.components.mensagens import Notificador
-from dao.cliente_dao import ClienteDAO
-from dao.pessoa_dao import PessoaDAO
+from controller.perfil_controller import PerfilController
 from view.components.identidade_visual import CORES, ESTILOS_TEXTO
 
 
@@ -107,14 +106,7 @@ class TelaEditarCliente:
             return
 
         try:
-            self.cliente.pessoa.set_email(email)
-            self.cliente.pessoa.set_telefone(telefone)
-
-            if nova_senha:
-                self.cliente.alterar_senha(senha_atual, nova_senha)
-
-            ClienteDAO().atualizar_objeto(self.cliente)
-            PessoaDAO().atualizar_objeto(self.cliente.pessoa)
+            PerfilController.atualizar_contato(self.cliente, email, telefone, senha_atual, nova_senha)
 
             # Limpa os campos de senha após atualização
             self.senha_atual_field.current.value = ""
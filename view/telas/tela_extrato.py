@@ -3,6 +3,7 @@ from controller.conta_controller import ContaController
 from view.components.mensagens import Notificador
 from view.components.containers import CartaoResumo, CartaoTransacao
 from view.components.identidade_visual import CORES, ESTILOS_TEXTO
+from utils.constantes import TRANSACAO_ENVIO, TRANSACAO_RECEBIMENTO
 
 
 class TelaExtrato:
@@ -15,6 +16,13 @@ class TelaExtrato:
         self.notificador = Notificador()
 
         self.dropdown_ref = ft.Ref[ft.Dropdown]()
+        self.cursor_extrato = None
+        self.botao_carregar_mais = ft.TextButton(
+            "Carregar mais",
+            icon=ft.Icons.EXPAND_MORE,
+            visible=False,
+            on_click=self.carregar_mais
+        )
         self.lista_extrato = ft.Column(
             [],
             spacing=8,
@@ -71,7 +79,8 @@ class TelaExtrato:
                                 ft.Container(
                                     content=self.lista_extrato,
                                     expand=True
-                                )
+                                ),
+                                ft.Row([self.botao_carregar_mais], alignment=ft.MainAxisAlignment.CENTER)
                             ],
                             expand=True,
                             padding=0,
@@ -94,30 +103,37 @@ class TelaExtrato:
 
 
     def atualizar_extrato(self, e):
-        """Atualiza o extrato da conta selecionada."""
+        """Atualiza o extrato da conta selecionada, exibindo a primeira página de transações."""
+        self.lista_extrato.controls.clear()
+        self.cursor_extrato = None
+        self._carregar_pagina(e)
+
+    def carregar_mais(self, e):
+        """Acrescenta a próxima página de transações ao extrato."""
+        self._carregar_pagina(e)
+
+    def _carregar_pagina(self, e):
+        """Busca uma página do extrato a partir do cursor atual e a adiciona à lista."""
         numero = self.dropdown_ref.current.value
 
         if not numero:
             self.notificador.erro(e.page, "Selecione uma conta.")
             return
 
-        resultado, erro = ContaController.obter_extrato(numero)
+        extrato, erro = ContaController.obter_extrato(
+            numero,
+            cursor=self.cursor_extrato,
+            tipo=(TRANSACAO_ENVIO, TRANSACAO_RECEBIMENTO)
+        )
 
         if erro:
             self.notificador.erro(e.page, erro)
             return
 
-        _, conta = resultado
-        historico = conta.get_historico()
-
-        self.lista_extrato.controls.clear()
-
-        transacoes_validas = [
-            item for item in historico
-            if "Recebido" in item or "Transferência de" in item
-        ]
+        self.cursor_extrato = extrato["cursor"]
+        self.botao_carregar_mais.visible = self.cursor_extrato is not None
 
-        if not transacoes_validas:
+        if not extrato["transacoes"] and not self.lista_extrato.controls:
             self.lista_extrato.controls.append(
                 ft.Text(
                     "Nenhuma transação encontrada.",
@@ -126,7 +142,7 @@ class TelaExtrato:
                 )
             )
         else:
-            for item in reversed(transacoes_validas[-10:]):
-                self.lista_extrato.controls.append(CartaoTransacao(item))
+            for transacao in extrato["transacoes"]:
+                self.lista_extrato.controls.append(CartaoTransacao(transacao))
 
-        e.page.update()
\ No newline at end of file
+        e.page.update()
@@ -17,6 +17,7 @@ class TelaPagamento:
         self.banco = banco
         self.cliente = cliente
         self.notificador = Notificador()
+        self.chave_idempotencia = str(uuid.uuid4())  # Cliques repetidos no mesmo formulário não repetem o pagamento
 
         self.tipo_chave = ft.Ref[ft.Dropdown]()
         self.conta_destino_ref = ft.Ref[ft.Dropdown]()
@@ -170,12 +171,12 @@ class TelaPagamento:
         self.limite_text.value = ""
 
         if numero:
-            resultado, erro = ContaController.obter_extrato(numero)
+            resultado, erro = ContaController.obter_extrato(numero, limite=0)
 
-            if erro or not isinstance(resultado, tuple) or len(resultado) != 2:
+            if erro or not resultado:
                 self.saldo_text.value = "Erro ao carregar saldo."
             else:
-                saldo, conta = resultado
+                saldo, conta = resultado["saldo"], resultado["conta"]
                 self.saldo_text.value = f"💰 Saldo disponível: R$ {saldo:.2f}"
                 self.tipo_conta_text.value = f"🏷 Tipo da conta: {conta.__class__.__name__}"
                 self.limite_text.value = f"🔒 Limite: R$ {conta.limite_transferencia:.2f}"
@@ -199,7 +200,8 @@ class TelaPagamento:
             valor=self.campo_valor.get_valor(),
             descricao=self.campo_desc.value,
             senha=self.campo_senha.value.strip(),
-            conta_destino_numero=conta_destino
+            conta_destino_numero=conta_destino,
+            chave_idempotencia=self.chave_idempotencia
         )
 
         if resultado["sucesso"]: